@@ -4,3 +4,4 @@ from .action_item_getter import ParentReferenceModelDoesNotExist, ActionItemGett
 from .action_item_getter import RelatedReferenceModelDoesNotExist
 from .utils import SingletonActionItemError, ActionItemDeleteError
 from .utils import delete_action_item
+from .parent_reference_fk import ParentReferenceFk, get_parent_reference_fks
@@ -1,12 +1,19 @@
 from django.apps import apps as django_apps
-from django.core.exceptions import ObjectDoesNotExist
-from edc_constants.constants import CLOSED, NEW, OPEN
+from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
+from edc_base.utils import get_utcnow
+from edc_constants.constants import CANCELLED, CLOSED, NEW, OPEN
 from urllib.parse import urlencode, unquote
+from uuid import UUID
 
+from ..history_batch import history_batch
+from ..instrumentation import instrumented, measure
 from ..site_action_items import site_action_items
 from .action_item_getter import ActionItemGetter
 
 
+URL_PLACEHOLDER = str(UUID(int=0))
+
+
 class ActionError(Exception):
     pass
 
@@ -21,14 +28,17 @@ class Action:
 
     _updated_action_type = False
 
+    activation_interval = None  # a timedelta, defers activation when created as a next action
     admin_site_name = None
     color_style = 'danger'
     create_by_action = None
     create_by_user = None
     display_name = None
+    due_interval = None  # a timedelta from report_datetime, see ActionItem.due_datetime
     help_text = None
     instructions = None
     name = None
+    parent_reference_fks = None  # {parent reference model: ParentReferenceFk}
     related_reference_model = None
     related_reference_model_fk_attr = None
     priority = None
@@ -39,6 +49,7 @@ class Action:
     singleton = False
 
     action_type_model = 'edc_action_item.actiontype'
+    _url_templates = {}  # (add url, change url template) by model, see get_url_templates
     next_actions = None  # a list of Action classes which may include 'self'
 
     def __init__(self, subject_identifier=None, action_identifier=None,
@@ -66,14 +77,15 @@ class Action:
             self.parent_reference_identifier = parent_reference_identifier
             self.related_reference_identifier = related_reference_identifier
 
-        getter = self.action_item_getter(
-            self, action_identifier=self.action_identifier,
-            subject_identifier=self.subject_identifier,
-            reference_identifier=self.reference_identifier,
-            related_reference_identifier=self.related_reference_identifier,
-            parent_reference_identifier=self.parent_reference_identifier,
-            allow_create=True)
-        self.action_item_obj = getter.action_item
+        with measure('get_action_item', self.name):
+            getter = self.action_item_getter(
+                self, action_identifier=self.action_identifier,
+                subject_identifier=self.subject_identifier,
+                reference_identifier=self.reference_identifier,
+                related_reference_identifier=self.related_reference_identifier,
+                parent_reference_identifier=self.parent_reference_identifier,
+                allow_create=True)
+            self.action_item_obj = getter.action_item
 
         if not self.action_identifier:
             self.action_identifier = self.action_item_obj.action_identifier
@@ -147,7 +159,8 @@ class Action:
                 True if cls.show_link_to_changelist is None else cls.show_link_to_changelist),
             create_by_user=True if cls.create_by_user is None else cls.create_by_user,
             create_by_action=True if cls.create_by_action is None else cls.create_by_action,
-            instructions=cls.instructions)
+            instructions=cls.instructions,
+            due_interval=cls.due_interval)
         return dct
 
     @classmethod
@@ -191,52 +204,70 @@ class Action:
         """
         return True
 
+    @instrumented('close_and_create_next')
     def close_and_create_next(self):
         """Attempt to close the action item and
         create new ones, if required.
         """
 
-        status = CLOSED if self.close_action_item_on_save() else OPEN
-        self.action_item_obj.reference_identifier = self.reference_identifier
-        self.action_item_obj.status = status
-        self.action_item_obj.save()
+        close = self.close_action_item_on_save()
+        version = self.action_item_obj.version
+
+        def apply(action_item):
+            # on a retry, keep a concurrent close or cancel
+            action_item.reference_identifier = self.reference_identifier
+            if close:
+                action_item.status = CLOSED
+            elif (action_item.version == version
+                  or action_item.status not in [CLOSED, CANCELLED]):
+                action_item.status = OPEN
+
+        self.action_item_obj.save_with_retry(
+            apply, update_fields=['reference_identifier', 'status'])
         self.action_item_obj = self.action_item_model_cls().objects.get(
             action_identifier=self.action_identifier)
-        if status == CLOSED:
+        if close:
             self.create_next()
 
+    @instrumented('create_next')
     def create_next(self):
         """Creates any next action items if they do not already exist.
         """
         next_actions = self.get_next_actions()
-        for action_cls in next_actions:
-            action_cls = self.__class__ if action_cls == 'self' else action_cls
-            action_type = action_cls.action_type()
-            opts = dict(
-                reference_identifier=None,
-                subject_identifier=self.subject_identifier,
-                action_type=action_type,
-                parent_action_item=self.action_item_obj,
-                parent_reference_identifier=self.action_item_obj.reference_identifier,
-                parent_reference_model=self.action_type().reference_model,
-                reference_model=action_type.model,
-                instructions=self.instructions)
-            try:
-                self.action_item_model_cls().objects.get(**opts)
-            except ObjectDoesNotExist:
-                if (self.action_type().related_reference_model
-                        and (self.action_type().reference_model ==
-                             self.action_type().related_reference_model)):
-                    related_reference_identifier = self.action_item_obj.reference_identifier
-                else:
-                    related_reference_identifier = (
-                        self.action_item_obj.related_reference_identifier
-                        or self.action_item_obj.reference_identifier)
-                opts.update(
-                    related_reference_identifier=related_reference_identifier,
-                    related_reference_model=self.action_type().related_reference_model)
-                self.action_item_model_cls().objects.create(**opts)
-
+        with history_batch():
+            for action_cls in next_actions:
+                action_cls = self.__class__ if action_cls == 'self' else action_cls
+                action_type = action_cls.action_type()
+                opts = dict(
+                    reference_identifier=None,
+                    subject_identifier=self.subject_identifier,
+                    action_type=action_type,
+                    parent_action_item=self.action_item_obj,
+                    parent_reference_identifier=self.action_item_obj.reference_identifier,
+                    parent_reference_model=self.action_type().reference_model,
+                    reference_model=action_type.model,
+                    instructions=self.instructions)
+                try:
+                    self.action_item_model_cls().objects.get(**opts)
+                except ObjectDoesNotExist:
+                    if (self.action_type().related_reference_model
+                            and (self.action_type().reference_model ==
+                                 self.action_type().related_reference_model)):
+                        related_reference_identifier = (
+                            self.action_item_obj.reference_identifier)
+                    else:
+                        related_reference_identifier = (
+                            self.action_item_obj.related_reference_identifier
+                            or self.action_item_obj.reference_identifier)
+                    opts.update(
+                        related_reference_identifier=related_reference_identifier,
+                        related_reference_model=self.action_type().related_reference_model)
+                    if action_cls.activation_interval:
+                        opts.update(
+                            activate_after=get_utcnow() + action_cls.activation_interval)
+                    self.action_item_model_cls().objects.create(**opts)
+
+    @instrumented('append_to_next_if_required')
     def append_to_next_if_required(self, next_actions=None,
                                    action_cls=None, required=None):
         """Returns next actions where the given action_cls is
@@ -287,11 +318,86 @@ class Action:
                 value = obj
             kwargs.update({
                 cls.related_reference_model_fk_attr: str(value.pk)})
-        query = unquote(urlencode(kwargs))
-        if reference_model_obj:
-            path = reference_model_obj.get_absolute_url()
-        else:
-            path = cls.reference_model_cls()().get_absolute_url()
+        return cls.url_with_query(cls.reference_model_path(reference_model_obj), kwargs)
+
+    @classmethod
+    def reference_model_urls(cls, action_items=None, reference_model_objs=None, **kwargs):
+        """Returns a dictionary of relative add or change URLs by
+        action_identifier, one per action item, or None if the
+        related reference model instance does not exist.
+
+        A bulk variant of `reference_model_url` that fetches the
+        reference and related reference model instances in one
+        query each. `reference_model_objs`, if known, is a
+        dictionary of reference model instances by action_identifier.
+        """
+        action_items = list(action_items)
+        if reference_model_objs is None:
+            reference_model_objs = {
+                obj.action_identifier: obj for obj in
+                cls.reference_model_cls().objects.filter(action_identifier__in=[
+                    action_item.action_identifier for action_item in action_items])}
+        related_pks = {}
+        if cls.related_reference_model_fk_attr:
+            for obj in django_apps.get_model(cls.related_reference_model).objects.filter(
+                    tracking_identifier__in=[
+                        action_item.related_reference_identifier
+                        for action_item in action_items]):
+                try:
+                    attname = obj._meta.get_field(
+                        cls.related_reference_model_fk_attr).attname
+                except FieldDoesNotExist:
+                    related_pks[obj.tracking_identifier] = obj.pk
+                else:
+                    related_pks[obj.tracking_identifier] = getattr(obj, attname)
+        urls = {}
+        for action_item in action_items:
+            query = dict(kwargs)
+            if cls.related_reference_model_fk_attr:
+                try:
+                    query.update({cls.related_reference_model_fk_attr: str(
+                        related_pks[action_item.related_reference_identifier])})
+                except KeyError:
+                    urls[action_item.action_identifier] = None
+                    continue
+            urls[action_item.action_identifier] = cls.url_with_query(
+                cls.reference_model_path(
+                    reference_model_objs.get(action_item.action_identifier)),
+                query)
+        return urls
+
+    @staticmethod
+    def url_with_query(path, query):
+        query = unquote(urlencode(query))
         if query:
             return '?'.join([path, query])
         return path
+
+    @classmethod
+    def reference_model_path(cls, reference_model_obj=None):
+        """Returns the change URL of `reference_model_obj` or the add
+        URL of the reference model from the cached URL templates.
+        """
+        if reference_model_obj is None:
+            add_url, _ = cls.get_url_templates(cls.reference_model_cls())
+            return add_url
+        add_url, change_url = cls.get_url_templates(reference_model_obj.__class__)
+        if reference_model_obj.pk:
+            return change_url.replace(URL_PLACEHOLDER, str(reference_model_obj.pk))
+        return add_url
+
+    @classmethod
+    def get_url_templates(cls, model_cls):
+        """Returns a tuple of the add URL and a change URL template
+        for a model, reversed once per process.
+
+        Assumes `get_absolute_url` depends only on the pk.
+        """
+        try:
+            return cls._url_templates[model_cls._meta.label_lower]
+        except KeyError:
+            url_templates = (
+                model_cls().get_absolute_url(),
+                model_cls(pk=URL_PLACEHOLDER).get_absolute_url())
+            cls._url_templates[model_cls._meta.label_lower] = url_templates
+            return url_templates
@@ -3,6 +3,8 @@ from django.core.exceptions import ObjectDoesNotExist, MultipleObjectsReturned
 from uuid import uuid4
 from edc_action_item.action.utils import SingletonActionItemError
 
+from ..archive import restore_action_item
+
 
 class ActionItemGetterError(Exception):
     pass
@@ -103,8 +105,16 @@ class ActionItemGetter:
 
         self.action_identifier = self.action_item.action_identifier
         if not self.action_item.reference_identifier and self.reference_identifier:
-            self.action_item.reference_identifier = self.reference_identifier
-            self.action_item.save()
+            self.action_item.save_with_retry(
+                self.set_reference_identifier,
+                update_fields=['reference_identifier'])
+
+    def set_reference_identifier(self, action_item):
+        """Sets the reference identifier unless set concurrently
+        (see ActionItem.save_with_retry).
+        """
+        if not action_item.reference_identifier:
+            action_item.reference_identifier = self.reference_identifier
 
     @classmethod
     def action_item_model_cls(cls):
@@ -143,12 +153,17 @@ class ActionItemGetter:
         to get by action_identifier only.
 
         This will be tried first.
+
+        An archived action item is restored.
         """
         try:
             action_item = self.action_item_model_cls().objects.get(
                 action_identifier=self.action_identifier)
         except ObjectDoesNotExist as e:
-            raise ActionItemObjectDoesNotExist(e)
+            try:
+                action_item = restore_action_item(self.action_identifier)
+            except ObjectDoesNotExist:
+                raise ActionItemObjectDoesNotExist(e)
         return action_item
 
     def _get_by_reference_identifiers(self):
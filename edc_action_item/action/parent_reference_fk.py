@@ -0,0 +1,72 @@
+from collections import defaultdict
+from django.apps import apps as django_apps
+
+from ..site_action_items import site_action_items
+
+
+class ParentReferenceFk:
+
+    """Declares how an Action derives the FK querystring for its
+    reference model from the parent reference model instance.
+
+    The querystring is {query_attr: parent.pk} or, if `fk_attr`,
+    {query_attr: parent.<fk_attr>_id}, e.g.
+
+        class FollowupAction(Action):
+            ...
+            parent_reference_fks = {
+                'myapp.initial': ParentReferenceFk('initial'),
+                'myapp.followup': ParentReferenceFk('initial', fk_attr='initial')}
+    """
+
+    def __init__(self, query_attr=None, fk_attr=None):
+        self.query_attr = query_attr
+        self.fk_attr = fk_attr
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.query_attr}, fk_attr={self.fk_attr})'
+
+    def value_field(self, model_cls):
+        if self.fk_attr:
+            return model_cls._meta.get_field(self.fk_attr).attname
+        return 'pk'
+
+
+def get_parent_reference_fks(action_items=None):
+    """Returns a dictionary of FK querystring dictionaries by
+    action_identifier for a list of action items.
+
+    Resolved with one query per parent reference model using the
+    `parent_reference_fks` of each action class. Action items
+    without a resolver or parent reference model instance are
+    not included.
+    """
+    # {parent model: {tracking_identifier: [(action_identifier, resolver)]}}
+    lookups = defaultdict(lambda: defaultdict(list))
+    for action_item in action_items:
+        if not action_item.parent_reference_model:
+            continue
+        action_cls = site_action_items.get(
+            action_item.action_type.name, create_action_type=False)
+        resolver = (action_cls.parent_reference_fks or {}).get(
+            action_item.parent_reference_model)
+        if resolver:
+            lookups[action_item.parent_reference_model][
+                action_item.parent_reference_identifier].append(
+                    (action_item.action_identifier, resolver))
+    parent_reference_fks = {}
+    for model, by_tracking_identifier in lookups.items():
+        model_cls = django_apps.get_model(model)
+        value_fields = set(
+            resolver.value_field(model_cls)
+            for items in by_tracking_identifier.values() for _, resolver in items)
+        for row in model_cls.objects.filter(
+                tracking_identifier__in=list(by_tracking_identifier)).values(
+                    'tracking_identifier', *value_fields):
+            for action_identifier, resolver in by_tracking_identifier[
+                    row['tracking_identifier']]:
+                value = row[resolver.value_field(model_cls)]
+                if value is not None:
+                    parent_reference_fks[action_identifier] = {
+                        resolver.query_attr: str(value)}
+    return parent_reference_fks
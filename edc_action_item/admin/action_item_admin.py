@@ -1,15 +1,25 @@
 from django.conf import settings
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.contrib.admin.options import TabularInline
+from django.contrib.admin.utils import unquote
+from django.contrib.sites.shortcuts import get_current_site
+from django.core.exceptions import PermissionDenied
+from django.db.models import Q
+from django.http import Http404, HttpResponseRedirect
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils.safestring import mark_safe
 from edc_model_admin import audit_fieldset_tuple
 from edc_model_admin.inlines import TabularInlineMixin
 from edc_subject_dashboard import ModelAdminSubjectDashboardMixin
 
 from ..admin_site import edc_action_item_admin
 from ..forms import ActionItemForm
-from ..models import ActionItem
+from ..models import ActionItem, ActionItemConcurrentUpdate
 from ..models import ActionItemUpdate
-from .modeladmin_mixins import ModelAdminMixin
+from .list_filters import ActionTypeListFilter, CreatedMonthListFilter
+from .modeladmin_mixins import ModelAdminMixin, ModelAdminApproximateCountMixin
+from .modeladmin_mixins import ModelAdminSubjectAutocompleteMixin
 
 
 class ActionItemUpdateInline(TabularInlineMixin, TabularInline):
@@ -26,7 +36,8 @@ class ActionItemUpdateInline(TabularInlineMixin, TabularInline):
 
 
 @admin.register(ActionItem, site=edc_action_item_admin)
-class ActionItemAdmin(ModelAdminMixin, ModelAdminSubjectDashboardMixin, admin.ModelAdmin):
+class ActionItemAdmin(ModelAdminApproximateCountMixin, ModelAdminSubjectAutocompleteMixin,
+                      ModelAdminMixin, ModelAdminSubjectDashboardMixin, admin.ModelAdmin):
 
     form = ActionItemForm
 
@@ -45,9 +56,12 @@ class ActionItemAdmin(ModelAdminMixin, ModelAdminSubjectDashboardMixin, admin.Mo
                 'report_datetime',
                 'action_type',
                 'priority',
+                'due_datetime',
+                'activate_after',
                 'status',
                 'parent_action_item',
                 'instructions',
+                'version',
             )}),
         ('Reference Information', {
             'classes': ('collapse', ),
@@ -64,15 +78,22 @@ class ActionItemAdmin(ModelAdminMixin, ModelAdminSubjectDashboardMixin, admin.Mo
 
     radio_fields = {'status': admin.VERTICAL}
 
+    autocomplete_fields = ['parent_action_item']
+
     inlines = [ActionItemUpdateInline]
 
     list_display = ('identifier', 'dashboard',
-                    'action_type', 'priority', 'status', 'parent',
+                    'action_type', 'priority', 'status', 'parent', 'chain',
                     'reference', 'related_reference', 'parent_reference')
 
+    list_select_related = ('action_type', 'parent_action_item')
+
     list_filter = ('status', 'priority',
                    'report_datetime', 'action_type__name')
 
+    approximate_list_filter = ('status', 'priority', 'report_datetime',
+                               ActionTypeListFilter, CreatedMonthListFilter)
+
     search_fields = ('subject_identifier',
                      'action_identifier',
                      'reference_identifier',
@@ -93,12 +114,12 @@ class ActionItemAdmin(ModelAdminMixin, ModelAdminSubjectDashboardMixin, admin.Mo
                            'reference_identifier', 'reference_model',
                            'related_reference_identifier',
                            'parent_reference_identifier',
-                           'parent_action_item',
                            )
         if obj:
             fields = fields + ('subject_identifier',
                                'report_datetime',
-                               'action_type')
+                               'action_type',
+                               'parent_action_item')
         return fields
 
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
@@ -108,5 +129,84 @@ class ActionItemAdmin(ModelAdminMixin, ModelAdminSubjectDashboardMixin, admin.Mo
         return super().formfield_for_foreignkey(
             db_field, request, **kwargs)
 
+    def get_search_results(self, request, queryset, search_term):
+        """Returns search results, using only prefix lookups on the
+        action and subject identifiers for autocomplete requests.
+
+        Autocomplete results are limited to one subject if
+        `subject_identifier` is in the querystring (see
+        ModelAdminSubjectAutocompleteMixin).
+
+        On PostgreSQL the prefix lookups use the `varchar_pattern_ops`
+        indexes (see migration 0017).
+        """
+        if request.path.endswith('/autocomplete/'):
+            subject_identifier = request.GET.get('subject_identifier')
+            if subject_identifier:
+                queryset = queryset.filter(subject_identifier=subject_identifier)
+            search_term = search_term.strip()
+            if search_term:
+                q = Q()
+                for term in {search_term, search_term.upper()}:
+                    q |= (Q(action_identifier__startswith=term)
+                          | Q(subject_identifier__startswith=term))
+                queryset = queryset.filter(q)
+            return queryset, False
+        return super().get_search_results(request, queryset, search_term)
+
+    def changeform_view(self, request, object_id=None, form_url='', extra_context=None):
+        """Shows a message instead of a server error if the action
+        item was saved by another user or process at the same time.
+        """
+        try:
+            return super().changeform_view(request, object_id, form_url, extra_context)
+        except ActionItemConcurrentUpdate:
+            self.message_user(
+                request, 'This action item was changed by another user or process. '
+                'Please check the changes below and save again.', level=messages.ERROR)
+            return HttpResponseRedirect(request.get_full_path())
+
+    def get_urls(self):
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return [
+            path('<path:object_id>/chain/',
+                 self.admin_site.admin_view(self.chain_view),
+                 name='%s_%s_chain' % info),
+        ] + super().get_urls()
+
+    def chain(self, obj):
+        """Returns a link to the chain view if the action item
+        has a parent.
+        """
+        if obj.parent_action_item_id:
+            info = self.model._meta.app_label, self.model._meta.model_name
+            url = reverse(f'{self.admin_site.name}:%s_%s_chain' % info,
+                          args=(obj.pk, ))
+            return mark_safe(
+                f'<a data-toggle="tooltip" title="show all action items in '
+                f'this chain" href="{url}">chain</a>')
+        return None
+
+    def chain_view(self, request, object_id):
+        """Renders the whole parent_action_item tree of an
+        action item with one query.
+
+        Requires the view permission. Action items of other sites
+        are not found.
+        """
+        obj = self.get_object(request, unquote(object_id))
+        if obj is None or obj.site_id != get_current_site(request).id:
+            raise Http404(f'Action item does not exist. Got {object_id}.')
+        if not self.has_view_permission(request, obj):
+            raise PermissionDenied
+        context = dict(
+            self.admin_site.each_context(request),
+            opts=self.model._meta,
+            original=obj,
+            title=f'Action item chain for {obj.identifier}',
+            action_items=list(self.model.objects.tree(obj)))
+        return TemplateResponse(
+            request, 'admin/edc_action_item/actionitem_chain.html', context)
+
     def post_url_on_delete_kwargs(self, request, obj):
         return dict(subject_identifier=obj.subject_identifier)
@@ -4,14 +4,17 @@ from edc_model_admin import audit_fieldset_tuple
 from ..admin_site import edc_action_item_admin
 from ..forms import ActionItemUpdateForm
 from ..models import ActionItemUpdate
-from .modeladmin_mixins import ModelAdminMixin
+from .modeladmin_mixins import ModelAdminMixin, ModelAdminSubjectAutocompleteMixin
 
 
 @admin.register(ActionItemUpdate, site=edc_action_item_admin)
-class ActionItemUpdateAdmin(ModelAdminMixin, admin.ModelAdmin):
+class ActionItemUpdateAdmin(ModelAdminSubjectAutocompleteMixin, ModelAdminMixin,
+                            admin.ModelAdmin):
 
     form = ActionItemUpdateForm
 
+    autocomplete_fields = ['action_item']
+
     fieldsets = (
         (None, {
             'fields': (
@@ -21,6 +21,7 @@ class ActionTypeAdmin(ModelAdminMixin, admin.ModelAdmin):
                 'show_on_dashboard',
                 'create_by_action',
                 'create_by_user',
+                'due_interval',
                 'instructions',
             )},
          ),
@@ -44,6 +45,7 @@ class ActionTypeAdmin(ModelAdminMixin, admin.ModelAdmin):
                            'show_on_dashboard',
                            'create_by_action',
                            'create_by_user',
+                           'due_interval',
                            'instructions',
                            )
         return fields
@@ -0,0 +1,85 @@
+from datetime import datetime
+
+from django.contrib.admin import SimpleListFilter
+from django.core.cache import cache
+from django.db.models import Max, Min
+from django.utils.timezone import utc
+
+from ..site_action_items import site_action_items
+
+
+class ActionTypeListFilter(SimpleListFilter):
+
+    """A list filter on action type whose choices come from the
+    action class registry instead of a DISTINCT over ActionItem.
+    """
+
+    title = 'action'
+    parameter_name = 'action_type__name'
+
+    def lookups(self, request, model_admin):
+        return sorted(
+            [(action_cls.name, action_cls.display_name or action_cls.name)
+             for action_cls in site_action_items],
+            key=lambda x: x[1])
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(action_type__name=self.value())
+        return queryset
+
+
+class CreatedMonthListFilter(SimpleListFilter):
+
+    """A list filter by year/month of `created`, a cheap substitute
+    for `date_hierarchy`.
+
+    The year/month choices are built from the first and last
+    `created` values which are cached for `cache_timeout` seconds.
+
+    Months are UTC months, for the choices and the filter.
+    """
+
+    title = 'created'
+    parameter_name = 'created_month'
+    field_name = 'created'
+    cache_timeout = 3600
+
+    def lookups(self, request, model_admin):
+        first, last = self.bounds(model_admin.model)
+        if not first or not last:
+            return []
+        first, last = first.astimezone(utc), last.astimezone(utc)
+        year, month = last.year, last.month
+        choices = []
+        while (year, month) >= (first.year, first.month):
+            dte = datetime(year, month, 1)
+            choices.append((dte.strftime('%Y-%m'), dte.strftime('%B %Y')))
+            year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+        return choices
+
+    def queryset(self, request, queryset):
+        if self.value():
+            try:
+                year, month = [int(x) for x in self.value().split('-')]
+                start = datetime(year, month, 1, tzinfo=utc)
+            except ValueError:
+                return queryset
+            year, month = (year, month + 1) if month < 12 else (year + 1, 1)
+            end = datetime(year, month, 1, tzinfo=utc)
+            return queryset.filter(**{
+                f'{self.field_name}__gte': start,
+                f'{self.field_name}__lt': end})
+        return queryset
+
+    def bounds(self, model):
+        """Returns a cached tuple of (first, last) for `field_name`.
+        """
+        key = f'edc_action_item:{model._meta.label_lower}:{self.field_name}:bounds'
+        bounds = cache.get(key)
+        if bounds is None:
+            aggregate = model.objects.aggregate(
+                first=Min(self.field_name), last=Max(self.field_name))
+            bounds = (aggregate.get('first'), aggregate.get('last'))
+            cache.set(key, bounds, self.cache_timeout)
+        return bounds
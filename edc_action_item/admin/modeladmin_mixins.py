@@ -1,3 +1,4 @@
+from django.conf import settings
 from django_revision.modeladmin_mixin import ModelAdminRevisionMixin
 
 from edc_model_admin import (
@@ -6,6 +7,10 @@ from edc_model_admin import (
     ModelAdminReadOnlyMixin, ModelAdminInstitutionMixin,
     ModelAdminRedirectOnDeleteMixin)
 
+from .changelist import ApproximateCountChangeList
+from .paginator import ApproximateCountPaginator
+from .widgets import SubjectAutocompleteSelect
+
 
 class ModelAdminMixin(ModelAdminNextUrlRedirectMixin, ModelAdminFormInstructionsMixin,
                       ModelAdminFormAutoNumberMixin, ModelAdminRevisionMixin,
@@ -15,3 +20,70 @@ class ModelAdminMixin(ModelAdminNextUrlRedirectMixin, ModelAdminFormInstructions
     list_per_page = 10
     date_hierarchy = 'modified'
     empty_value_display = '-'
+
+
+class ModelAdminApproximateCountMixin:
+
+    """A ModelAdmin mixin for very large changelists.
+
+    Opt-in with settings.EDC_ACTION_ITEM_APPROXIMATE_COUNTS = True.
+    The setting is read per request.
+
+    If enabled:
+        * the paginator uses approximate/cached counts;
+        * the "full result count" query is not run;
+        * `date_hierarchy` is disabled, use a list filter
+          with cached bounds instead (see `approximate_list_filter`);
+        * `approximate_list_filter`, if set, replaces `list_filter`.
+    """
+
+    approximate_list_filter = None
+
+    @property
+    def approximate_counts(self):
+        return getattr(settings, 'EDC_ACTION_ITEM_APPROXIMATE_COUNTS', False)
+
+    @property
+    def show_full_result_count(self):
+        return not self.approximate_counts and super().show_full_result_count
+
+    def get_changelist(self, request, **kwargs):
+        if self.approximate_counts:
+            return ApproximateCountChangeList
+        return super().get_changelist(request, **kwargs)
+
+    def get_paginator(self, request, queryset, per_page, orphans=0,
+                      allow_empty_first_page=True):
+        if self.approximate_counts:
+            return ApproximateCountPaginator(
+                queryset, per_page, orphans, allow_empty_first_page)
+        return super().get_paginator(
+            request, queryset, per_page, orphans=orphans,
+            allow_empty_first_page=allow_empty_first_page)
+
+    def get_list_filter(self, request):
+        if self.approximate_counts and self.approximate_list_filter is not None:
+            return self.approximate_list_filter
+        return super().get_list_filter(request)
+
+
+class ModelAdminSubjectAutocompleteMixin:
+
+    """A ModelAdmin mixin that limits autocomplete fields to
+    action items of the subject in the querystring of the
+    add or change page, e.g. ?subject_identifier=12345.
+    """
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        formfield = super().formfield_for_foreignkey(db_field, request, **kwargs)
+        subject_identifier = request.GET.get('subject_identifier') if request else None
+        if (subject_identifier and 'widget' not in kwargs
+                and db_field.related_model._meta.label_lower == 'edc_action_item.actionitem'
+                and db_field.name in self.get_autocomplete_fields(request)):
+            # ModelAdmin always sets its own AutocompleteSelect, replace it
+            formfield.widget = SubjectAutocompleteSelect(
+                db_field.remote_field, self.admin_site,
+                subject_identifier=subject_identifier, using=kwargs.get('using'))
+            formfield.widget.choices = formfield.choices
+            formfield.widget.is_required = formfield.required
+        return formfield
@@ -0,0 +1,60 @@
+from hashlib import md5
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class ApproximateCountPaginator(Paginator):
+
+    """A paginator that avoids a COUNT(*) over the whole table
+    on every changelist page view.
+
+    For an unfiltered queryset on PostgreSQL, the planner's row
+    estimate (pg_class.reltuples) is used. Otherwise the exact
+    count is cached for `cache_timeout` seconds keyed on the SQL
+    of the queryset.
+    """
+
+    cache_timeout = 300
+    cache_key_prefix = 'edc_action_item:paginator:count'
+
+    @cached_property
+    def count(self):
+        try:
+            query = self.object_list.query
+        except AttributeError:
+            return len(self.object_list)
+        if not query.where:
+            estimate = self.estimated_count()
+            if estimate:
+                return estimate
+        try:
+            sql, params = query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+        key = md5(f'{sql}{params}'.encode()).hexdigest()
+        key = f'{self.cache_key_prefix}:{key}'
+        count = cache.get(key)
+        if count is None:
+            count = self.object_list.count()
+            cache.set(key, count, self.cache_timeout)
+        return count
+
+    def estimated_count(self):
+        """Returns the planner's estimate of the number of rows
+        in the table or None.
+        """
+        connection = connections[self.object_list.db]
+        if connection.vendor != 'postgresql':
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE relname = %s',
+                [self.object_list.model._meta.db_table])
+            row = cursor.fetchone()
+        if row and row[0] > 0:
+            return int(row[0])
+        return None
@@ -0,0 +1,20 @@
+from django.contrib.admin.widgets import AutocompleteSelect
+from urllib.parse import urlencode
+
+
+class SubjectAutocompleteSelect(AutocompleteSelect):
+
+    """An autocomplete widget that passes `subject_identifier`
+    to the autocomplete view so results are limited to one
+    subject (see ActionItemAdmin.get_search_results).
+    """
+
+    def __init__(self, rel, admin_site, subject_identifier=None, **kwargs):
+        self.subject_identifier = subject_identifier
+        super().__init__(rel, admin_site, **kwargs)
+
+    def get_url(self):
+        url = super().get_url()
+        if self.subject_identifier:
+            return f'{url}?{urlencode(dict(subject_identifier=self.subject_identifier))}'
+        return url
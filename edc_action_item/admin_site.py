@@ -1,4 +1,5 @@
 from django.contrib.admin import AdminSite as DjangoAdminSite
+from django.urls import path
 
 
 class AdminSite(DjangoAdminSite):
@@ -7,5 +8,16 @@ class AdminSite(DjangoAdminSite):
     index_title = 'Edc Action Item'
     site_url = '/administration/'
 
+    def get_urls(self):
+        from .views import ActionItemReportView, WorklistView
+        return [
+            path('edc_action_item/report/',
+                 self.admin_view(ActionItemReportView.as_view(admin_site=self)),
+                 name='action_item_report'),
+            path('edc_action_item/worklist/',
+                 self.admin_view(WorklistView.as_view(admin_site=self)),
+                 name='action_item_worklist'),
+        ] + super().get_urls()
+
 
 edc_action_item_admin = AdminSite(name='edc_action_item_admin')
@@ -0,0 +1,163 @@
+"""Hot/cold partitioning of action items.
+
+CLOSED and CANCELLED action items are moved from ActionItem to
+ArchivedActionItem by the `archive_action_items` management command
+so that the dashboards, getters and admin only touch "hot" rows.
+
+An archived action item is restored to ActionItem if it is needed
+again, for example when its reference model instance is re-saved
+(see ActionItemGetter).
+
+For audits, use `get_action_item` and `action_items_for_audit` to
+read over both tables.
+
+Moving an action item writes no history rows in either direction,
+the history of an archived action item is kept as is.
+"""
+from itertools import chain
+
+from django.apps import apps as django_apps
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from edc_base.utils import get_utcnow
+from edc_constants.constants import CLOSED, CANCELLED
+
+from .history_batch import no_history
+
+ARCHIVE_STATUS = [CLOSED, CANCELLED]
+
+
+def _model(name):
+    return django_apps.get_model(f'edc_action_item.{name}')
+
+
+def _shared_attnames(from_model, to_model):
+    attnames = [f.attname for f in from_model._meta.concrete_fields]
+    return [f.attname for f in to_model._meta.concrete_fields
+            if f.attname in attnames]
+
+
+def archivable_action_items(cutoff=None):
+    """Returns a queryset of action items that may be archived,
+    that is, CLOSED or CANCELLED and last modified before `cutoff`.
+    """
+    return _model('actionitem').objects.filter(
+        status__in=ARCHIVE_STATUS, modified__lt=cutoff)
+
+
+def exclude_referenced_parents(pks):
+    """Returns the set of action item pks less those that are
+    the parent of an action item not in the set.
+
+    The parent FK is PROTECT, a parent cannot leave the
+    ActionItem table before its children.
+    """
+    model_cls = _model('actionitem')
+    pks = set(pks)
+    while pks:
+        referenced = set(
+            model_cls.objects.filter(parent_action_item_id__in=pks)
+            .exclude(pk__in=pks)
+            .values_list('parent_action_item_id', flat=True))
+        if not referenced:
+            break
+        pks -= referenced
+    return pks
+
+
+@transaction.atomic
+def archive_action_items(pks):
+    """Moves the action items and their updates to the archive
+    tables. Returns the number of action items archived.
+
+    The deletes write no '-' history rows (see no_history).
+    """
+    action_item_model_cls = _model('actionitem')
+    update_model_cls = _model('actionitemupdate')
+    archive_model_cls = _model('archivedactionitem')
+    archive_update_model_cls = _model('archivedactionitemupdate')
+    pks = list(pks)
+    if not pks:
+        return 0
+    attnames = _shared_attnames(action_item_model_cls, archive_model_cls)
+    archived_datetime = get_utcnow()
+    objs = action_item_model_cls.objects.filter(pk__in=pks).values(
+        *attnames, 'parent_action_item__action_identifier')
+    archive_model_cls.objects.bulk_create([
+        archive_model_cls(
+            parent_action_identifier=obj.pop('parent_action_item__action_identifier'),
+            archived_datetime=archived_datetime,
+            **obj)
+        for obj in objs])
+    update_attnames = _shared_attnames(update_model_cls, archive_update_model_cls)
+    updates = update_model_cls.objects.filter(action_item_id__in=pks)
+    archive_update_model_cls.objects.bulk_create([
+        archive_update_model_cls(
+            action_identifier=obj.pop('action_item__action_identifier'), **obj)
+        for obj in updates.values(*update_attnames, 'action_item__action_identifier')])
+    with no_history():
+        updates.delete()
+        action_item_model_cls.objects.filter(pk__in=pks).update(parent_action_item=None)
+        action_item_model_cls.objects.filter(pk__in=pks).delete()
+    return len(pks)
+
+
+@transaction.atomic
+def restore_action_item(action_identifier):
+    """Moves an archived action item, its parents and its updates
+    back to the ActionItem tables. Returns the ActionItem instance.
+
+    Inserted with bulk_create, no '+' history rows are written.
+
+    Raises ObjectDoesNotExist if not archived.
+    """
+    action_item_model_cls = _model('actionitem')
+    update_model_cls = _model('actionitemupdate')
+    archive_model_cls = _model('archivedactionitem')
+    archive_update_model_cls = _model('archivedactionitemupdate')
+    archived = archive_model_cls.objects.get(action_identifier=action_identifier)
+    if (archived.parent_action_item_id and not action_item_model_cls.objects.filter(
+            pk=archived.parent_action_item_id).exists()):
+        restore_action_item(archived.parent_action_identifier)
+    attnames = _shared_attnames(archive_model_cls, action_item_model_cls)
+    action_item = action_item_model_cls(
+        **{attname: getattr(archived, attname) for attname in attnames})
+    action_item_model_cls.objects.bulk_create([action_item])
+    _model('actionitemclosure').objects.insert_for(action_item)
+    _model('subjectactionsummary').objects.update_for(
+        subject_identifier=action_item.subject_identifier,
+        new={k: getattr(action_item, k) for k in action_item.summary_fields})
+    update_attnames = _shared_attnames(archive_update_model_cls, update_model_cls)
+    updates = archive_update_model_cls.objects.filter(
+        action_identifier=action_identifier)
+    update_model_cls.objects.bulk_create([
+        update_model_cls(action_item_id=archived.pk, **obj)
+        for obj in updates.values(*update_attnames)])
+    updates.delete()
+    archived.delete()
+    return action_item_model_cls.objects.get(action_identifier=action_identifier)
+
+
+def get_action_item(action_identifier):
+    """Returns the ActionItem or ArchivedActionItem instance
+    for this action identifier.
+    """
+    try:
+        return _model('actionitem').objects.get(
+            action_identifier=action_identifier)
+    except ObjectDoesNotExist:
+        return _model('archivedactionitem').objects.get(
+            action_identifier=action_identifier)
+
+
+def action_items_for_audit(**filters):
+    """Returns an iterator over ActionItem and ArchivedActionItem
+    instances matching `filters`.
+
+    Filters must be on fields common to both models, for example
+    subject_identifier, action_type, status, report_datetime.
+    """
+    return chain(
+        _model('actionitem').objects.filter(**filters).order_by('report_datetime'),
+        _model('archivedactionitem').objects.filter(**filters).order_by(
+            'report_datetime'))
@@ -0,0 +1,3 @@
+from .generator import ActionItemGenerator, GeneratorError
+from .runner import BenchmarkRunner
+from .timings import Timings
@@ -0,0 +1,221 @@
+import random
+
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from django.apps import apps as django_apps
+from django.contrib.sites.models import Site
+from django.utils.timezone import utc
+from edc_constants.constants import CANCELLED, CLOSED, NEW, OPEN
+from uuid import UUID
+
+from ..constants import HIGH_PRIORITY, LOW_PRIORITY, MEDIUM_PRIORITY
+from ..site_action_items import site_action_items
+
+# status of the last action item in a chain, the others are CLOSED
+LAST_STATUS_WEIGHTS = OrderedDict([(NEW, 30), (OPEN, 20), (CLOSED, 45), (CANCELLED, 5)])
+
+PRIORITY_WEIGHTS = OrderedDict(
+    [(HIGH_PRIORITY, 15), (MEDIUM_PRIORITY, 35), (LOW_PRIORITY, 50)])
+
+# report dates are spread over `days` before `now`, default EPOCH
+EPOCH = datetime(2018, 10, 1, tzinfo=utc)
+
+# action_identifier is ACSYN{seed:x}-{count:010d}, max_length=25
+MAX_SEED = 16 ** 9
+
+
+class GeneratorError(Exception):
+    pass
+
+
+class ActionItemGenerator:
+
+    """Generates a synthetic, reproducible data set of action items,
+    updates, history and closure rows with bulk inserts.
+
+    Chains follow the `next_actions` of the registered action
+    classes. Subjects are distributed over `site_ids` by `site_weights`.
+    The same `seed` and `now` give the same data.
+
+    Bypasses the model save() and signals, subject action summaries
+    are rebuilt at the end.
+    """
+
+    def __init__(self, subjects=None, chains=None, max_chain_length=None,
+                 days=None, site_ids=None, site_weights=None, seed=None,
+                 now=None, batch_size=None, stdout=None):
+        self.subjects = subjects or 1000
+        self.chains = chains or 3
+        self.max_chain_length = max_chain_length or 6
+        self.days = days or 730
+        self.seed = 0 if seed is None else seed
+        if not 0 <= self.seed < MAX_SEED:
+            raise GeneratorError(
+                f'Invalid seed. Expected 0 <= seed < {MAX_SEED}. Got {self.seed}.')
+        self.rng = random.Random(self.seed)
+        self.site_ids = site_ids or list(Site.objects.values_list('id', flat=True))
+        self.site_weights = site_weights or [1] * len(self.site_ids)
+        self.batch_size = batch_size or 5000
+        self.stdout = stdout
+        self.counts = OrderedDict(
+            action_items=0, action_item_updates=0, history=0, closure=0)
+        self.identifier_count = 0
+        self.now = now or EPOCH
+        self.action_item_model_cls = django_apps.get_model('edc_action_item.actionitem')
+        self.update_model_cls = django_apps.get_model('edc_action_item.actionitemupdate')
+        self.closure_model_cls = django_apps.get_model('edc_action_item.actionitemclosure')
+        self.summary_model_cls = django_apps.get_model(
+            'edc_action_item.subjectactionsummary')
+        self.history_model_cls = self.action_item_model_cls.history.model
+        self.history_attnames = [
+            f.attname for f in self.history_model_cls._meta.concrete_fields
+            if f.attname in [f.attname for f in
+                             self.action_item_model_cls._meta.concrete_fields]]
+        self.buffers = OrderedDict(
+            (model_cls, []) for model_cls in [
+                self.action_item_model_cls, self.closure_model_cls,
+                self.update_model_cls, self.history_model_cls])
+
+    def uuid(self):
+        return UUID(int=self.rng.getrandbits(128), version=4)
+
+    def action_identifier(self):
+        """Returns a precomputed, unique action identifier.
+        """
+        self.identifier_count += 1
+        return f'ACSYN{self.seed:x}-{self.identifier_count:010d}'
+
+    def weighted(self, weights):
+        return self.rng.choices(list(weights), weights=list(weights.values()))[0]
+
+    def write(self, msg):
+        if self.stdout:
+            self.stdout.write(msg)
+
+    def generate(self):
+        """Generates and inserts the data set. Returns a dictionary
+        of row counts.
+        """
+        site_action_items.populate_action_types()
+        action_types = {
+            obj.name: obj for obj in
+            django_apps.get_model('edc_action_item.actiontype').objects.all()}
+        names = [name for name in site_action_items.registry if name in action_types]
+        for i in range(self.subjects):
+            subject_identifier = f'SYN{self.seed}-{i:08d}'
+            site_id = self.rng.choices(self.site_ids, weights=self.site_weights)[0]
+            for _ in range(self.chains):
+                self.add_chain(subject_identifier, site_id,
+                               action_types, self.rng.choice(names))
+            if i % 1000 == 999:
+                self.write(f'  {i + 1} subjects, {self.counts["action_items"]} '
+                           'action items ...\r')
+        self.flush(force=True)
+        self.summary_model_cls.objects.rebuild()
+        return self.counts
+
+    def add_chain(self, subject_identifier, site_id, action_types, name):
+        report_datetime = self.now - timedelta(
+            seconds=self.rng.randint(0, self.days * 24 * 3600))
+        ancestors = []
+        while True:
+            action_cls = site_action_items.get(name)
+            next_names = [
+                name if n == 'self' else n.name for n in action_cls.next_actions or []]
+            next_names = [n for n in next_names if n in action_types]
+            is_last = (not next_names or len(ancestors) + 1 >= self.max_chain_length
+                       or self.rng.random() < 0.3)
+            status = self.weighted(LAST_STATUS_WEIGHTS) if is_last else CLOSED
+            action_item = self.add_action_item(
+                subject_identifier, site_id, action_types[name], status,
+                report_datetime, ancestors)
+            if is_last:
+                break
+            ancestors.append(action_item)
+            name = self.rng.choice(next_names)
+            report_datetime = min(
+                self.now, report_datetime + timedelta(days=self.rng.randint(1, 90)))
+
+    def add_action_item(self, subject_identifier, site_id, action_type, status,
+                        report_datetime, ancestors):
+        parent = ancestors[-1] if ancestors else None
+        opened = report_datetime + timedelta(hours=self.rng.randint(1, 72))
+        finished = opened + timedelta(hours=self.rng.randint(1, 24 * 30))
+        action_item = self.action_item_model_cls(
+            id=self.uuid(),
+            created=report_datetime,
+            modified=finished if status in [CLOSED, CANCELLED] else report_datetime,
+            action_identifier=self.action_identifier(),
+            subject_identifier=subject_identifier,
+            site_id=site_id,
+            report_datetime=report_datetime,
+            action_type=action_type,
+            reference_model=action_type.model,
+            related_reference_model=action_type.related_reference_model,
+            parent_action_item_id=parent.id if parent else None,
+            parent_reference_model=parent.reference_model if parent else None,
+            priority=self.weighted(PRIORITY_WEIGHTS),
+            status=status,
+            instructions=action_type.instructions,
+            opened_datetime=opened if status in [OPEN, CLOSED] else None,
+            closed_datetime=finished if status == CLOSED else None,
+            cancelled_datetime=finished if status == CANCELLED else None)
+        if action_type.due_interval:
+            action_item.due_datetime = report_datetime + action_type.due_interval
+        self.buffers[self.action_item_model_cls].append(action_item)
+        self.add_closure(action_item, ancestors)
+        self.add_history(action_item)
+        if status != NEW:
+            for _ in range(self.rng.randint(0, 3)):
+                self.buffers[self.update_model_cls].append(self.update_model_cls(
+                    id=self.uuid(),
+                    action_item_id=action_item.id,
+                    report_datetime=opened,
+                    comment='synthetic update'))
+        self.flush()
+        return action_item
+
+    def add_closure(self, action_item, ancestors):
+        self.buffers[self.closure_model_cls].extend([
+            self.closure_model_cls(
+                ancestor_id=ancestor.id, descendant_id=action_item.id,
+                depth=len(ancestors) - i)
+            for i, ancestor in enumerate(ancestors + [action_item])])
+
+    def add_history(self, action_item):
+        """Adds one history row per status the action item
+        passed through, NEW then OPEN then CLOSED/CANCELLED.
+        """
+        statuses = [NEW]
+        if action_item.opened_datetime:
+            statuses.append(OPEN)
+        if action_item.status in [CLOSED, CANCELLED]:
+            statuses.append(action_item.status)
+        history_dates = [action_item.report_datetime, action_item.opened_datetime,
+                         action_item.closed_datetime or action_item.cancelled_datetime]
+        values = {attname: getattr(action_item, attname)
+                  for attname in self.history_attnames}
+        for i, status in enumerate(statuses):
+            history_date = history_dates[i] or history_dates[-1]
+            values.update(status=status)
+            self.buffers[self.history_model_cls].append(self.history_model_cls(
+                history_id=self.uuid(),
+                history_date=history_date,
+                history_type='+' if i == 0 else '~',
+                **values))
+
+    def flush(self, force=None):
+        """Bulk inserts the buffered rows, action items first,
+        if any buffer is full or `force`.
+        """
+        if not force and all(
+                len(objs) < self.batch_size for objs in self.buffers.values()):
+            return
+        for model_cls, objs in self.buffers.items():
+            model_cls.objects.bulk_create(objs, batch_size=self.batch_size)
+        self.counts['action_items'] += len(self.buffers[self.action_item_model_cls])
+        self.counts['closure'] += len(self.buffers[self.closure_model_cls])
+        self.counts['action_item_updates'] += len(self.buffers[self.update_model_cls])
+        self.counts['history'] += len(self.buffers[self.history_model_cls])
+        for objs in self.buffers.values():
+            objs.clear()
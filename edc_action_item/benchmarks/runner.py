@@ -0,0 +1,162 @@
+import platform
+import subprocess
+
+from django import get_version
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.template.loader import render_to_string
+from django.test import Client
+from django.urls import reverse
+from edc_base.utils import get_utcnow
+
+from ..models import ActionItem
+from ..templatetags.action_item_extras import action_item_with_popover
+from ..view_mixins import ActionItemViewMixin
+from .timings import Timings
+
+
+class BenchmarkRunner:
+
+    """Generates synthetic subjects and action chains using the
+    test actions and measures saves, dashboard reads, popover
+    rendering and the admin changelist.
+
+    Runs in a transaction that is rolled back unless `keep`
+    is True. Returns a JSON serializable dictionary.
+
+    Chains per subject:
+        FormOne -> FormTwo, FormThree (x `chains`)
+        Initial -> Followup -> Followup ... (x `chains`, with
+            `followups` followups each)
+    """
+
+    subject_identifier_model = 'edc_action_item.subjectidentifiermodel'
+    changelist_url = 'edc_action_item_admin:edc_action_item_actionitem_changelist'
+
+    def __init__(self, subjects=None, chains=None, followups=None,
+                 changelist_pages=None, keep=None, stdout=None):
+        self.subjects = subjects or 50
+        self.chains = chains or 1
+        self.followups = 3 if followups is None else followups
+        self.changelist_pages = changelist_pages or 5
+        self.keep = keep
+        self.stdout = stdout
+        self.timings = {}
+
+    def timer(self, name):
+        return self.timings.setdefault(name, Timings(name)).measure()
+
+    def write(self, msg):
+        if self.stdout:
+            self.stdout.write(msg)
+
+    def run(self):
+        from ..tests.action_items import register_actions
+        register_actions()
+        subject_identifier_model = ActionItem.subject_identifier_model
+        ActionItem.subject_identifier_model = self.subject_identifier_model
+        started = get_utcnow()
+        try:
+            with transaction.atomic():
+                subject_identifiers = self.create_subjects()
+                self.write(f'  saving reference models for {len(subject_identifiers)} '
+                           'subjects ...')
+                for subject_identifier in subject_identifiers:
+                    self.save_reference_models(subject_identifier)
+                self.write('  reading open action items and rendering popovers ...')
+                for subject_identifier in subject_identifiers:
+                    self.read_dashboard(subject_identifier)
+                self.write('  loading the admin changelist ...')
+                self.load_changelist()
+                action_items = ActionItem.objects.count()
+                if not self.keep:
+                    transaction.set_rollback(True)
+        finally:
+            ActionItem.subject_identifier_model = subject_identifier_model
+        return dict(
+            started=started.isoformat(),
+            commit=self.commit(),
+            database=connection.vendor,
+            django=get_version(),
+            python=platform.python_version(),
+            scale=dict(
+                subjects=self.subjects,
+                chains=self.chains,
+                followups=self.followups,
+                action_items=action_items),
+            results=[timings.summary() for timings in self.timings.values()])
+
+    def create_subjects(self):
+        from ..tests.models import SubjectIdentifierModel
+        prefix = get_utcnow().strftime('%H%M%S')
+        subject_identifiers = [
+            f'BM{prefix}{i:06d}' for i in range(self.subjects)]
+        SubjectIdentifierModel.objects.bulk_create([
+            SubjectIdentifierModel(subject_identifier=subject_identifier)
+            for subject_identifier in subject_identifiers])
+        return subject_identifiers
+
+    def save_reference_models(self, subject_identifier):
+        from ..tests.models import FormOne, FormTwo, FormThree, Initial, Followup
+        for _ in range(self.chains):
+            with self.timer('save_form_one_with_next_actions'):
+                form_one = FormOne.objects.create(
+                    subject_identifier=subject_identifier)
+            with self.timer('save_form_two_fk_related'):
+                FormTwo.objects.create(
+                    subject_identifier=subject_identifier,
+                    parent_tracking_identifier=form_one.tracking_identifier,
+                    form_one=form_one)
+            with self.timer('save_form_three'):
+                FormThree.objects.create(
+                    subject_identifier=subject_identifier,
+                    parent_tracking_identifier=form_one.tracking_identifier)
+            with self.timer('save_initial_with_next_actions'):
+                initial = Initial.objects.create(
+                    subject_identifier=subject_identifier)
+            parent = initial
+            for _ in range(self.followups):
+                with self.timer('save_followup_fk_related_next_self'):
+                    parent = Followup.objects.create(
+                        subject_identifier=subject_identifier,
+                        parent_tracking_identifier=parent.tracking_identifier,
+                        initial=initial)
+
+    def read_dashboard(self, subject_identifier):
+        view = ActionItemViewMixin()
+        view.kwargs = dict(subject_identifier=subject_identifier)
+        with self.timer('open_action_items'):
+            wrappers = view.open_action_items
+        for wrapper in wrappers:
+            with self.timer('render_action_item_with_popover'):
+                render_to_string(
+                    'edc_action_item/action_item_with_popover.html',
+                    action_item_with_popover(wrapper, 0))
+
+    def load_changelist(self):
+        user = User.objects.create_superuser(
+            f'benchmark{get_utcnow().strftime("%H%M%S%f")}',
+            'benchmark@example.com', 'benchmark')
+        host = next((host for host in settings.ALLOWED_HOSTS
+                     if host not in ['*', ''] and not host.startswith('.')),
+                    'localhost')
+        client = Client(SERVER_NAME=host)
+        client.force_login(user)
+        url = reverse(self.changelist_url)
+        for page in range(self.changelist_pages):
+            with self.timer('admin_changelist'):
+                response = client.get(url, {'p': page})
+            if response.status_code != 200:
+                break
+        with self.timer('admin_changelist_search'):
+            client.get(url, {'q': 'BM'})
+
+    @staticmethod
+    def commit():
+        try:
+            return subprocess.check_output(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                stderr=subprocess.DEVNULL).decode().strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
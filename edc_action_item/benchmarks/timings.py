@@ -0,0 +1,55 @@
+from contextlib import contextmanager
+from django.db import connection
+from time import perf_counter
+
+
+class Timings:
+
+    """Collects the latency and number of queries of each
+    sample of one benchmark.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.durations = []
+        self.queries = []
+
+    @contextmanager
+    def measure(self):
+        queries = [0]
+
+        def count_queries(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        start = perf_counter()
+        with connection.execute_wrapper(count_queries):
+            yield
+        self.durations.append(perf_counter() - start)
+        self.queries.append(queries[0])
+
+    @staticmethod
+    def percentile(values, percent):
+        values = sorted(values)
+        index = min(len(values) - 1, int(round(percent / 100 * (len(values) - 1))))
+        return values[index]
+
+    def summary(self):
+        """Returns a dictionary of throughput (per second),
+        latency (milliseconds) and queries per sample.
+        """
+        count = len(self.durations)
+        if not count:
+            return dict(name=self.name, count=0)
+        total = sum(self.durations)
+        return dict(
+            name=self.name,
+            count=count,
+            total_seconds=round(total, 4),
+            per_second=round(count / total, 2) if total else None,
+            mean_ms=round(total / count * 1000, 3),
+            p50_ms=round(self.percentile(self.durations, 50) * 1000, 3),
+            p95_ms=round(self.percentile(self.durations, 95) * 1000, 3),
+            max_ms=round(max(self.durations) * 1000, 3),
+            mean_queries=round(sum(self.queries) / count, 2),
+            max_queries=max(self.queries))
@@ -1,8 +1,9 @@
 from edc_constants.constants import NEW, OPEN, CLOSED, CANCELLED
 
-from .constants import HIGH_PRIORITY, MEDIUM_PRIORITY, LOW_PRIORITY
+from .constants import HIGH_PRIORITY, MEDIUM_PRIORITY, LOW_PRIORITY, SCHEDULED
 
 ACTION_STATUS = (
+    (SCHEDULED, 'Scheduled'),
     (NEW, 'New'),
     (OPEN, 'Open'),
     (CLOSED, 'Closed'),
@@ -1,3 +1,4 @@
 HIGH_PRIORITY = 'high'
 LOW_PRIORITY = 'low'
 MEDIUM_PRIORITY = 'medium'
+SCHEDULED = 'scheduled'
@@ -1,4 +1,5 @@
 from django import forms
+from django.forms.widgets import HiddenInput
 from edc_constants.constants import OPEN, NEW
 
 from ..models import ActionItem
@@ -6,17 +7,54 @@ from ..models import ActionItem
 
 class ActionItemForm(forms.ModelForm):
 
+    version = forms.IntegerField(
+        widget=HiddenInput,
+        required=False)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.limit_parent_action_item_to_subject()
+
     def clean(self):
         cleaned_data = super().clean()
+        self.check_version()
         self.force_open_status()
         return cleaned_data
 
+    def check_version(self):
+        """Raises if the action item was changed since the form
+        was rendered.
+
+        The rendered version is saved to the instance so that the
+        save is a conditional UPDATE on that version.
+        """
+        version = self.cleaned_data.get('version')
+        if version is None:
+            self.cleaned_data['version'] = self.instance.version
+        elif self.instance.id and version != self.instance.version:
+            raise forms.ValidationError(
+                'This action item was changed by another user since you '
+                'opened it. Please reload and try again.',
+                code='stale')
+
     def force_open_status(self):
         """Sets status to open for edited NEW action items.
         """
         if self.instance.id and self.cleaned_data.get('status') == NEW:
             self.cleaned_data['status'] = OPEN
 
+    def limit_parent_action_item_to_subject(self):
+        """Limits the choices for `parent_action_item` to action
+        items of the same subject, if the subject is known.
+        """
+        field = self.fields.get('parent_action_item')
+        subject_identifier = (
+            self.instance.subject_identifier
+            or self.initial.get('subject_identifier'))
+        if field and subject_identifier:
+            field.queryset = field.queryset.filter(
+                subject_identifier=subject_identifier)
+
     class Meta:
         model = ActionItem
         fields = '__all__'
@@ -5,6 +5,23 @@ from ..models import ActionItemUpdate
 
 class ActionItemUpdateForm(forms.ModelForm):
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.limit_action_item_to_subject()
+
+    def limit_action_item_to_subject(self):
+        """Limits the choices for `action_item` to action
+        items of the same subject, if the subject is known.
+        """
+        field = self.fields.get('action_item')
+        if self.instance.action_item_id:
+            subject_identifier = self.instance.action_item.subject_identifier
+        else:
+            subject_identifier = self.initial.get('subject_identifier')
+        if field and subject_identifier:
+            field.queryset = field.queryset.filter(
+                subject_identifier=subject_identifier)
+
     class Meta:
         model = ActionItemUpdate
         fields = '__all__'
@@ -0,0 +1,94 @@
+from django.conf import settings
+from django.db.models.signals import post_init
+from django.utils.timezone import now
+from edc_base.model_managers import HistoricalRecords
+
+from .history_batch import batched_records, history_disabled
+
+
+class ActionItemHistoricalRecords(HistoricalRecords):
+
+    """A HistoricalRecords class that:
+        * does not write a history row for a save that changes
+          nothing, ignoring the audit fields in `ignored_fields`;
+        * defers history rows to a bulk insert if saved within
+          `history_batch`;
+        * writes no history rows within `no_history`.
+
+    Set settings.EDC_ACTION_ITEM_HISTORY_SKIP_UNCHANGED = False to
+    write a history row on every save.
+
+    Use `excluded_fields` to leave large, static fields out of
+    the historical model.
+    """
+
+    ignored_fields = ['modified', 'user_modified', 'hostname_modified',
+                      'device_modified', 'revision', 'user_created',
+                      'hostname_created', 'device_created']
+
+    snapshot_attr = '_history_snapshot'
+
+    def finalize(self, sender, **kwargs):
+        super().finalize(sender, **kwargs)
+        if sender is self.cls:
+            post_init.connect(self.post_init, sender=sender, weak=False)
+
+    @property
+    def skip_unchanged(self):
+        return getattr(settings, 'EDC_ACTION_ITEM_HISTORY_SKIP_UNCHANGED', True)
+
+    def post_init(self, instance, **kwargs):
+        """Keeps a shallow copy of the loaded values.
+
+        Reads `__dict__` only, deferred fields are not loaded.
+        """
+        if instance.pk:
+            setattr(instance, self.snapshot_attr, instance.__dict__.copy())
+
+    def has_changed(self, instance):
+        """Returns True if any included field differs from the
+        loaded values.
+
+        A field that was deferred when loaded but has since been
+        set or loaded counts as changed.
+        """
+        loaded = getattr(instance, self.snapshot_attr, None)
+        if loaded is None:
+            return True
+        for field in self.fields_included(instance):
+            attname = field.attname
+            if attname in self.ignored_fields or attname not in instance.__dict__:
+                continue
+            if attname not in loaded or loaded[attname] != instance.__dict__[attname]:
+                return True
+        return False
+
+    def post_save(self, instance, created, **kwargs):
+        if history_disabled() or getattr(instance, 'skip_history_when_saving', False):
+            return
+        if created or not self.skip_unchanged or self.has_changed(instance):
+            super().post_save(instance, created, **kwargs)
+        snapshot = instance.__dict__.copy()
+        snapshot.pop(self.snapshot_attr, None)
+        setattr(instance, self.snapshot_attr, snapshot)
+
+    def post_delete(self, instance, **kwargs):
+        if not history_disabled():
+            super().post_delete(instance, **kwargs)
+
+    def create_historical_record(self, instance, history_type, *args, **kwargs):
+        records = batched_records()
+        if records is None:
+            return super().create_historical_record(
+                instance, history_type, *args, **kwargs)
+        manager = getattr(instance, self.manager_name)
+        attrs = {field.attname: getattr(instance, field.attname)
+                 for field in self.fields_included(instance)}
+        records.setdefault(manager.model, []).append(
+            manager.model(
+                history_date=getattr(instance, '_history_date', now()),
+                history_type=history_type,
+                history_user=self.get_history_user(instance),
+                history_change_reason=getattr(instance, 'changeReason', None),
+                **attrs))
+        return None
@@ -0,0 +1,59 @@
+import threading
+
+from contextlib import contextmanager
+
+_batch = threading.local()
+
+
+@contextmanager
+def history_batch():
+    """A context manager that collects the history rows written
+    by `ActionItemHistoricalRecords` and inserts them with one
+    `bulk_create` per historical model on exit.
+
+    May be nested, only the outermost context writes.
+
+        with history_batch():
+            for obj in objs:
+                obj.save()
+    """
+    outermost = getattr(_batch, 'records', None) is None
+    if outermost:
+        _batch.records = {}
+    try:
+        yield
+        if outermost:
+            for model, objs in _batch.records.items():
+                model.objects.bulk_create(objs)
+    finally:
+        if outermost:
+            _batch.records = None
+
+
+def batched_records():
+    """Returns the dict of history rows by historical model
+    of the current `history_batch` or None if not batching.
+    """
+    return getattr(_batch, 'records', None)
+
+
+@contextmanager
+def no_history():
+    """A context manager in which `ActionItemHistoricalRecords`
+    writes no history rows on save or delete.
+
+    For rows moved between tables rather than changed, see
+    archive.archive_action_items.
+    """
+    disabled = history_disabled()
+    _batch.disabled = True
+    try:
+        yield
+    finally:
+        _batch.disabled = disabled
+
+
+def history_disabled():
+    """Returns True if within `no_history`.
+    """
+    return getattr(_batch, 'disabled', False)
@@ -0,0 +1,203 @@
+"""Instrumentation of the action lifecycle.
+
+Records wall time, number of DB queries and number of model
+instances created for each instrumented operation, per action
+name:
+
+    get_action_item, close_and_create_next, create_next,
+    append_to_next_if_required, post_save, post_delete
+
+Measurements are sent with the `action_measured` signal and to
+each sink in settings.EDC_ACTION_ITEM_INSTRUMENTATION_SINKS, e.g.
+
+    EDC_ACTION_ITEM_INSTRUMENTATION_SINKS = [
+        'edc_action_item.instrumentation.LogSink',
+        'edc_action_item.instrumentation.JsonLinesSink']
+
+A sink is any callable that accepts a Measurement. Sinks may also
+be added with `register_sink`.
+
+Nested operations are measured inclusively, e.g. the measurement
+for close_and_create_next includes create_next.
+
+Nothing is measured unless there is a sink or a receiver
+connected to `action_measured`.
+"""
+import json
+import logging
+import threading
+
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import connection
+from django.dispatch import Signal
+from django.utils.module_loading import import_string
+from edc_base.utils import get_utcnow
+from functools import wraps
+from time import perf_counter
+
+logger = logging.getLogger(__name__)
+
+Measurement = namedtuple(
+    'Measurement', 'action_name operation duration queries rows_created')
+
+action_measured = Signal(providing_args=['measurement'])
+
+_local = threading.local()
+_sinks = None
+
+
+def get_sinks():
+    global _sinks
+    if _sinks is None:
+        _sinks = [import_string(path)() for path in getattr(
+            settings, 'EDC_ACTION_ITEM_INSTRUMENTATION_SINKS', [])]
+    return _sinks
+
+
+def register_sink(sink):
+    get_sinks().append(sink)
+
+
+def unregister_sink(sink):
+    get_sinks().remove(sink)
+
+
+def enabled():
+    return bool(get_sinks()) or action_measured.has_listeners()
+
+
+def _frames():
+    try:
+        return _local.frames
+    except AttributeError:
+        _local.frames = []
+        return _local.frames
+
+
+def row_created():
+    """Counts a created model instance in each active measurement
+    (see signals).
+    """
+    for frame in _frames():
+        frame['rows_created'] += 1
+
+
+@contextmanager
+def measure(operation, action_name):
+    """A context manager that measures the block and emits
+    a Measurement.
+    """
+    if not enabled():
+        yield
+        return
+    frame = dict(queries=0, rows_created=0)
+
+    def count_queries(execute, sql, params, many, context):
+        frame['queries'] += 1
+        return execute(sql, params, many, context)
+
+    _frames().append(frame)
+    start = perf_counter()
+    try:
+        with connection.execute_wrapper(count_queries):
+            yield
+    finally:
+        duration = perf_counter() - start
+        # frames are nested, remove by identity, not by value
+        frames = _frames()
+        frames[:] = [f for f in frames if f is not frame]
+        emit(Measurement(
+            action_name=action_name,
+            operation=operation,
+            duration=duration,
+            queries=frame['queries'],
+            rows_created=frame['rows_created']))
+
+
+def instrumented(operation):
+    """Decorates an Action method to measure it by action name.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with measure(operation, self.name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def emit(measurement):
+    action_measured.send(sender=Measurement, measurement=measurement)
+    for sink in get_sinks():
+        try:
+            sink(measurement)
+        except Exception as e:
+            logger.exception(f'Instrumentation sink {sink} failed. Got {e}')
+
+
+class AggregateSink:
+
+    """Aggregates measurements in memory by (action_name, operation).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.data = OrderedDict()
+
+    def __call__(self, measurement):
+        key = (measurement.action_name, measurement.operation)
+        with self.lock:
+            stats = self.data.setdefault(key, dict(
+                count=0, duration=0.0, max_duration=0.0, queries=0, rows_created=0))
+            stats['count'] += 1
+            stats['duration'] += measurement.duration
+            stats['max_duration'] = max(stats['max_duration'], measurement.duration)
+            stats['queries'] += measurement.queries
+            stats['rows_created'] += measurement.rows_created
+
+    def stats(self):
+        """Returns a list of dictionaries, one per (action_name,
+        operation), most expensive first.
+        """
+        with self.lock:
+            rows = [dict(action_name=action_name, operation=operation, **stats)
+                    for (action_name, operation), stats in self.data.items()]
+        return sorted(rows, key=lambda row: row['duration'], reverse=True)
+
+    def reset(self):
+        with self.lock:
+            self.data.clear()
+
+
+class LogSink:
+
+    """Logs each measurement to the `edc_action_item.instrumentation`
+    logger at INFO.
+    """
+
+    def __call__(self, measurement):
+        logger.info(
+            f'{measurement.action_name} {measurement.operation} '
+            f'{measurement.duration * 1000:.1f}ms queries={measurement.queries} '
+            f'rows_created={measurement.rows_created}')
+
+
+class JsonLinesSink:
+
+    """Appends each measurement as a JSON line to `path`
+    (default: settings.EDC_ACTION_ITEM_INSTRUMENTATION_PATH).
+    """
+
+    def __init__(self, path=None):
+        self.path = path or getattr(
+            settings, 'EDC_ACTION_ITEM_INSTRUMENTATION_PATH', 'action_items.jsonl')
+        self.lock = threading.Lock()
+
+    def __call__(self, measurement):
+        line = json.dumps(dict(
+            timestamp=get_utcnow().isoformat(), **measurement._asdict()))
+        with self.lock:
+            with open(self.path, 'a') as f:
+                f.write(line + '\n')
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+from edc_base.utils import get_utcnow
+from edc_constants.constants import NEW
+
+from ...constants import SCHEDULED
+from ...models import ActionItem, SubjectActionSummary
+from ...reports import touch as touch_reports
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Changes the status of SCHEDULED action items to NEW once '
+        'activate_after has passed. Uses one UPDATE on the '
+        '(status, activate_after) index.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true', default=False,
+            help='Report the number of action items to be activated')
+
+    def handle(self, *args, **options):
+        qs = ActionItem.objects.filter(
+            status=SCHEDULED, activate_after__lte=get_utcnow())
+        if options.get('dry_run'):
+            self.stdout.write(self.style.SUCCESS(
+                f'Would activate {qs.count()} action items.'))
+            return
+        with transaction.atomic():
+            subject_identifiers = list(
+                qs.order_by().values_list('subject_identifier', flat=True).distinct())
+            activated = qs.update(status=NEW, version=F('version') + 1)
+            if activated:
+                # QuerySet.update() bypasses the post_save signal
+                SubjectActionSummary.objects.rebuild(
+                    subject_identifiers=subject_identifiers)
+        if activated:
+            touch_reports()
+        self.stdout.write(self.style.SUCCESS(
+            f'Activated {activated} scheduled action items.'))
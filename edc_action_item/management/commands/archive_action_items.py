@@ -0,0 +1,54 @@
+import time
+
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from edc_base.utils import get_utcnow
+
+from ...archive import archivable_action_items, archive_action_items
+from ...archive import exclude_referenced_parents
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Moves CLOSED/CANCELLED action items not modified for --days '
+        'days, and their updates, to the archive tables. A parent is '
+        'not archived while it has a child in the ActionItem table.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=365,
+            help='Archive items not modified for this many days (default: 365)')
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Number of action items per batch (default: 500)')
+        parser.add_argument(
+            '--sleep', type=float, default=0.5,
+            help='Seconds to sleep between batches (default: 0.5)')
+        parser.add_argument(
+            '--dry-run', action='store_true', default=False,
+            help='Report the number of action items to be archived')
+
+    def handle(self, *args, **options):
+        cutoff = get_utcnow() - timedelta(days=options.get('days'))
+        dry_run = options.get('dry_run')
+        last_pk = None
+        archived = 0
+        while True:
+            qs = archivable_action_items(cutoff=cutoff).order_by('pk')
+            if last_pk:
+                qs = qs.filter(pk__gt=last_pk)
+            pks = list(qs.values_list('pk', flat=True)[:options.get('batch_size')])
+            if not pks:
+                break
+            last_pk = pks[-1]
+            pks = exclude_referenced_parents(pks)
+            if dry_run:
+                archived += len(pks)
+            else:
+                archived += archive_action_items(pks)
+            self.stdout.write(f'  archived {archived} action items ...\r', ending='')
+            time.sleep(options.get('sleep'))
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS(
+            f'{"Would archive" if dry_run else "Archived"} {archived} action items.'))
@@ -0,0 +1,70 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from edc_constants.constants import CANCELLED, CLOSED, OPEN
+
+from ...models import ActionItem
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Sets ActionItem opened_datetime, closed_datetime and '
+        'cancelled_datetime from the history table where not set.')
+
+    status_fields = {
+        OPEN: 'opened_datetime',
+        CLOSED: 'closed_datetime',
+        CANCELLED: 'cancelled_datetime'}
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Number of action items per batch (default: 500)')
+        parser.add_argument(
+            '--sleep', type=float, default=0.1,
+            help='Seconds to sleep between batches (default: 0.1)')
+
+    def handle(self, *args, **options):
+        qs = ActionItem.objects.filter(
+            Q(status=OPEN, opened_datetime__isnull=True)
+            | Q(status=CLOSED, closed_datetime__isnull=True)
+            | Q(status=CANCELLED, cancelled_datetime__isnull=True)).order_by('pk')
+        last_pk = None
+        updated = 0
+        while True:
+            batch = qs.filter(pk__gt=last_pk) if last_pk else qs
+            pks = list(batch.values_list('pk', flat=True)[:options.get('batch_size')])
+            if not pks:
+                break
+            last_pk = pks[-1]
+            with transaction.atomic():
+                for pk, values in self.status_datetimes(pks).items():
+                    ActionItem.objects.filter(pk=pk).update(**values)
+                    updated += 1
+            self.stdout.write(f'  updated {updated} action items ...\r', ending='')
+            time.sleep(options.get('sleep'))
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS(f'Updated {updated} action items.'))
+
+    def status_datetimes(self, pks):
+        """Returns a dictionary of {pk: {field: datetime}} from the
+        history of each action item.
+
+        The opened datetime is the first change to OPEN; the closed
+        and cancelled datetimes are the last change to CLOSED or
+        CANCELLED.
+        """
+        values = {}
+        previous = {}
+        for pk, status, history_date in ActionItem.history.filter(
+                id__in=pks).order_by('id', 'history_date').values_list(
+                    'id', 'status', 'history_date'):
+            if previous.get(pk) != status and status in self.status_fields:
+                field_name = self.status_fields[status]
+                if field_name != 'opened_datetime' or field_name not in values.get(pk, {}):
+                    values.setdefault(pk, {})[field_name] = history_date
+            previous[pk] = status
+        return values
@@ -0,0 +1,56 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Generates synthetic subjects and action chains with the test '
+        'actions and measures reference model saves, open_action_items, '
+        'popover rendering and the admin changelist. Writes JSON results. '
+        'Run with this app\'s settings (APP_NAME=edc_action_item) on '
+        'SQLite or PostgreSQL.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--subjects', type=int, default=50,
+            help='Number of subjects (default: 50)')
+        parser.add_argument(
+            '--chains', type=int, default=1,
+            help='Number of chains of each kind per subject (default: 1)')
+        parser.add_argument(
+            '--followups', type=int, default=3,
+            help='Number of followups per Initial chain (default: 3)')
+        parser.add_argument(
+            '--changelist-pages', type=int, default=5,
+            help='Number of admin changelist pages to load (default: 5)')
+        parser.add_argument(
+            '--output', default=None,
+            help='Write JSON results to this file instead of stdout')
+        parser.add_argument(
+            '--keep', action='store_true', default=False,
+            help='Keep the generated data (default: roll back)')
+
+    def handle(self, *args, **options):
+        if settings.APP_NAME != 'edc_action_item':
+            raise CommandError(
+                'The benchmark uses the test models. Expected '
+                f'settings.APP_NAME=\'edc_action_item\'. Got {settings.APP_NAME}.')
+        from ...benchmarks import BenchmarkRunner
+        runner = BenchmarkRunner(
+            subjects=options.get('subjects'),
+            chains=options.get('chains'),
+            followups=options.get('followups'),
+            changelist_pages=options.get('changelist_pages'),
+            keep=options.get('keep'),
+            stdout=self.stderr)
+        results = json.dumps(runner.run(), indent=2)
+        if options.get('output'):
+            with open(options.get('output'), 'w') as f:
+                f.write(results)
+            self.stderr.write(self.style.SUCCESS(
+                f'Wrote results to {options.get("output")}.'))
+        else:
+            self.stdout.write(results)
@@ -0,0 +1,106 @@
+import time
+
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from edc_base.utils import get_utcnow
+from edc_constants.constants import CLOSED, CANCELLED
+
+from ...historical_records import ActionItemHistoricalRecords
+from ...models import ActionItem
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Compacts the ActionItem history table. Collapses consecutive '
+        'history rows with an identical state and prunes rows older '
+        'than the retention window for CLOSED/CANCELLED action items. '
+        'The first and last history row of each action item are kept.')
+
+    terminal_status = [CLOSED, CANCELLED]
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retention-days', type=int, default=365,
+            help='Prune rows older than this for CLOSED/CANCELLED items (default: 365)')
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Number of action items per batch (default: 500)')
+        parser.add_argument(
+            '--sleep', type=float, default=0.5,
+            help='Seconds to sleep between batches (default: 0.5)')
+        parser.add_argument(
+            '--resume-after', default=None,
+            help='Resume after this action item id (see output of a previous run)')
+        parser.add_argument(
+            '--dry-run', action='store_true', default=False,
+            help='Report rows and bytes to be reclaimed without deleting')
+
+    def handle(self, *args, **options):
+        history_model = ActionItem.history.model
+        self.state_fields = [
+            f.attname for f in history_model._meta.concrete_fields
+            if not f.name.startswith('history_')
+            and f.attname not in ActionItemHistoricalRecords.ignored_fields]
+        cutoff = get_utcnow() - timedelta(days=options.get('retention_days'))
+        dry_run = options.get('dry_run')
+        last_id = options.get('resume_after')
+        totals = dict(items=0, rows=0, bytes=0)
+        while True:
+            qs = history_model.objects.order_by('id')
+            if last_id:
+                qs = qs.filter(id__gt=last_id)
+            ids = list(qs.values_list('id', flat=True).distinct()[
+                :options.get('batch_size')])
+            if not ids:
+                break
+            rows = self.compactable_rows(history_model, ids, cutoff)
+            totals['items'] += len(ids)
+            totals['rows'] += len(rows)
+            totals['bytes'] += sum(self.row_size(row) for row in rows)
+            if not dry_run and rows:
+                with transaction.atomic():
+                    history_model.objects.filter(
+                        history_id__in=[row.history_id for row in rows]).delete()
+            last_id = ids[-1]
+            self.stdout.write(
+                f'  processed {totals["items"]} action items, '
+                f'{totals["rows"]} rows. Last id {last_id}.\r', ending='')
+            time.sleep(options.get('sleep'))
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS(
+            f'{"Would reclaim" if dry_run else "Reclaimed"} {totals["rows"]} '
+            f'history rows (~{totals["bytes"]} bytes) from '
+            f'{totals["items"]} action items.'))
+
+    def compactable_rows(self, history_model, ids, cutoff):
+        """Returns a list of history rows that may be deleted for
+        the given action item ids.
+        """
+        by_id = {}
+        for row in history_model.objects.filter(id__in=ids).order_by(
+                'id', 'history_date'):
+            by_id.setdefault(row.id, []).append(row)
+        compactable = []
+        for history in by_id.values():
+            if len(history) <= 2:
+                continue
+            prune = history[-1].status in self.terminal_status
+            previous_state = self.state(history[0])
+            for row in history[1:-1]:
+                state = self.state(row)
+                if state == previous_state or (prune and row.history_date < cutoff):
+                    compactable.append(row)
+                previous_state = state
+        return compactable
+
+    def state(self, row):
+        return tuple(getattr(row, attname) for attname in self.state_fields)
+
+    @staticmethod
+    def row_size(row):
+        """Returns an approximate size in bytes of a history row.
+        """
+        values = [getattr(row, f.attname) for f in row._meta.concrete_fields]
+        return sum(len(str(value)) for value in values if value is not None)
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+from edc_base.utils import get_utcnow
+from edc_constants.constants import NEW, OPEN
+
+from ...constants import HIGH_PRIORITY, MEDIUM_PRIORITY, LOW_PRIORITY
+from ...models import ActionItem, SubjectActionSummary
+from ...reports import touch as touch_reports
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Flags NEW/OPEN action items past their due_datetime as overdue '
+        'and, with --escalate, raises their priority by one level. '
+        'Uses set-based UPDATEs on the (status, due_datetime) index.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--escalate', action='store_true', default=False,
+            help='Raise the priority of newly overdue items (low->medium->high)')
+        parser.add_argument(
+            '--dry-run', action='store_true', default=False,
+            help='Report the number of overdue action items')
+
+    def handle(self, *args, **options):
+        now = get_utcnow()
+        qs = ActionItem.objects.filter(
+            status__in=[NEW, OPEN], due_datetime__lt=now, overdue=False)
+        if options.get('dry_run'):
+            self.stdout.write(self.style.SUCCESS(
+                f'Would flag {qs.count()} overdue action items.'))
+            return
+        with transaction.atomic():
+            subject_identifiers = list(
+                qs.order_by().values_list('subject_identifier', flat=True).distinct())
+            escalated = 0
+            if options.get('escalate'):
+                escalated += qs.filter(priority=MEDIUM_PRIORITY).update(
+                    priority=HIGH_PRIORITY)
+                escalated += qs.filter(priority=LOW_PRIORITY).update(
+                    priority=MEDIUM_PRIORITY)
+            flagged = qs.update(overdue=True, version=F('version') + 1)
+            if escalated:
+                # QuerySet.update() bypasses the post_save signal
+                SubjectActionSummary.objects.rebuild(
+                    subject_identifiers=subject_identifiers)
+        touch_reports()
+        self.stdout.write(self.style.SUCCESS(
+            f'Flagged {flagged} overdue action items. Escalated {escalated}.'))
@@ -0,0 +1,80 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import is_naive, make_aware, utc
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Generates a synthetic, reproducible data set of action items, '
+        'updates, history and closure rows with bulk inserts, using the '
+        'registered action classes for chain shapes. For local '
+        'performance work only.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--subjects', type=int, default=1000,
+            help='Number of subjects (default: 1000)')
+        parser.add_argument(
+            '--chains', type=int, default=3,
+            help='Number of action chains per subject (default: 3)')
+        parser.add_argument(
+            '--max-chain-length', type=int, default=6,
+            help='Maximum number of action items in a chain (default: 6)')
+        parser.add_argument(
+            '--days', type=int, default=730,
+            help='Spread report dates over this many days (default: 730)')
+        parser.add_argument(
+            '--sites', default=None,
+            help='Comma separated site ids (default: all sites)')
+        parser.add_argument(
+            '--site-weights', default=None,
+            help='Comma separated relative weights, one per site')
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Random seed (default: 0)')
+        parser.add_argument(
+            '--now', default=None,
+            help=('Latest report date as an ISO 8601 datetime, UTC if no '
+                  'offset is given (default: 2018-10-01T00:00:00)'))
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Rows per bulk insert (default: 5000)')
+
+    def handle(self, *args, **options):
+        from ...benchmarks import ActionItemGenerator, GeneratorError
+        site_ids = self.split(options.get('sites'), int)
+        site_weights = self.split(options.get('site_weights'), float)
+        if site_weights and len(site_weights) != len(site_ids or []):
+            raise CommandError('Expected one --site-weights value per site in --sites.')
+        now = None
+        if options.get('now'):
+            now = parse_datetime(options.get('now'))
+            if not now:
+                raise CommandError(
+                    f'Invalid --now. Expected an ISO 8601 datetime. '
+                    f'Got {options.get("now")}.')
+            if is_naive(now):
+                now = make_aware(now, utc)
+        try:
+            generator = ActionItemGenerator(
+                subjects=options.get('subjects'),
+                chains=options.get('chains'),
+                max_chain_length=options.get('max_chain_length'),
+                days=options.get('days'),
+                site_ids=site_ids,
+                site_weights=site_weights,
+                seed=options.get('seed'),
+                now=now,
+                batch_size=options.get('batch_size'),
+                stdout=self.stdout)
+        except GeneratorError as e:
+            raise CommandError(e)
+        counts = generator.generate()
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS(
+            'Generated ' + ', '.join(f'{v} {k}' for k, v in counts.items()) + '.'))
+
+    @staticmethod
+    def split(value, type_cls):
+        return [type_cls(v) for v in value.split(',') if v] if value else None
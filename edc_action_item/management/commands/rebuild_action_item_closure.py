@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from ...models import ActionItemClosure
+
+
+class Command(BaseCommand):
+
+    help = ('Rebuilds the ActionItem closure table (ancestor, descendant, depth) '
+            'from ActionItem.parent_action_item.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of action items read and inserted per chunk (default: 1000)')
+
+    def handle(self, *args, **options):
+        count = ActionItemClosure.objects.rebuild(
+            batch_size=options.get('batch_size'))
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt ActionItem closure table. {count} rows.'))
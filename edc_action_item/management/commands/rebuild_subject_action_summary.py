@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from ...models import SubjectActionSummary
+
+
+class Command(BaseCommand):
+
+    help = 'Rebuilds SubjectActionSummary from ActionItem, for all or some subjects.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'subject_identifiers', nargs='*',
+            help='Subject identifiers to rebuild (default: all)')
+
+    def handle(self, *args, **options):
+        count = SubjectActionSummary.objects.rebuild(
+            subject_identifiers=options.get('subject_identifiers') or None)
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {count} subject action summaries.'))
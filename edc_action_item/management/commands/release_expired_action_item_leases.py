@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from ...models import ActionItem
+
+
+class Command(BaseCommand):
+
+    help = 'Releases expired action item claims (see ActionItemManager.claim_next).'
+
+    def handle(self, *args, **options):
+        released = ActionItem.objects.release_expired()
+        self.stdout.write(self.style.SUCCESS(
+            f'Released {released} expired action item claims.'))
@@ -0,0 +1,34 @@
+# Generated by Django 2.0.4 on 2018-10-19 13:40
+
+from django.db import migrations
+
+SUBJECT_IDENTIFIER_LIKE_INDEX = 'edc_action_subject_like_idx'
+
+
+def create_subject_identifier_like_index(apps, schema_editor):
+    """Adds a varchar_pattern_ops index on PostgreSQL so that
+    subject_identifier__startswith uses an index whatever the
+    collation. Other backends use the existing indexes.
+    """
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {SUBJECT_IDENTIFIER_LIKE_INDEX} '
+            'ON edc_action_item_actionitem (subject_identifier varchar_pattern_ops)')
+
+
+def drop_subject_identifier_like_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {SUBJECT_IDENTIFIER_LIKE_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('edc_action_item', '0006_auto_20180409_1646'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_subject_identifier_like_index,
+            drop_subject_identifier_like_index),
+    ]
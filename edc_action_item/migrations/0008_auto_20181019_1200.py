@@ -0,0 +1,17 @@
+# Generated by Django 2.0.4 on 2018-10-19 12:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('edc_action_item', '0007_subject_identifier_like_index'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='historicalactionitem',
+            name='instructions',
+        ),
+    ]
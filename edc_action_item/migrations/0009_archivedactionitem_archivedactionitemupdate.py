@@ -0,0 +1,85 @@
+# Generated by Django 2.0.4 on 2018-10-19 12:10
+
+import _socket
+from django.db import migrations, models
+import django.db.models.deletion
+import django_revision.revision_field
+import edc_base.model_fields.hostname_modification_field
+import edc_base.model_fields.userfield
+import edc_base.model_fields.uuid_auto_field
+import edc_base.sites.managers
+import edc_base.utils
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sites', '0002_alter_domain_unique'),
+        ('edc_action_item', '0008_auto_20181019_1200'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedActionItem',
+            fields=[
+                ('created', models.DateTimeField(blank=True, default=edc_base.utils.get_utcnow)),
+                ('modified', models.DateTimeField(blank=True, default=edc_base.utils.get_utcnow)),
+                ('user_created', edc_base.model_fields.userfield.UserField(blank=True, help_text='Updated by admin.save_model', max_length=50, verbose_name='user created')),
+                ('user_modified', edc_base.model_fields.userfield.UserField(blank=True, help_text='Updated by admin.save_model', max_length=50, verbose_name='user modified')),
+                ('hostname_created', models.CharField(blank=True, default=_socket.gethostname, help_text='System field. (modified on create only)', max_length=60)),
+                ('hostname_modified', edc_base.model_fields.hostname_modification_field.HostnameModificationField(blank=True, help_text='System field. (modified on every save)', max_length=50)),
+                ('revision', django_revision.revision_field.RevisionField(blank=True, editable=False, help_text='System field. Git repository tag:branch:commit.', max_length=75, null=True, verbose_name='Revision')),
+                ('device_created', models.CharField(blank=True, max_length=10)),
+                ('device_modified', models.CharField(blank=True, max_length=10)),
+                ('id', edc_base.model_fields.uuid_auto_field.UUIDAutoField(blank=True, editable=False, help_text='System auto field. UUID primary key.', primary_key=True, serialize=False)),
+                ('subject_identifier', models.CharField(max_length=50, verbose_name='Subject Identifier')),
+                ('action_identifier', models.CharField(max_length=25, unique=True)),
+                ('report_datetime', models.DateTimeField(default=edc_base.utils.get_utcnow)),
+                ('reference_model', models.CharField(max_length=50, null=True)),
+                ('reference_identifier', models.CharField(max_length=50, null=True)),
+                ('related_reference_model', models.CharField(max_length=100, null=True)),
+                ('related_reference_identifier', models.CharField(max_length=50, null=True)),
+                ('parent_reference_model', models.CharField(max_length=100, null=True)),
+                ('parent_reference_identifier', models.CharField(max_length=50, null=True)),
+                ('priority', models.CharField(choices=[('high', 'High'), ('medium', 'Medium'), ('low', 'Low')], max_length=25, null=True)),
+                ('parent_action_item_id', models.UUIDField(db_index=True, null=True)),
+                ('parent_action_identifier', models.CharField(max_length=25, null=True)),
+                ('status', models.CharField(choices=[('New', 'New'), ('open', 'Open'), ('closed', 'Closed'), ('cancelled', 'Cancelled')], max_length=25)),
+                ('instructions', models.TextField(null=True)),
+                ('auto_created', models.BooleanField(default=False)),
+                ('auto_created_comment', models.CharField(max_length=25, null=True)),
+                ('archived_datetime', models.DateTimeField(default=edc_base.utils.get_utcnow)),
+                ('action_type', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='edc_action_item.ActionType', verbose_name='Action')),
+                ('site', models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, to='sites.Site')),
+            ],
+            options={
+                'verbose_name': 'Archived Action Item',
+                'verbose_name_plural': 'Archived Action Items',
+            },
+            managers=[
+                ('on_site', edc_base.sites.managers.CurrentSiteManager()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedActionItemUpdate',
+            fields=[
+                ('created', models.DateTimeField(blank=True, default=edc_base.utils.get_utcnow)),
+                ('modified', models.DateTimeField(blank=True, default=edc_base.utils.get_utcnow)),
+                ('user_created', edc_base.model_fields.userfield.UserField(blank=True, help_text='Updated by admin.save_model', max_length=50, verbose_name='user created')),
+                ('user_modified', edc_base.model_fields.userfield.UserField(blank=True, help_text='Updated by admin.save_model', max_length=50, verbose_name='user modified')),
+                ('hostname_created', models.CharField(blank=True, default=_socket.gethostname, help_text='System field. (modified on create only)', max_length=60)),
+                ('hostname_modified', edc_base.model_fields.hostname_modification_field.HostnameModificationField(blank=True, help_text='System field. (modified on every save)', max_length=50)),
+                ('revision', django_revision.revision_field.RevisionField(blank=True, editable=False, help_text='System field. Git repository tag:branch:commit.', max_length=75, null=True, verbose_name='Revision')),
+                ('device_created', models.CharField(blank=True, max_length=10)),
+                ('device_modified', models.CharField(blank=True, max_length=10)),
+                ('id', edc_base.model_fields.uuid_auto_field.UUIDAutoField(blank=True, editable=False, help_text='System auto field. UUID primary key.', primary_key=True, serialize=False)),
+                ('action_identifier', models.CharField(db_index=True, max_length=25)),
+                ('report_datetime', models.DateTimeField(default=edc_base.utils.get_utcnow)),
+                ('comment', models.TextField(max_length=250, null=True)),
+            ],
+            options={
+                'verbose_name': 'Archived Action Item Update',
+                'verbose_name_plural': 'Archived Action Item Updates',
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 2.0.4 on 2018-10-19 12:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+import edc_action_item.models.action_item_closure
+
+
+def backfill_closure(apps, schema_editor):
+    """Inserts the closure rows of existing action items.
+    """
+    closure_model_cls = apps.get_model('edc_action_item', 'actionitemclosure')
+    closure_model_cls.objects.db_manager(schema_editor.connection.alias).rebuild()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('edc_action_item', '0009_archivedactionitem_archivedactionitemupdate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActionItemClosure',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField()),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='edc_action_item.ActionItem')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='edc_action_item.ActionItem')),
+            ],
+            managers=[
+                ('objects', edc_action_item.models.action_item_closure.ActionItemClosureManager()),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='actionitemclosure',
+            unique_together={('ancestor', 'descendant')},
+        ),
+        migrations.AlterIndexTogether(
+            name='actionitemclosure',
+            index_together={('descendant', 'depth')},
+        ),
+        migrations.RunPython(backfill_closure, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 2.0.4 on 2018-10-19 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('edc_action_item', '0010_actionitemclosure'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubjectActionSummary',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject_identifier', models.CharField(max_length=50, unique=True)),
+                ('new_count', models.IntegerField(default=0)),
+                ('open_count', models.IntegerField(default=0)),
+                ('closed_count', models.IntegerField(default=0)),
+                ('cancelled_count', models.IntegerField(default=0)),
+                ('high_priority_count', models.IntegerField(default=0, help_text='NEW or OPEN action items only')),
+                ('medium_priority_count', models.IntegerField(default=0, help_text='NEW or OPEN action items only')),
+                ('low_priority_count', models.IntegerField(default=0, help_text='NEW or OPEN action items only')),
+                ('oldest_open_datetime', models.DateTimeField(help_text='report_datetime of the oldest NEW or OPEN action item', null=True)),
+            ],
+            options={
+                'verbose_name': 'Subject Action Summary',
+                'verbose_name_plural': 'Subject Action Summaries',
+            },
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 2.0.4 on 2018-10-19 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('edc_action_item', '0011_subjectactionsummary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='actionitem',
+            name='cancelled_datetime',
+            field=models.DateTimeField(editable=False, help_text='set when the status changes to CANCELLED', null=True),
+        ),
+        migrations.AddField(
+            model_name='actionitem',
+            name='closed_datetime',
+            field=models.DateTimeField(editable=False, help_text='set when the status changes to CLOSED', null=True),
+        ),
+        migrations.AddField(
+            model_name='actionitem',
+            name='opened_datetime',
+            field=models.DateTimeField(editable=False, help_text='set when the status changes to OPEN', null=True),
+        ),
+        migrations.AddField(
+            model_name='historicalactionitem',
+            name='cancelled_datetime',
+            field=models.DateTimeField(editable=False, help_text='set when the status changes to CANCELLED', null=True),
+        ),
+        migrations.AddField(
+            model_name='historicalactionitem',
+            name='closed_datetime',
+            field=models.DateTimeField(editable=False, help_text='set when the status changes to CLOSED', null=True),
+        ),
+        migrations.AddField(
+            model_name='historicalactionitem',
+            name='opened_datetime',
+            field=models.DateTimeField(editable=False, help_text='set when the status changes to OPEN', null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedactionitem',
+            name='cancelled_datetime',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedactionitem',
+            name='closed_datetime',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedactionitem',
+            name='opened_datetime',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddIndex(
+            model_name='actionitem',
+            index=models.Index(fields=['status', 'opened_datetime'], name='edc_action_opened_dt_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='actionitem',
+            index=models.Index(fields=['status', 'closed_datetime'], name='edc_action_closed_dt_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='actionitem',
+            index=models.Index(fields=['status', 'cancelled_datetime'], name='edc_action_cancelled_dt_idx'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 2.0.4 on 2018-10-19 12:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('edc_action_item', '0012_auto_20181019_1240'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='actiontype',
+            name='due_interval',
+            field=models.DurationField(blank=True, help_text='action items are due this long after the report date', null=True),
+        ),
+        migrations.AddField(
+            model_name='actionitem',
+            name='due_datetime',
+            field=models.DateTimeField(blank=True, help_text='Leave blank to use default for this action type.', null=True),
+        ),
+        migrations.AddField(
+            model_name='actionitem',
+            name='overdue',
+            field=models.BooleanField(default=False, editable=False, help_text='set by the flag_overdue_action_items command'),
+        ),
+        migrations.AddField(
+            model_name='historicalactionitem',
+            name='due_datetime',
+            field=models.DateTimeField(blank=True, help_text='Leave blank to use default for this action type.', null=True),
+        ),
+        migrations.AddField(
+            model_name='historicalactionitem',
+            name='overdue',
+            field=models.BooleanField(default=False, editable=False, help_text='set by the flag_overdue_action_items command'),
+        ),
+        migrations.AddField(
+            model_name='archivedactionitem',
+            name='due_datetime',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedactionitem',
+            name='overdue',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='actionitem',
+            index=models.Index(fields=['status', 'due_datetime'], name='edc_action_due_dt_idx'),
+        ),
+    ]
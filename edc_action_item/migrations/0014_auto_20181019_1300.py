@@ -0,0 +1,51 @@
+# Generated by Django 2.0.4 on 2018-10-19 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('edc_action_item', '0013_auto_20181019_1250'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='actionitem',
+            name='activate_after',
+            field=models.DateTimeField(blank=True, help_text='If in the future, the action item is SCHEDULED and becomes NEW after this date', null=True),
+        ),
+        migrations.AddField(
+            model_name='historicalactionitem',
+            name='activate_after',
+            field=models.DateTimeField(blank=True, help_text='If in the future, the action item is SCHEDULED and becomes NEW after this date', null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedactionitem',
+            name='activate_after',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='actionitem',
+            name='status',
+            field=models.CharField(choices=[('scheduled', 'Scheduled'), ('New', 'New'), ('open', 'Open'), ('closed', 'Closed'), ('cancelled', 'Cancelled')], default='New', max_length=25),
+        ),
+        migrations.AlterField(
+            model_name='historicalactionitem',
+            name='status',
+            field=models.CharField(choices=[('scheduled', 'Scheduled'), ('New', 'New'), ('open', 'Open'), ('closed', 'Closed'), ('cancelled', 'Cancelled')], default='New', max_length=25),
+        ),
+        migrations.AlterField(
+            model_name='archivedactionitem',
+            name='status',
+            field=models.CharField(choices=[('scheduled', 'Scheduled'), ('New', 'New'), ('open', 'Open'), ('closed', 'Closed'), ('cancelled', 'Cancelled')], max_length=25),
+        ),
+        migrations.AddIndex(
+            model_name='actionitem',
+            index=models.Index(fields=['subject_identifier', 'status', 'report_datetime'], name='edc_action_subject_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='actionitem',
+            index=models.Index(fields=['status', 'activate_after'], name='edc_action_activate_idx'),
+        ),
+    ]
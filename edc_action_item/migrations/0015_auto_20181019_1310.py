@@ -0,0 +1,17 @@
+# Generated by Django 2.0.4 on 2018-10-19 13:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('edc_action_item', '0014_auto_20181019_1300'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='actionitem',
+            index=models.Index(fields=['site', 'status', 'priority', 'report_datetime', 'id'], name='edc_action_worklist_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 2.0.4 on 2018-10-19 13:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('edc_action_item', '0015_auto_20181019_1310'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='actionitem',
+            name='claimed_by',
+            field=models.CharField(editable=False, help_text='username, see ActionItemManager.claim_next', max_length=50, null=True),
+        ),
+        migrations.AddField(
+            model_name='actionitem',
+            name='lease_expires',
+            field=models.DateTimeField(editable=False, help_text='the claim by `claimed_by` expires after this date', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='actionitem',
+            index=models.Index(fields=['lease_expires'], name='edc_action_lease_idx'),
+        ),
+    ]
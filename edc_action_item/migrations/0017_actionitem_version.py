@@ -0,0 +1,18 @@
+# Generated by Django 2.0.4 on 2018-10-19 13:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('edc_action_item', '0016_auto_20181019_1320'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='actionitem',
+            name='version',
+            field=models.PositiveIntegerField(default=0, help_text='incremented on each save, see ActionItem._do_update'),
+        ),
+    ]
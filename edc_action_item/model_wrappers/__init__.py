@@ -1 +1,2 @@
 from .action_item_model_wrapper import ActionItemModelWrapper
+from .action_item_row_wrapper import ActionItemRowWrapper
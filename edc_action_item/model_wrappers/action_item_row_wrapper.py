@@ -0,0 +1,56 @@
+from django.apps import apps as django_apps
+from django.conf import settings
+
+from ..action import Action
+from ..action.action import URL_PLACEHOLDER
+from ..site_action_items import site_action_items
+
+
+class ActionItemRowWrapper:
+
+    """A slim wrapper of a named tuple row of an action item
+    for the dashboard action panel (see
+    ActionItemViewMixin.open_action_item_rows).
+
+    The href is built from the cached change URL template of
+    the action item model instead of the model instance.
+    """
+
+    __slots__ = ('row', 'href')
+
+    model = 'edc_action_item.actionitem'
+    fields = [
+        'id', 'action_identifier', 'subject_identifier', 'report_datetime',
+        'status', 'priority', 'action_type__name', 'action_type__display_name']
+    next_url_name = settings.DASHBOARD_URL_NAMES.get('subject_dashboard_url')
+
+    def __init__(self, row=None):
+        self.row = row
+        _, change_url = Action.get_url_templates(django_apps.get_model(self.model))
+        self.href = (
+            f'{change_url.replace(URL_PLACEHOLDER, str(row.id))}?next='
+            f'{self.next_url_name},subject_identifier&'
+            f'subject_identifier={row.subject_identifier}')
+
+    def __getattr__(self, attr):
+        try:
+            row = object.__getattribute__(self, 'row')
+        except AttributeError:
+            raise AttributeError(attr)
+        return getattr(row, attr)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.row.action_identifier})'
+
+    @property
+    def name(self):
+        return self.row.action_type__name
+
+    @property
+    def display_name(self):
+        return self.row.action_type__display_name
+
+    @property
+    def action_item_color(self):
+        return site_action_items.get(
+            self.name, create_action_type=False).color_style
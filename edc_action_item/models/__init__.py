@@ -3,8 +3,12 @@ import sys
 from django.conf import settings
 
 from .action_item import ActionItem, ActionItemUpdatesRequireFollowup, SubjectDoesNotExist
+from .action_item import ActionItemConcurrentUpdate
+from .action_item_closure import ActionItemClosure
 from .action_item_update import ActionItemUpdate
 from .action_type import ActionType, ActionTypeError
+from .archived_action_item import ArchivedActionItem, ArchivedActionItemUpdate
+from .subject_action_summary import SubjectActionSummary
 
 if (settings.APP_NAME == 'edc_action_item'
         and 'migrate' not in sys.argv
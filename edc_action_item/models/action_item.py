@@ -1,21 +1,25 @@
+from datetime import timedelta
 from django.apps import apps as django_apps
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
-from django.db import models
+from django.db import connections, models, transaction
 from django.db.models import Q
 from django.db.models.deletion import PROTECT
 from django.urls.base import reverse
 from django.utils.safestring import mark_safe
-from edc_base.model_managers import HistoricalRecords
 from edc_base.model_mixins import BaseUuidModel
 from edc_base.sites import CurrentSiteManager, SiteModelMixin
 from edc_base.utils import get_utcnow
-from edc_constants.constants import NEW
+from edc_constants.constants import CANCELLED, CLOSED, NEW, OPEN
 from edc_identifier.model_mixins import NonUniqueSubjectIdentifierFieldMixin
 
 from ..admin_site import edc_action_item_admin
 from ..choices import ACTION_STATUS, PRIORITY
+from ..constants import SCHEDULED
+from ..historical_records import ActionItemHistoricalRecords
 from ..identifiers import ActionIdentifier
 from ..site_action_items import site_action_items
+from ..worklist import PRIORITY_ORDER, WORKLIST_STATUS
 from .action_type import ActionType
 
 
@@ -27,11 +31,93 @@ class SubjectDoesNotExist(Exception):
     pass
 
 
+class ActionItemConcurrentUpdate(Exception):
+    pass
+
+
 class ActionItemManager(models.Manager):
 
+    tree_sql = (
+        'WITH RECURSIVE up(id, parent_id) AS ('
+        'SELECT id, parent_action_item_id FROM {table} WHERE id = %s '
+        'UNION ALL '
+        'SELECT p.id, p.parent_action_item_id FROM {table} p '
+        'JOIN up ON p.id = up.parent_id), '
+        'tree(id, depth) AS ('
+        'SELECT id, 0 FROM up WHERE parent_id IS NULL '
+        'UNION ALL '
+        'SELECT c.id, tree.depth + 1 FROM {table} c '
+        'JOIN tree ON c.parent_action_item_id = tree.id) '
+        'SELECT {table}.*, tree.depth AS depth FROM {table} '
+        'JOIN tree ON {table}.id = tree.id '
+        'ORDER BY tree.depth, {table}.report_datetime')
+
     def get_by_natural_key(self, action_identifier):
         return self.get(action_identifier=action_identifier)
 
+    def tree(self, action_item):
+        """Returns a RawQuerySet of all action items in the
+        `parent_action_item` tree of `action_item`, from the root
+        down, with a `depth` attribute (root=0).
+
+        Uses a recursive CTE, one round trip (SQLite, PostgreSQL,
+        MySQL 8).
+        """
+        connection = connections[self.db]
+        pk = self.model._meta.pk.get_db_prep_value(
+            action_item.pk, connection)
+        return self.raw(
+            self.tree_sql.format(
+                table=connection.ops.quote_name(self.model._meta.db_table)),
+            [pk])
+
+    @property
+    def lease_duration(self):
+        return timedelta(seconds=getattr(
+            settings, 'EDC_ACTION_ITEM_LEASE_SECONDS', 900))
+
+    def claim_next(self, user, filters=None, lease_duration=None):
+        """Claims and returns the next unclaimed NEW or OPEN action
+        item, in worklist order, or None.
+
+        Rows locked by a concurrent claim are skipped
+        (SELECT ... FOR UPDATE SKIP LOCKED), so two users never
+        claim the same action item. A claim is a lease that
+        expires after `lease_duration`.
+        """
+        now = get_utcnow()
+        lease_expires = now + (lease_duration or self.lease_duration)
+        qs = self.filter(
+            Q(lease_expires__isnull=True) | Q(lease_expires__lt=now),
+            status__in=WORKLIST_STATUS, **(filters or {}))
+        with transaction.atomic(using=self.db):
+            for priority in PRIORITY_ORDER:
+                obj = qs.filter(priority=priority).order_by(
+                    'report_datetime', 'id').select_for_update(
+                        skip_locked=True, of=('self', )).first()
+                if obj:
+                    # update, not save, to not touch history, signals, etc
+                    self.filter(pk=obj.pk).update(
+                        claimed_by=user.username, lease_expires=lease_expires)
+                    obj.claimed_by = user.username
+                    obj.lease_expires = lease_expires
+                    return obj
+        return None
+
+    def release(self, action_item, user):
+        """Releases a claim held by `user`. Returns True if released.
+        """
+        return bool(self.filter(
+            pk=action_item.pk, claimed_by=user.username).update(
+                claimed_by=None, lease_expires=None))
+
+    def release_expired(self):
+        """Releases all expired claims in one UPDATE. Returns the
+        number released.
+        """
+        return self.filter(lease_expires__lt=get_utcnow()).update(
+            claimed_by=None, lease_expires=None)
+
 
 class ActionItem(NonUniqueSubjectIdentifierFieldMixin, SiteModelMixin, BaseUuidModel):
 
@@ -112,11 +198,60 @@ class ActionItem(NonUniqueSubjectIdentifierFieldMixin, SiteModelMixin, BaseUuidM
         null=True,
         blank=True)
 
+    opened_datetime = models.DateTimeField(
+        null=True,
+        editable=False,
+        help_text='set when the status changes to OPEN')
+
+    closed_datetime = models.DateTimeField(
+        null=True,
+        editable=False,
+        help_text='set when the status changes to CLOSED')
+
+    cancelled_datetime = models.DateTimeField(
+        null=True,
+        editable=False,
+        help_text='set when the status changes to CANCELLED')
+
+    due_datetime = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='Leave blank to use default for this action type.')
+
+    overdue = models.BooleanField(
+        default=False,
+        editable=False,
+        help_text='set by the flag_overdue_action_items command')
+
+    claimed_by = models.CharField(
+        max_length=50,
+        null=True,
+        editable=False,
+        help_text='username, see ActionItemManager.claim_next')
+
+    lease_expires = models.DateTimeField(
+        null=True,
+        editable=False,
+        help_text='the claim by `claimed_by` expires after this date')
+
+    version = models.PositiveIntegerField(
+        default=0,
+        help_text='incremented on each save, see ActionItem._do_update')
+
+    activate_after = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=('If in the future, the action item is SCHEDULED and '
+                   'becomes NEW after this date'))
+
     on_site = CurrentSiteManager()
 
     objects = ActionItemManager()
 
-    history = HistoricalRecords()
+    history = ActionItemHistoricalRecords(
+        excluded_fields=['instructions', 'claimed_by', 'lease_expires', 'version'])
+
+    summary_fields = ['status', 'priority', 'report_datetime']
 
     def __str__(self):
         return (f'{self.action_identifier[-9:]} {self.action_type.name} '
@@ -132,8 +267,96 @@ class ActionItem(NonUniqueSubjectIdentifierFieldMixin, SiteModelMixin, BaseUuidM
             self.reference_model = self.action_type.reference_model
             self.related_reference_model = self.action_type.related_reference_model
             self.instructions = self.action_type.instructions
+            if not self.due_datetime and self.action_type.due_interval:
+                # a deferred action item is due from when it is activated
+                self.due_datetime = max(
+                    self.report_datetime, self.activate_after or self.report_datetime
+                ) + self.action_type.due_interval
+            if (self.status == NEW and self.activate_after
+                    and self.activate_after > get_utcnow()):
+                self.status = SCHEDULED
+        self.update_status_datetimes()
+        if kwargs.get('update_fields') is not None:
+            update_fields = list(kwargs.get('update_fields')) + ['version']
+            if 'status' in update_fields:
+                update_fields.extend(
+                    ['opened_datetime', 'closed_datetime', 'cancelled_datetime'])
+            kwargs.update(update_fields=update_fields)
         super().save(*args, **kwargs)
 
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        """Updates with `WHERE version = n` and increments the
+        version (optimistic concurrency).
+
+        Raises ActionItemConcurrentUpdate if the row was changed
+        since this instance was loaded.
+        """
+        version = self.version
+        values = [(field, model, version + 1 if field.attname == 'version' else value)
+                  for field, model, value in values]
+        updated = super()._do_update(
+            base_qs.filter(version=version), using, pk_val, values,
+            update_fields, forced_update)
+        if updated:
+            self.version = version + 1
+        elif base_qs.filter(pk=pk_val).exists():
+            raise ActionItemConcurrentUpdate(
+                f'Action item was changed by another user or process. '
+                f'Got {self.action_identifier} version {version}.')
+        return updated
+
+    def save_with_retry(self, apply, update_fields=None, retries=None):
+        """Calls `apply(self)` then saves `update_fields` only.
+
+        If the action item was changed concurrently, reloads it
+        and tries again, up to `retries` times
+        (default: settings.EDC_ACTION_ITEM_SAVE_RETRIES or 3).
+        `apply` should be safe to call again on the reloaded
+        instance.
+        """
+        retries = (getattr(settings, 'EDC_ACTION_ITEM_SAVE_RETRIES', 3)
+                   if retries is None else retries)
+        for attempt in range(retries + 1):
+            apply(self)
+            try:
+                with transaction.atomic():
+                    self.save(update_fields=update_fields)
+            except ActionItemConcurrentUpdate:
+                if attempt == retries:
+                    raise
+                self.refresh_from_db()
+                self.loaded_values = {
+                    k: getattr(self, k) for k in self.summary_fields}
+            else:
+                break
+        return self
+
+    def update_status_datetimes(self):
+        """Sets the opened, closed or cancelled datetime if the
+        status has changed since loaded.
+
+        Re-opening an action item clears the closed and
+        cancelled datetimes.
+        """
+        loaded_status = getattr(self, 'loaded_values', {}).get('status')
+        if self.status != loaded_status:
+            if self.status == OPEN:
+                self.opened_datetime = self.opened_datetime or get_utcnow()
+                self.closed_datetime = None
+                self.cancelled_datetime = None
+            elif self.status == CLOSED:
+                self.closed_datetime = get_utcnow()
+            elif self.status == CANCELLED:
+                self.cancelled_datetime = get_utcnow()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_values = {
+            k: v for k, v in zip(field_names, values)
+            if k in cls.summary_fields and v is not models.DEFERRED}
+        return instance
+
     def check_registered_subject(self):
         # subject_identifier
         if self.subject_identifier:
@@ -193,6 +416,30 @@ class ActionItem(NonUniqueSubjectIdentifierFieldMixin, SiteModelMixin, BaseUuidM
                 tracking_identifier=self.related_reference_identifier)
         return None
 
+    def ancestors(self):
+        """Returns a queryset of the ancestors of this action item,
+        nearest first.
+        """
+        return self.__class__.objects.filter(
+            descendant_links__descendant=self,
+            descendant_links__depth__gt=0).order_by('descendant_links__depth')
+
+    def descendants(self):
+        """Returns a queryset of the descendants of this action item,
+        nearest first.
+        """
+        return self.__class__.objects.filter(
+            ancestor_links__ancestor=self,
+            ancestor_links__depth__gt=0).order_by('ancestor_links__depth')
+
+    def chain_root(self):
+        """Returns the first action item in the chain of
+        parent action items, which may be this action item.
+        """
+        return self.__class__.objects.filter(
+            descendant_links__descendant=self).order_by(
+                '-descendant_links__depth').first()
+
     @property
     def identifier(self):
         """Returns a shortened action identifier.
@@ -257,3 +504,21 @@ class ActionItem(NonUniqueSubjectIdentifierFieldMixin, SiteModelMixin, BaseUuidM
         verbose_name_plural = 'Action Items'
         unique_together = ('subject_identifier',
                            'action_type', 'reference_identifier')
+        indexes = [
+            models.Index(fields=['status', 'opened_datetime'],
+                         name='edc_action_opened_dt_idx'),
+            models.Index(fields=['status', 'closed_datetime'],
+                         name='edc_action_closed_dt_idx'),
+            models.Index(fields=['status', 'cancelled_datetime'],
+                         name='edc_action_cancelled_dt_idx'),
+            models.Index(fields=['subject_identifier', 'status', 'report_datetime'],
+                         name='edc_action_subject_status_idx'),
+            models.Index(fields=['site', 'status', 'priority', 'report_datetime', 'id'],
+                         name='edc_action_worklist_idx'),
+            models.Index(fields=['lease_expires'],
+                         name='edc_action_lease_idx'),
+            models.Index(fields=['status', 'activate_after'],
+                         name='edc_action_activate_idx'),
+            models.Index(fields=['status', 'due_datetime'],
+                         name='edc_action_due_dt_idx'),
+        ]
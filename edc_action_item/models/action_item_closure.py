@@ -0,0 +1,121 @@
+from collections import defaultdict
+from django.db import connections, models, transaction
+from django.db.models.deletion import CASCADE
+
+
+class ActionItemClosureManager(models.Manager):
+
+    # rebuild() backfills the table in migration 0009
+    use_in_migrations = True
+
+    def insert_for(self, action_item):
+        """Inserts the closure rows for a new action item, one
+        row per ancestor plus one row to itself (depth=0).
+        """
+        objs = [self.model(ancestor_id=action_item.pk,
+                           descendant_id=action_item.pk, depth=0)]
+        if action_item.parent_action_item_id:
+            objs.extend([
+                self.model(ancestor_id=ancestor_id,
+                           descendant_id=action_item.pk, depth=depth + 1)
+                for ancestor_id, depth in self.filter(
+                    descendant_id=action_item.parent_action_item_id).values_list(
+                        'ancestor_id', 'depth')])
+        self.bulk_create(objs)
+
+    def rebuild(self, batch_size=None):
+        """Deletes and rebuilds all closure rows from
+        ActionItem.parent_action_item in one transaction. Returns
+        the number of rows.
+
+        Works down the hierarchy one level at a time, reading
+        action items in chunks of `batch_size`. The ancestors of
+        a chunk come from the closure rows of the level above.
+        """
+        batch_size = batch_size or 1000
+        action_item_model_cls = self.model._meta.get_field('ancestor').related_model
+        action_items = action_item_model_cls._default_manager.using(self.db)
+        connection = connections[self.db]
+        count = 0
+        with transaction.atomic(using=self.db):
+            # one DELETE statement, the global post_delete receivers
+            # prevent a fast delete by the collector.
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'DELETE FROM {connection.ops.quote_name(self.model._meta.db_table)}')
+            level = action_items.filter(parent_action_item__isnull=True)
+            depth = 0
+            while True:
+                level_count = 0
+                for chunk in self.chunks(level, batch_size):
+                    count += self.insert_chunk(chunk)
+                    level_count += len(chunk)
+                if not level_count:
+                    break
+                # action items whose parent is `depth` levels below a root
+                level = action_items.filter(**{
+                    'parent_action_item__ancestor_links__depth': depth,
+                    'parent_action_item__ancestor_links__ancestor__'
+                    'parent_action_item__isnull': True})
+                depth += 1
+        return count
+
+    @staticmethod
+    def chunks(queryset, batch_size):
+        """Yields lists of (pk, parent_action_item_id) of
+        `batch_size`, ordered by pk.
+        """
+        queryset = queryset.order_by('pk')
+        chunk = list(queryset.values_list('pk', 'parent_action_item_id')[:batch_size])
+        while chunk:
+            yield chunk
+            chunk = list(queryset.filter(pk__gt=chunk[-1][0]).values_list(
+                'pk', 'parent_action_item_id')[:batch_size])
+
+    def insert_chunk(self, chunk):
+        """Inserts the closure rows for a chunk of action items
+        whose parents already have closure rows. Returns the number
+        of rows.
+        """
+        ancestors = defaultdict(list)
+        for descendant_id, ancestor_id, depth in self.filter(
+                descendant_id__in=[parent_id for _, parent_id in chunk if parent_id]
+        ).values_list('descendant_id', 'ancestor_id', 'depth'):
+            ancestors[descendant_id].append((ancestor_id, depth))
+        objs = []
+        for pk, parent_id in chunk:
+            objs.append(self.model(ancestor_id=pk, descendant_id=pk, depth=0))
+            objs.extend([
+                self.model(ancestor_id=ancestor_id, descendant_id=pk, depth=depth + 1)
+                for ancestor_id, depth in ancestors.get(parent_id, [])])
+        self.bulk_create(objs)
+        return len(objs)
+
+
+class ActionItemClosure(models.Model):
+
+    """A closure table of the ActionItem.parent_action_item hierarchy.
+
+    Has a row for every (ancestor, descendant) pair, including
+    each action item to itself at depth 0. Maintained on
+    ActionItem insert (see signals) and delete (CASCADE).
+    """
+
+    ancestor = models.ForeignKey(
+        'edc_action_item.actionitem', on_delete=CASCADE,
+        related_name='descendant_links')
+
+    descendant = models.ForeignKey(
+        'edc_action_item.actionitem', on_delete=CASCADE,
+        related_name='ancestor_links')
+
+    depth = models.PositiveIntegerField()
+
+    objects = ActionItemClosureManager()
+
+    def __str__(self):
+        return f'{self.ancestor_id} -> {self.descendant_id} ({self.depth})'
+
+    class Meta:
+        unique_together = ('ancestor', 'descendant')
+        index_together = ('descendant', 'depth')
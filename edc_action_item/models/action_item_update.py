@@ -1,9 +1,9 @@
 from django.db import models
 from django.db.models.deletion import PROTECT
 from edc_base.model_mixins import BaseUuidModel
-from edc_base.model_managers import HistoricalRecords
 from edc_base.utils import get_utcnow
 
+from ..historical_records import ActionItemHistoricalRecords
 from .action_item import ActionItem
 
 
@@ -25,7 +25,7 @@ class ActionItemUpdate(BaseUuidModel):
 
     objects = ActionItemUpdateManager()
 
-    history = HistoricalRecords()
+    history = ActionItemHistoricalRecords()
 
     def __str__(self):
         return self.action_item.subject_identifier
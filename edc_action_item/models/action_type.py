@@ -55,6 +55,11 @@ class ActionType(BaseUuidModel):
         null=True,
         blank=True)
 
+    due_interval = models.DurationField(
+        null=True,
+        blank=True,
+        help_text='action items are due this long after the report date')
+
     def __str__(self):
         return self.display_name
 
@@ -0,0 +1,159 @@
+from django.db import models
+from django.db.models.deletion import PROTECT
+from edc_base.model_mixins import BaseUuidModel
+from edc_base.sites import CurrentSiteManager, SiteModelMixin
+from edc_base.utils import get_utcnow
+from edc_identifier.model_mixins import NonUniqueSubjectIdentifierFieldMixin
+
+from ..choices import ACTION_STATUS, PRIORITY
+from .action_type import ActionType
+
+
+class ArchivedActionItemManager(models.Manager):
+
+    def get_by_natural_key(self, action_identifier):
+        return self.get(action_identifier=action_identifier)
+
+
+class ArchivedActionItem(NonUniqueSubjectIdentifierFieldMixin, SiteModelMixin,
+                         BaseUuidModel):
+
+    """A CLOSED or CANCELLED ActionItem moved out of the ActionItem
+    table by the `archive_action_items` management command.
+
+    The primary key, action_identifier and audit fields are those
+    of the original ActionItem. The link to the parent is kept as
+    the parent's primary key and action_identifier.
+
+    See also `edc_action_item.archive`.
+    """
+
+    action_identifier = models.CharField(
+        max_length=25,
+        unique=True)
+
+    report_datetime = models.DateTimeField(
+        default=get_utcnow)
+
+    action_type = models.ForeignKey(
+        ActionType, on_delete=PROTECT,
+        related_name='+',
+        verbose_name='Action')
+
+    reference_model = models.CharField(
+        max_length=50,
+        null=True)
+
+    reference_identifier = models.CharField(
+        max_length=50,
+        null=True)
+
+    related_reference_model = models.CharField(
+        max_length=100,
+        null=True)
+
+    related_reference_identifier = models.CharField(
+        max_length=50,
+        null=True)
+
+    parent_reference_model = models.CharField(
+        max_length=100,
+        null=True)
+
+    parent_reference_identifier = models.CharField(
+        max_length=50,
+        null=True)
+
+    priority = models.CharField(
+        max_length=25,
+        choices=PRIORITY,
+        null=True)
+
+    parent_action_item_id = models.UUIDField(
+        null=True,
+        db_index=True)
+
+    parent_action_identifier = models.CharField(
+        max_length=25,
+        null=True)
+
+    status = models.CharField(
+        max_length=25,
+        choices=ACTION_STATUS)
+
+    instructions = models.TextField(
+        null=True)
+
+    auto_created = models.BooleanField(
+        default=False)
+
+    auto_created_comment = models.CharField(
+        max_length=25,
+        null=True)
+
+    opened_datetime = models.DateTimeField(
+        null=True)
+
+    closed_datetime = models.DateTimeField(
+        null=True)
+
+    cancelled_datetime = models.DateTimeField(
+        null=True)
+
+    due_datetime = models.DateTimeField(
+        null=True)
+
+    overdue = models.BooleanField(
+        default=False)
+
+    activate_after = models.DateTimeField(
+        null=True)
+
+    archived_datetime = models.DateTimeField(
+        default=get_utcnow)
+
+    on_site = CurrentSiteManager()
+
+    objects = ArchivedActionItemManager()
+
+    def __str__(self):
+        return (f'{self.action_identifier[-9:]} {self.action_type.name} '
+                f'({self.get_status_display()}, archived)')
+
+    def natural_key(self):
+        return (self.action_identifier,)
+
+    natural_key.dependencies = ['sites.Site']
+
+    @property
+    def identifier(self):
+        """Returns a shortened action identifier.
+        """
+        return self.action_identifier[-9:]
+
+    class Meta:
+        verbose_name = 'Archived Action Item'
+        verbose_name_plural = 'Archived Action Items'
+
+
+class ArchivedActionItemUpdate(BaseUuidModel):
+
+    """An ActionItemUpdate of an archived action item.
+    """
+
+    action_identifier = models.CharField(
+        max_length=25,
+        db_index=True)
+
+    report_datetime = models.DateTimeField(
+        default=get_utcnow)
+
+    comment = models.TextField(
+        max_length=250, null=True)
+
+    def __str__(self):
+        return self.action_identifier
+
+    class Meta:
+        verbose_name = 'Archived Action Item Update'
+        verbose_name_plural = 'Archived Action Item Updates'
@@ -0,0 +1,154 @@
+from collections import Counter
+from django.apps import apps as django_apps
+from django.db import models, transaction
+from django.db.models import Count, F, Min, Q
+from edc_constants.constants import CANCELLED, CLOSED, NEW, OPEN
+
+from ..constants import HIGH_PRIORITY, MEDIUM_PRIORITY, LOW_PRIORITY
+
+ACTIVE_STATUS = [NEW, OPEN]
+
+STATUS_FIELDS = {
+    NEW: 'new_count',
+    OPEN: 'open_count',
+    CLOSED: 'closed_count',
+    CANCELLED: 'cancelled_count'}
+
+PRIORITY_FIELDS = {
+    HIGH_PRIORITY: 'high_priority_count',
+    MEDIUM_PRIORITY: 'medium_priority_count',
+    LOW_PRIORITY: 'low_priority_count'}
+
+
+class SubjectActionSummaryManager(models.Manager):
+
+    action_item_model = 'edc_action_item.actionitem'
+
+    @staticmethod
+    def counts(status=None, priority=None, sign=None):
+        """Returns a Counter of summary fields for one action item.
+
+        Priority counts only include NEW and OPEN action items.
+        """
+        counts = Counter()
+        if status in STATUS_FIELDS:
+            counts[STATUS_FIELDS[status]] += sign
+        if status in ACTIVE_STATUS and priority in PRIORITY_FIELDS:
+            counts[PRIORITY_FIELDS[priority]] += sign
+        return counts
+
+    def update_for(self, subject_identifier=None, old=None, new=None):
+        """Updates the summary for a change to one action item.
+
+        `old` and `new` are dictionaries of `status`, `priority` and
+        `report_datetime` before and after the change. Either may be
+        None for an insert or a delete.
+        """
+        old = old or {}
+        new = new or {}
+        counts = self.counts(sign=-1, **{k: old.get(k) for k in ['status', 'priority']})
+        counts.update(self.counts(sign=1, **{k: new.get(k) for k in ['status', 'priority']}))
+        counts = {k: v for k, v in counts.items() if v}
+        was_active = old.get('status') in ACTIVE_STATUS
+        is_active = new.get('status') in ACTIVE_STATUS
+        update_oldest = (
+            was_active != is_active
+            or (is_active and old.get('report_datetime') != new.get('report_datetime')))
+        if not counts and not update_oldest:
+            return
+        with transaction.atomic():
+            self.get_or_create(subject_identifier=subject_identifier)
+            opts = {k: F(k) + v for k, v in counts.items()}
+            if update_oldest:
+                opts.update(oldest_open_datetime=self.oldest_open_datetime(
+                    subject_identifier))
+            self.filter(subject_identifier=subject_identifier).update(**opts)
+
+    def oldest_open_datetime(self, subject_identifier):
+        model_cls = django_apps.get_model(self.action_item_model)
+        return model_cls.objects.filter(
+            subject_identifier=subject_identifier,
+            status__in=ACTIVE_STATUS).aggregate(
+                oldest=Min('report_datetime')).get('oldest')
+
+    def rebuild(self, subject_identifiers=None):
+        """Deletes and recreates summaries from ActionItem, for
+        all or the given subjects. Returns the number of summaries.
+        """
+        model_cls = django_apps.get_model(self.action_item_model)
+        qs = model_cls.objects.all()
+        summaries = self.all()
+        if subject_identifiers is not None:
+            qs = qs.filter(subject_identifier__in=subject_identifiers)
+            summaries = summaries.filter(subject_identifier__in=subject_identifiers)
+        aggregates = dict(
+            oldest_open_datetime=Min(
+                'report_datetime', filter=Q(status__in=ACTIVE_STATUS)))
+        for status, field_name in STATUS_FIELDS.items():
+            aggregates[field_name] = Count('pk', filter=Q(status=status))
+        for priority, field_name in PRIORITY_FIELDS.items():
+            aggregates[field_name] = Count(
+                'pk', filter=Q(status__in=ACTIVE_STATUS, priority=priority))
+        rows = qs.order_by().values('subject_identifier').annotate(**aggregates)
+        with transaction.atomic():
+            summaries.delete()
+            self.bulk_create([self.model(**row) for row in rows], batch_size=500)
+        return len(rows)
+
+    def for_subjects(self, subject_identifiers):
+        """Returns a dictionary of summaries by subject_identifier,
+        in one query.
+        """
+        return {obj.subject_identifier: obj for obj in self.filter(
+            subject_identifier__in=subject_identifiers)}
+
+
+class SubjectActionSummary(models.Model):
+
+    """Per-subject counts of action items, maintained from
+    ActionItem post_save/post_delete (see signals).
+
+    Use the `rebuild_subject_action_summary` management command
+    to repair drift, e.g. after updates with QuerySet.update().
+    """
+
+    subject_identifier = models.CharField(
+        max_length=50,
+        unique=True)
+
+    new_count = models.IntegerField(default=0)
+
+    open_count = models.IntegerField(default=0)
+
+    closed_count = models.IntegerField(default=0)
+
+    cancelled_count = models.IntegerField(default=0)
+
+    high_priority_count = models.IntegerField(
+        default=0,
+        help_text='NEW or OPEN action items only')
+
+    medium_priority_count = models.IntegerField(
+        default=0,
+        help_text='NEW or OPEN action items only')
+
+    low_priority_count = models.IntegerField(
+        default=0,
+        help_text='NEW or OPEN action items only')
+
+    oldest_open_datetime = models.DateTimeField(
+        null=True,
+        help_text='report_datetime of the oldest NEW or OPEN action item')
+
+    objects = SubjectActionSummaryManager()
+
+    def __str__(self):
+        return self.subject_identifier
+
+    @property
+    def active_count(self):
+        return self.new_count + self.open_count
+
+    class Meta:
+        verbose_name = 'Subject Action Summary'
+        verbose_name_plural = 'Subject Action Summaries'
@@ -0,0 +1,105 @@
+"""Aggregated action item reports.
+
+Counts and ages of action items grouped by any of action type,
+status, priority, site and period, aggregated in the database.
+
+Results are cached. The cache key includes a modification stamp
+that is updated on every ActionItem save or delete (see signals),
+so a cached report is never older than the last change to the
+ActionItem table made through the ORM. Changes made with
+QuerySet.update() expire with `cache_timeout`.
+
+    from edc_action_item.reports import action_item_report
+
+    rows = action_item_report(group_by=['action_type', 'status'], period='month')
+"""
+from hashlib import md5
+
+from django.apps import apps as django_apps
+from django.core.cache import cache
+from django.db.models import Count, Max, Min
+from django.db.models.functions import TruncDay, TruncMonth, TruncQuarter, TruncYear
+from edc_base.utils import get_utcnow
+
+GROUP_BY = {
+    'action_type': 'action_type__name',
+    'status': 'status',
+    'priority': 'priority',
+    'site': 'site__name',
+}
+
+PERIODS = {
+    'day': TruncDay,
+    'month': TruncMonth,
+    'quarter': TruncQuarter,
+    'year': TruncYear,
+}
+
+STAMP_KEY = 'edc_action_item:reports:stamp'
+
+
+class ReportError(Exception):
+    pass
+
+
+def touch():
+    """Updates the modification stamp, invalidating cached reports.
+    """
+    cache.set(STAMP_KEY, get_utcnow().timestamp(), None)
+
+
+def action_item_report(group_by=None, period=None, filters=None,
+                       cache_timeout=None):
+    """Returns a list of dictionaries, one per group, with
+    `count`, `oldest` and `newest` report_datetime and
+    `oldest_age_days`.
+
+    group_by: list of keys of GROUP_BY.
+    period: one of PERIODS, groups by report_datetime truncated
+        to the period.
+    filters: optional dictionary of ActionItem filters, e.g.
+        {'subject_identifier': '123'}.
+    """
+    group_by = list(group_by or ['action_type', 'status'])
+    filters = filters or {}
+    invalid = [g for g in group_by if g not in GROUP_BY]
+    if invalid or (period and period not in PERIODS):
+        raise ReportError(
+            f'Invalid report options. Expected group_by in {list(GROUP_BY)} and '
+            f'period in {list(PERIODS)}. Got group_by={group_by}, period={period}.')
+    stamp = cache.get(STAMP_KEY)
+    if stamp is None:
+        touch()
+        stamp = cache.get(STAMP_KEY)
+    key = md5(
+        f'{group_by}{period}{sorted(filters.items())}{stamp}'.encode()).hexdigest()
+    key = f'edc_action_item:reports:{key}'
+    rows = cache.get(key)
+    if rows is None:
+        rows = _aggregate(group_by, period, filters)
+        cache.set(key, rows, 300 if cache_timeout is None else cache_timeout)
+    return rows
+
+
+def _aggregate(group_by, period, filters):
+    model_cls = django_apps.get_model('edc_action_item.actionitem')
+    qs = model_cls.objects.filter(**filters).order_by()
+    fields = {name: GROUP_BY[name] for name in group_by}
+    if period:
+        qs = qs.annotate(period=PERIODS[period]('report_datetime'))
+        fields['period'] = 'period'
+    qs = qs.values(*fields.values()).annotate(
+        count=Count('pk'),
+        oldest=Min('report_datetime'),
+        newest=Max('report_datetime')).order_by(*fields.values())
+    now = get_utcnow()
+    rows = []
+    for row in qs:
+        dct = {name: row[lookup] for name, lookup in fields.items()}
+        dct.update(
+            count=row['count'],
+            oldest=row['oldest'],
+            newest=row['newest'],
+            oldest_age_days=(now - row['oldest']).days if row['oldest'] else None)
+        rows.append(dct)
+    return rows
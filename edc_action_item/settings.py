@@ -17,6 +17,7 @@ import sys
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 APP_NAME = 'edc_action_item'
 SITE_ID = 40
+REVIEWER_SITE_ID = 0
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/dev/howto/deployment/checklist/
@@ -46,6 +47,7 @@ INSTALLED_APPS = [
     'edc_protocol.apps.AppConfig',
     'edc_identifier.apps.AppConfig',
     'edc_device.apps.AppConfig',
+    'edc_model_admin.apps.AppConfig',
     'edc_action_item.apps.AppConfig',
 ]
 
@@ -55,6 +57,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.sites.middleware.CurrentSiteMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'edc_dashboard.middleware.DashboardMiddleware',
@@ -132,14 +135,12 @@ USE_TZ = True
 STATIC_URL = '/static/'
 
 
-PARENT_REFERENCE_MODEL1 = ''
-PARENT_REFERENCE_MODEL2 = ''
-ACTION_ITEM_MODEL_FK_FIELD = ''
-
 DASHBOARD_URL_NAMES = {
     'subject_dashboard_url': 'edc_action_item:subject_dashboard_url',
 }
 
+EDC_ACTION_ITEM_POPOVER_URL_NAME = 'popover_json_url'
+
 if 'test' in sys.argv:
 
     class DisableMigrations:
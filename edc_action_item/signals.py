@@ -1,8 +1,14 @@
+from django.core.exceptions import ObjectDoesNotExist
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from edc_constants.constants import OPEN
 
-from .models import ActionItem, ActionItemUpdate
+from .archive import restore_action_item
+from .instrumentation import measure, row_created
+from .models import ActionItem, ActionItemClosure, ActionItemUpdate
+from .models import ActionType, SubjectActionSummary
+from .reports import touch as touch_reports
+from .site_action_items import site_action_items
 
 
 @receiver(post_save, weak=False, dispatch_uid='update_or_create_action_item_on_post_save')
@@ -22,7 +28,43 @@ def update_or_create_action_item_on_post_save(sender, instance, raw,
             if ('historical' not in instance._meta.label_lower
                     and not (isinstance(instance, ActionItem) or 
                              isinstance(instance, ActionItemUpdate))):
-                instance.action_cls(reference_model_obj=instance)
+                with measure('post_save', instance.action_cls.name):
+                    instance.action_cls(reference_model_obj=instance)
+
+
+@receiver(post_save, sender=ActionItem, weak=False,
+          dispatch_uid='action_item_closure_on_post_save')
+def action_item_closure_on_post_save(sender, instance, raw, created, **kwargs):
+    """Inserts the closure table rows for a new action item.
+    """
+    if created and not raw:
+        ActionItemClosure.objects.insert_for(instance)
+
+
+@receiver(post_save, sender=ActionItem, weak=False,
+          dispatch_uid='subject_action_summary_on_post_save')
+def subject_action_summary_on_post_save(sender, instance, raw, created, **kwargs):
+    """Updates the subject's action summary counts.
+    """
+    if not raw:
+        new = {k: getattr(instance, k) for k in ActionItem.summary_fields}
+        SubjectActionSummary.objects.update_for(
+            subject_identifier=instance.subject_identifier,
+            old=None if created else getattr(instance, 'loaded_values', None),
+            new=new)
+        instance.loaded_values = new
+    touch_reports()
+
+
+@receiver(post_delete, sender=ActionItem, weak=False,
+          dispatch_uid='subject_action_summary_on_post_delete')
+def subject_action_summary_on_post_delete(sender, instance, using, **kwargs):
+    """Updates the subject's action summary counts.
+    """
+    SubjectActionSummary.objects.update_for(
+        subject_identifier=instance.subject_identifier,
+        old=getattr(instance, 'loaded_values', None))
+    touch_reports()
 
 
 @receiver(post_delete, weak=False,
@@ -30,6 +72,9 @@ def update_or_create_action_item_on_post_save(sender, instance, raw,
 def action_on_post_delete(sender, instance, using, **kwargs):
     """Re-opens an action item when the action's reference
     model is deleted.
+
+    An archived action item is restored first. Does nothing if
+    the action item does not exist in either table.
     """
     if not isinstance(instance, ActionItem):
         try:
@@ -37,8 +82,35 @@ def action_on_post_delete(sender, instance, using, **kwargs):
         except AttributeError:
             pass
         else:
-            obj = ActionItem.objects.get(
-                action_identifier=instance.action_identifier)
-            obj.status = OPEN
-            obj.reference_identifier = None
-            obj.save()
+            def reopen(obj):
+                obj.status = OPEN
+                obj.reference_identifier = None
+
+            with measure('post_delete', instance.action_cls.name):
+                try:
+                    obj = ActionItem.objects.get(
+                        action_identifier=instance.action_identifier)
+                except ObjectDoesNotExist:
+                    try:
+                        obj = restore_action_item(instance.action_identifier)
+                    except ObjectDoesNotExist:
+                        return
+                obj.save_with_retry(
+                    reopen, update_fields=['status', 'reference_identifier'])
+
+
+@receiver(post_save, weak=False, dispatch_uid='instrumentation_on_post_save')
+def instrumentation_on_post_save(sender, instance, raw, created, **kwargs):
+    """Counts created model instances for the instrumentation.
+    """
+    if created and not raw:
+        row_created()
+
+
+@receiver([post_save, post_delete], sender=ActionType, weak=False,
+          dispatch_uid='reset_show_link_to_add_actions')
+def reset_show_link_to_add_actions(sender, instance, **kwargs):
+    """Resets the cached links to add actions (see
+    site_action_items.get_show_link_to_add_actions).
+    """
+    site_action_items.reset_show_link_to_add_actions()
@@ -18,6 +18,22 @@ class SiteActionError(Exception):
     pass
 
 
+class ShowLinkToAddAction:
+
+    """A record of an action class with `show_link_to_add`.
+    """
+
+    __slots__ = ('name', 'display_name', 'action_type_id')
+
+    def __init__(self, name=None, display_name=None, action_type_id=None):
+        self.name = name
+        self.display_name = display_name
+        self.action_type_id = action_type_id
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.name})'
+
+
 class SiteActionItemCollection:
 
     populated_action_types = False
@@ -38,6 +54,17 @@ class SiteActionItemCollection:
     def __iter__(self):
         return iter(self.registry.values())
 
+    @property
+    def registry(self):
+        return self._registry
+
+    @registry.setter
+    def registry(self, registry):
+        """Sets the registry and resets the links to add actions.
+        """
+        self._registry = registry
+        self.reset_show_link_to_add_actions()
+
     def register(self, action_cls=None):
         if action_cls.name in self.registry:
             raise AlreadyRegistered(
@@ -45,6 +72,7 @@ class SiteActionItemCollection:
                 f'for {action_cls.__name__}')
         else:
             self.registry.update({action_cls.name: action_cls})
+        self.reset_show_link_to_add_actions()
         if action_cls.show_link_to_changelist:
             prn = Prn(
                 model=action_cls.reference_model,
@@ -54,15 +82,20 @@ class SiteActionItemCollection:
             except AlreadyRegistered:
                 pass
 
-    def get(self, name):
+    def get(self, name, create_action_type=True):
         """Returns an action class.
+
+        Set `create_action_type=False` to skip the ActionType
+        query if the action type is known to exist, for example
+        when reading existing action items.
         """
         if name not in self.registry:
             raise SiteActionError(
                 f'Action does not exist. Did you register the Action? '
                 f'Expected one of {self.registry}. Got {name}.')
-        # force create action type if it does not exist
-        self.registry.get(name).action_type()
+        if create_action_type:
+            # force create action type if it does not exist
+            self.registry.get(name).action_type()
         return self.registry.get(name)
 
     def get_by_model(self, model=None):
@@ -74,14 +107,26 @@ class SiteActionItemCollection:
         return None
 
     def get_show_link_to_add_actions(self):
-        class Wrapper:
-            def __init__(self, action_cls=None):
-                self.name = action_cls.name
-                self.display_name = action_cls.display_name
-                self.action_type_id = str(action_cls.action_type().pk)
-        names = [v.name for v in self.registry.values()
-                 if v.show_link_to_add]
-        return [Wrapper(action_cls=self.get(name)) for name in names]
+        """Returns a tuple of ShowLinkToAddAction, one per action
+        class with `show_link_to_add`.
+
+        Computed once per process and reset on `register`, when
+        the registry is replaced or when an ActionType is saved or
+        deleted (see signals).
+        """
+        if self._show_link_to_add_actions is None:
+            show_link_to_add_actions = tuple(
+                ShowLinkToAddAction(
+                    name=action_cls.name,
+                    display_name=action_cls.display_name,
+                    action_type_id=str(action_cls.action_type().pk))
+                for action_cls in list(self.registry.values())
+                if action_cls.show_link_to_add)
+            self._show_link_to_add_actions = show_link_to_add_actions
+        return self._show_link_to_add_actions
+
+    def reset_show_link_to_add_actions(self):
+        self._show_link_to_add_actions = None
 
     def populate_action_types(self):
         if not self.populated_action_types:
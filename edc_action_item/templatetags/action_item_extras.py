@@ -1,19 +1,32 @@
+from collections import defaultdict
+from hashlib import md5
 from pprint import pprint
 from urllib.parse import urlparse, parse_qsl
 
 from django import template
 from django.apps import apps as django_apps
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
 from edc_base.utils import convert_php_dateformat
 from edc_constants.constants import OPEN
 
+from ..action import get_parent_reference_fks
 from ..choices import ACTION_STATUS
 from ..constants import HIGH_PRIORITY
 from ..site_action_items import site_action_items
 
 register = template.Library()
 
+SUBJECT_IDENTIFIER_PLACEHOLDER = '__subject_identifier__'
+
+# {subject_dashboard_url: (show_link_to_add_actions, html)}
+_add_action_item_popovers = {}
+
 
 @register.inclusion_tag('edc_action_item/add_action_item_popover.html')
 def add_action_item_popover(subject_identifier, subject_dashboard_url):
@@ -24,42 +37,185 @@ def add_action_item_popover(subject_identifier, subject_dashboard_url):
         action_item_add_url=action_item_add_url,
         subject_identifier=subject_identifier,
         subject_dashboard_url=subject_dashboard_url,
-        show_link_to_add_actions=show_link_to_add_actions)
-
-
-def model_fk(action_item_obj=None):
-    ref_model_a = settings.PARENT_REFERENCE_MODEL1
-    ref_model_b = settings.PARENT_REFERENCE_MODEL2
-    if ref_model_a and ref_model_b:
-        if action_item_obj.parent_reference_model == ref_model_a:
-            app_label, model_name = ref_model_a.split('.')
-            mdl_cls = django_apps.get_model(app_label, model_name)
-            try:
-                obj = mdl_cls.objects.get(
-                    subject_identifier=action_item_obj.subject_identifier,
-                    tracking_identifier=action_item_obj.parent_reference_identifier)
-                return {settings.ACTION_ITEM_MODEL_FK_FIELD: getattr(obj, 'pk')}
-            except mdl_cls.DoesNotExist:
-                pass
-        elif action_item_obj.parent_reference_model == ref_model_b:
-            app_label, model_name = ref_model_b.split('.')
-            mdl_cls = django_apps.get_model(app_label, model_name)
-            try:
-                obj = mdl_cls.objects.get(
-                    subject_identifier=action_item_obj.subject_identifier,
-                    tracking_identifier=action_item_obj.parent_reference_identifier)
-                field_name = settings.ACTION_ITEM_MODEL_FK_FIELD
-                return {
-                    settings.ACTION_ITEM_MODEL_FK_FIELD: getattr(obj, field_name).pk}
-            except mdl_cls.DoesNotExist:
-                pass
-        else:
-            return
-    return
+        show_link_to_add_actions=show_link_to_add_actions,
+        add_action_item_popover_html=add_action_item_popover_html(
+            subject_identifier, subject_dashboard_url, action_item_add_url,
+            show_link_to_add_actions))
+
+
+def add_action_item_popover_html(subject_identifier, subject_dashboard_url,
+                                 action_item_add_url, show_link_to_add_actions):
+    """Returns the popover HTML, rendered once per
+    subject_dashboard_url with a placeholder for the
+    subject_identifier.
+
+    Rendered again if the links to add actions are reset
+    (see site_action_items.get_show_link_to_add_actions).
+    """
+    try:
+        rendered_for, html = _add_action_item_popovers[subject_dashboard_url]
+    except KeyError:
+        rendered_for = None
+    if rendered_for is not show_link_to_add_actions:
+        html = render_to_string(
+            'edc_action_item/add_action_item_popover_content.html',
+            dict(action_item_add_url=action_item_add_url,
+                 subject_identifier=SUBJECT_IDENTIFIER_PLACEHOLDER,
+                 subject_dashboard_url=subject_dashboard_url,
+                 show_link_to_add_actions=show_link_to_add_actions))
+        _add_action_item_popovers[subject_dashboard_url] = (
+            show_link_to_add_actions, html)
+    return mark_safe(
+        html.replace(SUBJECT_IDENTIFIER_PLACEHOLDER, escape(subject_identifier)))
+
+
+def popover_cache_key(action_item, href, modified=None):
+    """Returns the cache key of the popover context of an
+    action item or None if not cached.
+
+    The key changes if the action item, its reference model
+    instance, its parent action item or the parent's reference
+    model instance is saved:
+        - action item pk, modified and version;
+        - reference model instance modified;
+        - parent action item modified and version;
+        - parent reference model instance modified;
+        - the wrapper href (next url).
+
+    `modified` is the tuple of the two reference model modified
+    datetimes from get_popover_modified. If None, they are
+    queried here, two queries per action item, even if the
+    context is then found in the cache.
+
+    Anything else, e.g. a change to an Action class or URL
+    config, is picked up after
+    settings.EDC_ACTION_ITEM_POPOVER_CACHE_TIMEOUT seconds
+    (default: 3600, 0 to disable) or a cache clear.
+    """
+    if not getattr(settings, 'EDC_ACTION_ITEM_POPOVER_CACHE_TIMEOUT', 3600):
+        return None
+    parent = action_item.parent_action_item
+    if modified is None:
+        modified = get_popover_modified([action_item])[action_item.action_identifier]
+    reference_modified, parent_reference_modified = modified
+    value = (f'{action_item.pk}{action_item.modified}{action_item.version}'
+             f'{reference_modified}'
+             f'{parent.pk if parent else None}{parent.modified if parent else None}'
+             f'{parent.version if parent else None}'
+             f'{parent_reference_modified}{href}')
+    return f'edc_action_item:popover:{md5(value.encode()).hexdigest()}'
+
+
+def get_popover_modified(action_items):
+    """Returns a dictionary of (reference model modified, parent
+    reference model modified) by action_identifier for a list of
+    action items, for popover_cache_key.
+
+    One query per reference model and one per parent reference
+    model. A datetime is None if the instance does not exist.
+    """
+    # {model: {lookup value: [action_identifier, ...]}}
+    references = defaultdict(lambda: defaultdict(list))
+    parent_references = defaultdict(lambda: defaultdict(list))
+    for action_item in action_items:
+        if action_item.reference_model:
+            references[action_item.reference_model][
+                action_item.action_identifier].append(action_item.action_identifier)
+        parent = action_item.parent_action_item
+        if parent and parent.reference_model:
+            parent_references[parent.reference_model][
+                parent.reference_identifier].append(action_item.action_identifier)
+    reference_modified = get_modified(references, 'action_identifier')
+    parent_reference_modified = get_modified(parent_references, 'tracking_identifier')
+    return {
+        action_item.action_identifier: (
+            reference_modified.get(action_item.action_identifier),
+            parent_reference_modified.get(action_item.action_identifier))
+        for action_item in action_items}
+
+
+def get_modified(lookups, lookup_field):
+    """Returns a dictionary of modified datetimes by
+    action_identifier given {model: {lookup value: [action_identifier, ...]}}.
+    """
+    modified = {}
+    for model, action_identifiers in lookups.items():
+        try:
+            model_cls = django_apps.get_model(model)
+        except (LookupError, ValueError):
+            continue
+        for value, dt in model_cls.objects.filter(
+                **{f'{lookup_field}__in': list(action_identifiers)}).values_list(
+                    lookup_field, 'modified'):
+            for action_identifier in action_identifiers[value]:
+                modified[action_identifier] = dt
+    return modified
 
 
 @register.inclusion_tag('edc_action_item/action_item_with_popover.html')
 def action_item_with_popover(action_item_model_wrapper, tabindex):
+    """Returns the popover context, from the cache if nothing
+    has changed (see popover_cache_key).
+
+    `parent_action_item` is added to the cached context, the
+    reference model instance is not included (see
+    `reference_model_exists`).
+    """
+    action_item = action_item_model_wrapper.object
+    key = popover_cache_key(
+        action_item, action_item_model_wrapper.href,
+        modified=getattr(action_item_model_wrapper, 'popover_modified', None))
+    context = cache.get(key) if key else None
+    if context is None:
+        context = action_item_popover_context(action_item_model_wrapper)
+        if key:
+            cache.set(key, context, getattr(
+                settings, 'EDC_ACTION_ITEM_POPOVER_CACHE_TIMEOUT', 3600))
+    return dict(
+        context, parent_action_item=action_item.parent_action_item, tabindex=tabindex)
+
+
+@register.inclusion_tag('edc_action_item/action_item_with_lazy_popover.html')
+def action_item_with_lazy_popover(action_item_model_wrapper, tabindex):
+    """Returns the context for a list item only. The popover
+    content is fetched from the popover JSON view when opened.
+    """
+    action_item = action_item_model_wrapper.object
+    action_cls = site_action_items.get(
+        action_item.action_type.name, create_action_type=False)
+    return lazy_popover_context(
+        action_item.action_identifier, action_cls.color_style,
+        action_item.action_type.display_name, tabindex)
+
+
+@register.inclusion_tag('edc_action_item/action_item_with_lazy_popover.html')
+def action_item_row_with_lazy_popover(action_item_row_wrapper, tabindex):
+    """As action_item_with_lazy_popover for an ActionItemRowWrapper.
+    """
+    return lazy_popover_context(
+        action_item_row_wrapper.action_identifier,
+        action_item_row_wrapper.action_item_color,
+        action_item_row_wrapper.display_name, tabindex)
+
+
+def lazy_popover_context(action_identifier, action_item_color, display_name, tabindex):
+    return dict(
+        action_identifier=action_identifier,
+        action_item_color=action_item_color,
+        display_name=display_name,
+        popover_url=reverse(
+            getattr(settings, 'EDC_ACTION_ITEM_POPOVER_URL_NAME',
+                    'edc_action_item:popover_json_url'),
+            kwargs=dict(action_identifier=action_identifier)),
+        tabindex=tabindex)
+
+
+def action_item_popover_context(action_item_model_wrapper):
+    """Returns the popover context of an action item.
+
+    Values are primitives only, the context is cached (see
+    action_item_with_popover).
+    """
     strike_thru = None
     action_item = action_item_model_wrapper.object
     href = action_item_model_wrapper.href
@@ -76,12 +232,14 @@ def action_item_with_popover(action_item_model_wrapper, tabindex):
     # this reference model and url
     reference_model_cls = django_apps.get_model(action_item.action_type.model)
     query_dict = dict(parse_qsl(urlparse(href).query))
-    model_fk_dict = model_fk(action_item_obj=action_item)
-    if model_fk_dict:
-        query_dict.update(model_fk_dict)
-    parent_reference_model_url = None
-    parent_reference_model_name = None
-    action_item_reason = None
+    try:
+        parent_reference_fk = action_item_model_wrapper.parent_reference_fk
+    except AttributeError:
+        parent_reference_fk = get_parent_reference_fks([action_item]).get(
+            action_item.action_identifier)
+    query_dict.update(parent_reference_fk or {})
+    parent_context = dict(
+        parent_model_url=None, parent_model_name=None, action_item_reason=None)
     parent_action_identifier = None
     # reference_model and url
     action_cls = site_action_items.get(reference_model_cls.action_name)
@@ -90,15 +248,7 @@ def action_item_with_popover(action_item_model_wrapper, tabindex):
             action_identifier=action_item.action_identifier)
     except ObjectDoesNotExist:
         reference_model_obj = None
-    try:
-        subject_visit = reference_model_obj.visit
-    except (AttributeError, ObjectDoesNotExist):
-        pass
-    else:
-        # reference model is a CRF, add visit to querystring
-        query_dict.update({
-            reference_model_obj.visit_model_attr(): str(subject_visit.pk),
-            'appointment': str(subject_visit.appointment.pk)})
+    query_dict.update(visit_query(reference_model_obj))
     try:
         reference_model_url = action_cls.reference_model_url(
             action_item=action_item,
@@ -112,39 +262,8 @@ def action_item_with_popover(action_item_model_wrapper, tabindex):
         strike_thru = True
     else:
         if action_item.parent_action_item:
-
-            # parent action item
-            parent_reference_model_cls = django_apps.get_model(
-                action_item.parent_action_item.action_type.model)
-
-            # parent reference model and url
-            try:
-                parent_reference_model_obj = parent_reference_model_cls.objects.get(
-                    tracking_identifier=action_item.parent_action_item.reference_identifier)
-
-            except ObjectDoesNotExist:
-                pass
-            else:
-                try:
-                    subject_visit = parent_reference_model_obj.visit
-                except (AttributeError, ObjectDoesNotExist):
-                    pass
-                else:
-                    # parent reference model is a CRF, add visit to querystring
-                    query_dict.update({
-                        parent_reference_model_obj.visit_model_attr(): str(subject_visit.pk),
-                        'appointment': str(subject_visit.appointment.pk)})
-                parent_reference_model_url = (
-                    action_cls.reference_model_url(
-                        reference_model_obj=parent_reference_model_obj,
-                        action_item=action_item,
-                        action_identifier=action_item.action_identifier,
-                        **query_dict))
-
-                parent_reference_model_name = (
-                    f'{parent_reference_model_cls._meta.verbose_name} '
-                    f'{parent_reference_model_obj.tracking_identifier}')
-                action_item_reason = parent_reference_model_obj.action_item_reason
+            parent_context = parent_reference_context(
+                action_cls, action_item, query_dict)
             parent_action_identifier = action_item.parent_action_item.action_identifier
 
     open_display = [c[1] for c in ACTION_STATUS if c[0] == OPEN][0]
@@ -153,13 +272,11 @@ def action_item_with_popover(action_item_model_wrapper, tabindex):
         HIGH_PRIORITY=HIGH_PRIORITY,
         OPEN=open_display,
         action_instructions=action_item.instructions,
-        action_item_reason=action_item_reason,
         report_datetime=action_item.report_datetime,
         display_name=action_item.action_type.display_name,
         action_identifier=action_item.action_identifier,
 
         parent_action_identifier=parent_action_identifier,
-        parent_action_item=action_item.parent_action_item,
 
         href=href,
         last_updated_text=last_updated_text,
@@ -167,13 +284,48 @@ def action_item_with_popover(action_item_model_wrapper, tabindex):
 
         reference_model_name=reference_model_cls._meta.verbose_name,
         reference_model_url=reference_model_url,
-        reference_model_obj=reference_model_obj,
+        reference_model_exists=reference_model_obj is not None,
         action_item_color=action_cls.color_style,
 
-        parent_model_name=parent_reference_model_name,
-        parent_model_url=parent_reference_model_url,
-
         priority=action_item.priority or '',
         status=action_item.get_status_display(),
-        tabindex=tabindex,
-        strike_thru=strike_thru)
+        strike_thru=strike_thru,
+        **parent_context)
+
+
+def parent_reference_context(action_cls, action_item, query_dict):
+    """Returns the popover context for the reference model
+    instance of the parent action item.
+    """
+    parent_reference_model_cls = django_apps.get_model(
+        action_item.parent_action_item.action_type.model)
+    try:
+        parent_reference_model_obj = parent_reference_model_cls.objects.get(
+            tracking_identifier=action_item.parent_action_item.reference_identifier)
+    except ObjectDoesNotExist:
+        return dict(
+            parent_model_url=None, parent_model_name=None, action_item_reason=None)
+    query_dict = dict(query_dict, **visit_query(parent_reference_model_obj))
+    return dict(
+        parent_model_url=action_cls.reference_model_url(
+            reference_model_obj=parent_reference_model_obj,
+            action_item=action_item,
+            action_identifier=action_item.action_identifier,
+            **query_dict),
+        parent_model_name=(
+            f'{parent_reference_model_cls._meta.verbose_name} '
+            f'{parent_reference_model_obj.tracking_identifier}'),
+        action_item_reason=parent_reference_model_obj.action_item_reason)
+
+
+def visit_query(reference_model_obj):
+    """Returns the visit and appointment querystring values if
+    the reference model is a CRF, otherwise an empty dict.
+    """
+    try:
+        subject_visit = reference_model_obj.visit
+    except (AttributeError, ObjectDoesNotExist):
+        return {}
+    return {
+        reference_model_obj.visit_model_attr(): str(subject_visit.pk),
+        'appointment': str(subject_visit.appointment.pk)}
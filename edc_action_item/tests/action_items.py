@@ -1,4 +1,4 @@
-from ..action import Action
+from ..action import Action, ParentReferenceFk
 from ..site_action_items import site_action_items
 from ..constants import HIGH_PRIORITY
 
@@ -22,6 +22,7 @@ class TestPrnAction(Action):
     name = 'test-prn-action'
     display_name = 'Test Prn Action'
     next_actions = [FormZeroAction]
+    show_link_to_add = True
 
 
 class FormThreeAction(Action):
@@ -62,6 +63,9 @@ class FollowupAction(Action):
     next_actions = ['self']
     related_reference_model_fk_attr = 'initial'
     related_reference_model = 'edc_action_item.initial'
+    parent_reference_fks = {
+        'edc_action_item.initial': ParentReferenceFk('initial'),
+        'edc_action_item.followup': ParentReferenceFk('initial', fk_attr='initial')}
 
 
 class InitialAction(Action):
@@ -0,0 +1,24 @@
+from itertools import count
+from unittest.mock import patch
+
+from ..identifiers import ActionIdentifier
+
+sequence = count(1)
+
+
+def _get_new_identifier(self):
+    return f'{self.identifier_prefix}{self.device_id}{next(sequence):016d}'
+
+
+def sequential_action_identifiers():
+    """Returns a patcher that makes ActionIdentifier sequential.
+
+    ActionIdentifier is a timestamp and two random characters and
+    may collide in tests that create many action items in a loop.
+
+        patcher = sequential_action_identifiers()
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    """
+    return patch.object(
+        ActionIdentifier, '_get_new_identifier', _get_new_identifier)
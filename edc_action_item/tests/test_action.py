@@ -379,6 +379,42 @@ class TestAction(TestCase):
             (f'/admin/edc_action_item/formtwo/{str(form_two.pk)}/change/?'
              f'subject_identifier={self.subject_identifier}&form_one={str(form_one.pk)}'))
 
+    def test_reference_model_urls(self):
+        form_one = FormOne.objects.create(
+            subject_identifier=self.subject_identifier)
+        form_two = FormTwo.objects.create(
+            subject_identifier=self.subject_identifier,
+            form_one=form_one)
+        action_items = ActionItem.objects.filter(
+            reference_model='edc_action_item.formtwo')
+        urls = FormTwoAction.reference_model_urls(
+            action_items=action_items,
+            subject_identifier=self.subject_identifier)
+        for action_item in action_items:
+            reference_model_obj = (
+                form_two if action_item.action_identifier == form_two.action_identifier
+                else None)
+            self.assertEqual(
+                urls[action_item.action_identifier],
+                FormTwoAction.reference_model_url(
+                    action_item=action_item,
+                    reference_model_obj=reference_model_obj,
+                    subject_identifier=self.subject_identifier))
+        self.assertEqual(
+            urls[form_two.action_identifier],
+            (f'/admin/edc_action_item/formtwo/{str(form_two.pk)}/change/?'
+             f'subject_identifier={self.subject_identifier}&form_one={str(form_one.pk)}'))
+
+    def test_reference_model_url_templates_cached(self):
+        FormTwoAction.get_url_templates(FormTwo)
+        self.assertIn('edc_action_item.formtwo', Action._url_templates)
+        with self.assertNumQueries(0):
+            add_url, change_url = FormTwoAction.get_url_templates(FormTwo)
+        self.assertEqual(add_url, '/admin/edc_action_item/formtwo/add/')
+        self.assertEqual(
+            change_url,
+            '/admin/edc_action_item/formtwo/00000000-0000-0000-0000-000000000000/change/')
+
     def test_create_singleton(self):
 
         action1 = SingletonAction(
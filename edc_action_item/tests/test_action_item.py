@@ -1,17 +1,19 @@
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.db.models import F
 from django.test import TestCase, tag
-from edc_constants.constants import NEW, OPEN
+from edc_constants.constants import CLOSED, NEW, OPEN
 from uuid import uuid4
 
 from ..action import Action, ActionError
 from ..forms import ActionItemForm
-from ..models import ActionItem, SubjectDoesNotExist
+from ..models import ActionItem, ActionItemConcurrentUpdate, SubjectDoesNotExist
 from ..models import ActionType, ActionTypeError
 from ..site_action_items import site_action_items
 from .action_items import FormZeroAction, FormOneAction, FormTwoAction
 from .models import SubjectIdentifierModel
 from .models import TestModelWithAction
-from .models import TestModelWithoutMixin, FormOne, FormTwo
+from .models import TestModelWithoutMixin, FormZero, FormOne, FormTwo
 
 
 class TestActionItem(TestCase):
@@ -180,3 +182,84 @@ class TestActionItem(TestCase):
             subject_identifier=self.subject_identifier)
         action_type = ActionType.objects.get(name='my-action3')
         self.assertEqual(action_type.display_name, 'changed display_name')
+
+    def test_status_datetimes(self):
+        obj = ActionItem.objects.create(
+            subject_identifier=self.subject_identifier,
+            action_type=self.action_type)
+        self.assertIsNone(obj.opened_datetime)
+        obj.status = OPEN
+        obj.save()
+        obj = ActionItem.objects.get(pk=obj.pk)
+        opened_datetime = obj.opened_datetime
+        self.assertIsNotNone(opened_datetime)
+        self.assertIsNone(obj.closed_datetime)
+        obj.status = CLOSED
+        obj.save()
+        obj = ActionItem.objects.get(pk=obj.pk)
+        self.assertIsNotNone(obj.closed_datetime)
+        self.assertEqual(obj.opened_datetime, opened_datetime)
+        closed_datetime = obj.closed_datetime
+        obj.save()
+        self.assertEqual(obj.closed_datetime, closed_datetime)
+        # re-opened
+        obj.status = OPEN
+        obj.save()
+        self.assertIsNone(obj.closed_datetime)
+        self.assertEqual(obj.opened_datetime, opened_datetime)
+
+    def test_version_conflict(self):
+        obj = ActionItem.objects.create(
+            subject_identifier=self.subject_identifier,
+            action_type=self.action_type)
+        self.assertEqual(obj.version, 0)
+        stale = ActionItem.objects.get(pk=obj.pk)
+        obj.status = CLOSED
+        obj.save()
+        self.assertEqual(obj.version, 1)
+        stale.status = OPEN
+        with self.assertRaises(ActionItemConcurrentUpdate):
+            with transaction.atomic():
+                stale.save()
+        self.assertEqual(ActionItem.objects.get(pk=obj.pk).status, CLOSED)
+
+    def test_save_with_retry(self):
+        obj = ActionItem.objects.create(
+            subject_identifier=self.subject_identifier,
+            action_type=self.action_type)
+        stale = ActionItem.objects.get(pk=obj.pk)
+        obj.priority = 'high'
+        obj.save()
+
+        def apply(action_item):
+            action_item.status = OPEN
+
+        stale.save_with_retry(apply, update_fields=['status'])
+        obj = ActionItem.objects.get(pk=obj.pk)
+        self.assertEqual(obj.version, 2)
+        self.assertEqual(obj.status, OPEN)
+        self.assertEqual(obj.priority, 'high')
+        self.assertIsNotNone(obj.opened_datetime)
+
+    def test_close_and_create_next_keeps_concurrent_close(self):
+        form_zero = FormZero.objects.create(subject_identifier=self.subject_identifier)
+        action = FormZeroAction(reference_model_obj=form_zero)
+        queryset = ActionItem.objects.filter(action_identifier=form_zero.action_identifier)
+        queryset.update(status=OPEN)
+        action.action_item_obj = queryset.get()
+        # closed by another process after action_item_obj was loaded
+        queryset.update(status=CLOSED, version=F('version') + 1)
+        action.close_action_item_on_save = lambda: False
+        action.close_and_create_next()
+        self.assertEqual(queryset.get().status, CLOSED)
+
+    def test_form_rejects_stale_version(self):
+        obj = ActionItem.objects.create(
+            subject_identifier=self.subject_identifier,
+            action_type=self.action_type)
+        data = dict(obj.__dict__)
+        data.update(action_type=obj.action_type.id)
+        obj.save()
+        form = ActionItemForm(data=data, instance=ActionItem.objects.get(pk=obj.pk))
+        form.is_valid()
+        self.assertIn('__all__', form.errors)
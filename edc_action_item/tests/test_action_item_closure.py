@@ -0,0 +1,96 @@
+from django.apps import apps as django_apps
+from django.db import connection
+from django.test import TestCase, tag
+from importlib import import_module
+from types import SimpleNamespace
+
+from ..models import ActionItem, ActionItemClosure
+from ..site_action_items import site_action_items
+from .action_items import register_actions
+from .identifiers import sequential_action_identifiers
+from .models import SubjectIdentifierModel, FormOne, FormTwo
+
+
+class TestActionItemClosure(TestCase):
+
+    def setUp(self):
+        patcher = sequential_action_identifiers()
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        register_actions()
+        self.subject_identifier_model = ActionItem.subject_identifier_model
+        ActionItem.subject_identifier_model = 'edc_action_item.subjectidentifiermodel'
+        self.subject_identifier = '12345'
+        SubjectIdentifierModel.objects.create(
+            subject_identifier=self.subject_identifier)
+        site_action_items.populate_action_types()
+
+    def tearDown(self):
+        ActionItem.subject_identifier_model = self.subject_identifier_model
+
+    def make_chain(self, length=None):
+        """Returns a list of action items of a FormOne -> FormTwo
+        -> FormTwo ... chain, root first.
+        """
+        form_one = FormOne.objects.create(
+            subject_identifier=self.subject_identifier)
+        chain = [form_one.action_item]
+        for _ in range(length or 3):
+            form_two = FormTwo.objects.create(
+                subject_identifier=self.subject_identifier,
+                form_one=form_one)
+            chain.append(form_two.action_item)
+        # the NEW FormTwo action item created by the last FormTwo
+        chain.append(ActionItem.objects.get(parent_action_item=chain[-1]))
+        return chain
+
+    def test_ancestors_and_descendants(self):
+        chain = self.make_chain()
+        leaf = chain[-1]
+        self.assertEqual(
+            [obj.pk for obj in leaf.ancestors()],
+            [obj.pk for obj in reversed(chain[:-1])])
+        self.assertEqual(leaf.chain_root(), chain[0])
+        self.assertEqual(chain[0].chain_root(), chain[0])
+        self.assertIn(leaf, chain[0].descendants())
+        self.assertNotIn(chain[0], chain[0].descendants())
+        with self.assertNumQueries(1):
+            list(leaf.ancestors())
+
+    def test_delete_removes_closure_rows(self):
+        chain = self.make_chain()
+        leaf = chain[-1]
+        leaf.delete()
+        self.assertFalse(ActionItemClosure.objects.filter(
+            descendant_id=leaf.pk).exists())
+        self.assertNotIn(leaf, chain[0].descendants())
+
+    def test_rebuild(self):
+        chain = self.make_chain()
+        count = ActionItemClosure.objects.all().count()
+        self.assertEqual(ActionItemClosure.objects.rebuild(), count)
+        self.assertEqual(chain[-1].chain_root(), chain[0])
+
+    def test_rebuild_in_small_batches(self):
+        chain = self.make_chain(length=5)
+        expected = set(ActionItemClosure.objects.values_list(
+            'ancestor_id', 'descendant_id', 'depth'))
+        ActionItemClosure.objects.rebuild(batch_size=2)
+        self.assertEqual(
+            set(ActionItemClosure.objects.values_list(
+                'ancestor_id', 'descendant_id', 'depth')), expected)
+        self.assertEqual(
+            [obj.pk for obj in chain[-1].ancestors()],
+            [obj.pk for obj in reversed(chain[:-1])])
+
+    def test_migration_backfills_closure(self):
+        self.make_chain(length=5)
+        expected = set(ActionItemClosure.objects.values_list(
+            'ancestor_id', 'descendant_id', 'depth'))
+        ActionItemClosure.objects.all().delete()
+        migration = import_module('edc_action_item.migrations.0010_actionitemclosure')
+        migration.backfill_closure(
+            django_apps, SimpleNamespace(connection=connection))
+        self.assertEqual(
+            set(ActionItemClosure.objects.values_list(
+                'ancestor_id', 'descendant_id', 'depth')), expected)
@@ -0,0 +1,99 @@
+from django.contrib.auth.models import Permission, User
+from django.contrib.sites.models import Site
+from django.db import connection
+from django.test import TestCase, tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..admin import ActionItemAdmin
+from ..admin_site import edc_action_item_admin
+from ..models import ActionItem, ActionType
+from ..site_action_items import site_action_items
+from .action_items import register_actions
+from .identifiers import sequential_action_identifiers
+from .models import SubjectIdentifierModel
+
+
+class TestActionItemTree(TestCase):
+
+    depth = 50
+
+    def setUp(self):
+        patcher = sequential_action_identifiers()
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        register_actions()
+        self.subject_identifier_model = ActionItem.subject_identifier_model
+        ActionItem.subject_identifier_model = 'edc_action_item.subjectidentifiermodel'
+        self.subject_identifier = '12345'
+        SubjectIdentifierModel.objects.create(
+            subject_identifier=self.subject_identifier)
+        site_action_items.populate_action_types()
+        action_type = ActionType.objects.get(name='submit-form-two')
+        parent = None
+        self.chain = []
+        for _ in range(self.depth):
+            parent = ActionItem.objects.create(
+                subject_identifier=self.subject_identifier,
+                action_type=action_type,
+                parent_action_item=parent)
+            self.chain.append(parent)
+
+    def tearDown(self):
+        ActionItem.subject_identifier_model = self.subject_identifier_model
+
+    def test_tree(self):
+        with self.assertNumQueries(1):
+            tree = list(ActionItem.objects.tree(self.chain[-1]))
+        self.assertEqual([obj.pk for obj in tree], [obj.pk for obj in self.chain])
+        self.assertEqual([obj.depth for obj in tree], list(range(self.depth)))
+        tree = list(ActionItem.objects.tree(self.chain[10]))
+        self.assertEqual(len(tree), self.depth)
+
+    @tag('benchmark')
+    def test_tree_benchmark(self):
+        """Compares the round trips of the recursive CTE with
+        walking `parent_action_item` one FK at a time.
+        """
+        leaf_pk = self.chain[-1].pk
+
+        with CaptureQueriesContext(connection) as cte_queries:
+            list(ActionItem.objects.tree(ActionItem(pk=leaf_pk)))
+
+        with CaptureQueriesContext(connection) as walk_queries:
+            obj = ActionItem.objects.get(pk=leaf_pk)
+            while obj.parent_action_item:
+                obj = obj.parent_action_item
+
+        self.assertEqual(len(cte_queries), 1)
+        self.assertEqual(len(walk_queries), self.depth)
+
+    def test_chain_admin_view(self):
+        model_admin = ActionItemAdmin(ActionItem, edc_action_item_admin)
+        self.assertEqual(model_admin.check(), [])
+        self.assertIn('href=', model_admin.chain(self.chain[-1]))
+        self.assertIsNone(model_admin.chain(self.chain[0]))
+        user = User.objects.create_superuser('erik', 'erik@example.com', 'pass')
+        self.client.force_login(user)
+        response = self.client.get(reverse(
+            'edc_action_item_admin:edc_action_item_actionitem_chain',
+            args=(self.chain[-1].pk, )))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['action_items']), self.depth)
+
+    def test_chain_admin_view_requires_view_permission_and_site(self):
+        user = User.objects.create(username='erik', is_staff=True)
+        self.client.force_login(user)
+        url = reverse(
+            'edc_action_item_admin:edc_action_item_actionitem_chain',
+            args=(self.chain[-1].pk, ))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 403)
+        user.user_permissions.add(
+            Permission.objects.get(codename='view_actionitem'))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        ActionItem.objects.filter(pk=self.chain[-1].pk).update(
+            site=Site.objects.create(name='other', domain='other.example.com'))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 404)
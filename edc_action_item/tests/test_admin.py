@@ -0,0 +1,169 @@
+from datetime import datetime
+from django.contrib.auth.models import User
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.core.cache import cache
+from django.test import TestCase, tag
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+from django.utils.timezone import utc
+from unittest.mock import patch
+
+from ..admin import ActionItemAdmin
+from ..admin.changelist import ApproximateCountChangeList
+from ..admin.list_filters import ActionTypeListFilter, CreatedMonthListFilter
+from ..admin.paginator import ApproximateCountPaginator
+from ..admin_site import edc_action_item_admin
+from ..models import ActionItem, ActionItemConcurrentUpdate, ActionType
+from ..site_action_items import site_action_items
+from .action_items import register_actions
+from .identifiers import sequential_action_identifiers
+from .models import SubjectIdentifierModel
+
+
+class TestAdmin(TestCase):
+
+    def setUp(self):
+        patcher = sequential_action_identifiers()
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        cache.clear()
+        register_actions()
+        self.subject_identifier_model = ActionItem.subject_identifier_model
+        ActionItem.subject_identifier_model = 'edc_action_item.subjectidentifiermodel'
+        self.subject_identifier = '12345'
+        SubjectIdentifierModel.objects.create(
+            subject_identifier=self.subject_identifier)
+        site_action_items.populate_action_types()
+        for action_type in ActionType.objects.all():
+            ActionItem.objects.create(
+                subject_identifier=self.subject_identifier,
+                action_type=action_type)
+
+    def tearDown(self):
+        ActionItem.subject_identifier_model = self.subject_identifier_model
+
+    def test_action_type_list_filter_uses_registry(self):
+        list_filter = ActionTypeListFilter(
+            None, {}, ActionItem, None)
+        self.assertEqual(
+            sorted([x[0] for x in list_filter.lookup_choices]),
+            sorted(site_action_items.registry))
+
+    def test_created_month_list_filter(self):
+        list_filter = CreatedMonthListFilter(
+            None, {}, ActionItem, ActionItemAdmin(ActionItem, edc_action_item_admin))
+        self.assertEqual(len(list_filter.lookup_choices), 1)
+        value = list_filter.lookup_choices[0][0]
+        list_filter = CreatedMonthListFilter(
+            None, {'created_month': value}, ActionItem,
+            ActionItemAdmin(ActionItem, edc_action_item_admin))
+        self.assertEqual(
+            list_filter.queryset(None, ActionItem.objects.all()).count(),
+            ActionItem.objects.all().count())
+
+    def test_paginator_count_is_cached(self):
+        qs = ActionItem.objects.filter(
+            subject_identifier=self.subject_identifier).order_by('created')
+        count = ActionItem.objects.all().count()
+        self.assertEqual(ApproximateCountPaginator(qs, 10).count, count)
+        ActionItem.objects.create(
+            subject_identifier=self.subject_identifier,
+            action_type=ActionType.objects.all()[0])
+        self.assertEqual(ApproximateCountPaginator(qs, 10).count, count)
+
+    def test_approximate_counts_read_per_request(self):
+        model_admin = ActionItemAdmin(ActionItem, edc_action_item_admin)
+        request = RequestFactory().get('/')
+        qs = ActionItem.objects.order_by('pk')
+        with override_settings(EDC_ACTION_ITEM_APPROXIMATE_COUNTS=True):
+            self.assertFalse(model_admin.show_full_result_count)
+            self.assertIsInstance(
+                model_admin.get_paginator(request, qs, 10), ApproximateCountPaginator)
+            self.assertIs(
+                model_admin.get_changelist(request), ApproximateCountChangeList)
+            self.assertIn(ActionTypeListFilter, model_admin.get_list_filter(request))
+        self.assertTrue(model_admin.show_full_result_count)
+        self.assertNotIsInstance(
+            model_admin.get_paginator(request, qs, 10), ApproximateCountPaginator)
+        self.assertIsNot(model_admin.get_changelist(request), ApproximateCountChangeList)
+        self.assertNotIn(ActionTypeListFilter, model_admin.get_list_filter(request))
+
+    @override_settings(EDC_ACTION_ITEM_APPROXIMATE_COUNTS=True)
+    def test_approximate_counts_changelist(self):
+        model_admin = ActionItemAdmin(ActionItem, edc_action_item_admin)
+        request = RequestFactory().get('/')
+        request.user = User.objects.create_superuser('erik', 'erik@example.com', 'pass')
+        changelist = model_admin.get_changelist_instance(request)
+        self.assertIsNone(changelist.date_hierarchy)
+        self.assertIsInstance(changelist.paginator, ApproximateCountPaginator)
+        self.assertIsNone(changelist.full_result_count)
+        self.assertEqual(changelist.result_count, ActionItem.objects.all().count())
+
+    @override_settings(TIME_ZONE='Africa/Gaborone')
+    def test_created_month_list_filter_uses_utc_months(self):
+        # 31 October UTC, 1 November in Gaborone
+        ActionItem.objects.all().update(
+            created=datetime(2018, 10, 31, 23, 30, tzinfo=utc))
+        model_admin = ActionItemAdmin(ActionItem, edc_action_item_admin)
+        list_filter = CreatedMonthListFilter(None, {}, ActionItem, model_admin)
+        self.assertEqual(
+            [value for value, _ in list_filter.lookup_choices], ['2018-10'])
+        list_filter = CreatedMonthListFilter(
+            None, {'created_month': '2018-10'}, ActionItem, model_admin)
+        self.assertEqual(
+            list_filter.queryset(None, ActionItem.objects.all()).count(),
+            ActionItem.objects.all().count())
+
+    def test_autocomplete_search_uses_identifier_prefix(self):
+        model_admin = ActionItemAdmin(ActionItem, edc_action_item_admin)
+        action_item = ActionItem.objects.all()[0]
+        request = RequestFactory().get(
+            '/admin/edc_action_item/actionitem/autocomplete/')
+        queryset, use_distinct = model_admin.get_search_results(
+            request, ActionItem.objects.all(), action_item.action_identifier)
+        self.assertFalse(use_distinct)
+        self.assertEqual([obj.pk for obj in queryset], [action_item.pk])
+        queryset, _ = model_admin.get_search_results(
+            request, ActionItem.objects.all(), self.subject_identifier[:3])
+        self.assertEqual(queryset.count(), ActionItem.objects.all().count())
+
+    def test_parent_action_item_autocomplete_limited_to_subject(self):
+        SubjectIdentifierModel.objects.create(subject_identifier='67890')
+        other = ActionItem.objects.create(
+            subject_identifier='67890', action_type=ActionType.objects.all()[0])
+        model_admin = ActionItemAdmin(ActionItem, edc_action_item_admin)
+        request = RequestFactory().get(
+            '/admin/edc_action_item/actionitem/add/',
+            dict(subject_identifier=self.subject_identifier))
+        self.assertNotIn('parent_action_item', model_admin.get_readonly_fields(request))
+        self.assertIn('parent_action_item',
+                      model_admin.get_readonly_fields(request, obj=other))
+        formfield = model_admin.formfield_for_foreignkey(
+            ActionItem._meta.get_field('parent_action_item'), request)
+        self.assertIn(f'subject_identifier={self.subject_identifier}',
+                      formfield.widget.get_url())
+        request = RequestFactory().get(
+            '/admin/edc_action_item/actionitem/autocomplete/',
+            dict(subject_identifier=self.subject_identifier))
+        queryset, _ = model_admin.get_search_results(
+            request, ActionItem.objects.all(), '')
+        self.assertNotIn(other, queryset)
+        self.assertEqual(
+            queryset.count(),
+            ActionItem.objects.filter(subject_identifier=self.subject_identifier).count())
+
+    def test_concurrent_update_shows_message(self):
+        action_item = ActionItem.objects.all()[0]
+        model_admin = ActionItemAdmin(ActionItem, edc_action_item_admin)
+        url = f'/admin/edc_action_item/actionitem/{action_item.pk}/change/'
+        request = RequestFactory().post(url)
+        request._dont_enforce_csrf_checks = True
+        request.user = User.objects.create_superuser('erik', 'erik@example.com', 'pass')
+        request.session = {}
+        request._messages = FallbackStorage(request)
+        with patch.object(ActionItemAdmin, '_changeform_view',
+                          side_effect=ActionItemConcurrentUpdate):
+            response = model_admin.changeform_view(request, str(action_item.pk))
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.url, url)
+        self.assertEqual(len(request._messages), 1)
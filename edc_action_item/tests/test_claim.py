@@ -0,0 +1,111 @@
+import threading
+
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, tag
+from edc_base.utils import get_utcnow
+from unittest import skipUnless
+
+from ..constants import HIGH_PRIORITY, LOW_PRIORITY
+from ..models import ActionItem, ActionType
+from ..site_action_items import site_action_items
+from .action_items import register_actions
+from .identifiers import sequential_action_identifiers
+from .models import SubjectIdentifierModel
+
+
+class ClaimTestMixin:
+
+    def setUp(self):
+        patcher = sequential_action_identifiers()
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        register_actions()
+        self.subject_identifier_model = ActionItem.subject_identifier_model
+        ActionItem.subject_identifier_model = 'edc_action_item.subjectidentifiermodel'
+        site_action_items.populate_action_types()
+        self.action_type = ActionType.objects.get(name='submit-form-zero')
+        self.subject_identifier = '12345'
+        SubjectIdentifierModel.objects.create(
+            subject_identifier=self.subject_identifier)
+
+    def tearDown(self):
+        ActionItem.subject_identifier_model = self.subject_identifier_model
+
+    def create_action_items(self, count=None, priority=None):
+        return [ActionItem.objects.create(
+            subject_identifier=self.subject_identifier,
+            action_type=self.action_type,
+            priority=priority or LOW_PRIORITY) for _ in range(count or 1)]
+
+
+class TestClaim(ClaimTestMixin, TestCase):
+
+    def test_claim_next(self):
+        erik = User.objects.create(username='erik')
+        jean = User.objects.create(username='jean')
+        low, = self.create_action_items(priority=LOW_PRIORITY)
+        high, = self.create_action_items(priority=HIGH_PRIORITY)
+        obj = ActionItem.objects.claim_next(erik)
+        self.assertEqual(obj.pk, high.pk)
+        self.assertEqual(ActionItem.objects.get(pk=high.pk).claimed_by, 'erik')
+        self.assertEqual(ActionItem.objects.claim_next(jean).pk, low.pk)
+        self.assertIsNone(ActionItem.objects.claim_next(jean))
+        self.assertTrue(ActionItem.objects.release(obj, erik))
+        self.assertEqual(ActionItem.objects.claim_next(jean).pk, high.pk)
+
+    def test_expired_lease(self):
+        erik = User.objects.create(username='erik')
+        jean = User.objects.create(username='jean')
+        obj, = self.create_action_items()
+        ActionItem.objects.claim_next(erik, lease_duration=timedelta(seconds=-1))
+        self.assertEqual(ActionItem.objects.claim_next(jean).pk, obj.pk)
+        ActionItem.objects.filter(pk=obj.pk).update(
+            lease_expires=get_utcnow() - timedelta(minutes=1))
+        self.assertEqual(ActionItem.objects.release_expired(), 1)
+        self.assertIsNone(ActionItem.objects.get(pk=obj.pk).claimed_by)
+
+
+@tag('concurrency')
+@skipUnless(connection.features.has_select_for_update_skip_locked,
+            'requires SELECT ... FOR UPDATE SKIP LOCKED, e.g. PostgreSQL or MySQL 8')
+class TestConcurrentClaim(ClaimTestMixin, TransactionTestCase):
+
+    """Run against a local PostgreSQL/MySQL database, e.g.
+
+        python manage.py test edc_action_item --tag=concurrency
+    """
+
+    threads = 8
+
+    def test_no_double_claims(self):
+        self.create_action_items(count=40)
+        users = [User.objects.create(username=f'user{i}') for i in range(self.threads)]
+        claimed = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(self.threads)
+
+        def work(user):
+            barrier.wait()
+            try:
+                while True:
+                    obj = ActionItem.objects.claim_next(user)
+                    if not obj:
+                        break
+                    with lock:
+                        claimed.append((obj.pk, user.username))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=work, args=(user, )) for user in users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        pks = [pk for pk, _ in claimed]
+        self.assertEqual(len(pks), 40)
+        self.assertEqual(len(set(pks)), 40)
+        self.assertEqual(
+            dict(ActionItem.objects.values_list('pk', 'claimed_by')),
+            dict(claimed))
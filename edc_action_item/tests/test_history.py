@@ -0,0 +1,80 @@
+from django.test import TestCase, tag
+from django.test.utils import override_settings
+from edc_constants.constants import OPEN
+
+from ..history_batch import history_batch
+from ..models import ActionItem, ActionType
+from ..site_action_items import site_action_items
+from .action_items import register_actions
+from .identifiers import sequential_action_identifiers
+from .models import SubjectIdentifierModel
+
+
+class TestHistory(TestCase):
+
+    def setUp(self):
+        patcher = sequential_action_identifiers()
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        register_actions()
+        self.subject_identifier_model = ActionItem.subject_identifier_model
+        ActionItem.subject_identifier_model = 'edc_action_item.subjectidentifiermodel'
+        self.subject_identifier = '12345'
+        SubjectIdentifierModel.objects.create(
+            subject_identifier=self.subject_identifier)
+        site_action_items.populate_action_types()
+        self.action_type = ActionType.objects.get(name='submit-form-zero')
+
+    def tearDown(self):
+        ActionItem.subject_identifier_model = self.subject_identifier_model
+
+    def test_instructions_not_in_history(self):
+        self.assertNotIn(
+            'instructions',
+            [f.name for f in ActionItem.history.model._meta.fields])
+
+    def test_unchanged_save_skips_history(self):
+        obj = ActionItem.objects.create(
+            subject_identifier=self.subject_identifier,
+            action_type=self.action_type)
+        self.assertEqual(obj.history.all().count(), 1)
+        obj.save()
+        self.assertEqual(obj.history.all().count(), 1)
+        obj = ActionItem.objects.get(pk=obj.pk)
+        obj.save()
+        self.assertEqual(obj.history.all().count(), 1)
+        obj.status = OPEN
+        obj.save()
+        self.assertEqual(obj.history.all().count(), 2)
+
+    def test_deferred_fields_not_loaded_for_snapshot(self):
+        obj = ActionItem.objects.create(
+            subject_identifier=self.subject_identifier,
+            action_type=self.action_type)
+        with self.assertNumQueries(1):
+            obj = ActionItem.objects.defer(
+                'instructions', 'auto_created_comment').get(pk=obj.pk)
+        self.assertNotIn('auto_created_comment', obj._history_snapshot)
+        obj.save()
+        self.assertEqual(obj.history.all().count(), 1)
+        obj = ActionItem.objects.defer('status').get(pk=obj.pk)
+        obj.status = OPEN
+        obj.save()
+        self.assertEqual(obj.history.all().count(), 2)
+
+    @override_settings(EDC_ACTION_ITEM_HISTORY_SKIP_UNCHANGED=False)
+    def test_unchanged_save_with_skip_disabled(self):
+        obj = ActionItem.objects.create(
+            subject_identifier=self.subject_identifier,
+            action_type=self.action_type)
+        obj.save()
+        self.assertEqual(obj.history.all().count(), 2)
+
+    def test_history_batch(self):
+        with history_batch():
+            for _ in range(3):
+                ActionItem.objects.create(
+                    subject_identifier=self.subject_identifier,
+                    action_type=self.action_type)
+            self.assertEqual(ActionItem.history.all().count(), 0)
+        self.assertEqual(ActionItem.history.all().count(), 3)
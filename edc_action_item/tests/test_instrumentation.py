@@ -0,0 +1,84 @@
+import json
+import os
+import tempfile
+
+from django.test import TestCase, tag
+
+from ..instrumentation import AggregateSink, JsonLinesSink, Measurement
+from ..instrumentation import action_measured, measure, register_sink, unregister_sink
+from ..instrumentation import row_created
+from ..models import ActionItem
+from .action_items import FormOneAction, register_actions
+from .models import FormOne, SubjectIdentifierModel
+
+
+class TestInstrumentation(TestCase):
+
+    def setUp(self):
+        register_actions()
+        self.subject_identifier_model = ActionItem.subject_identifier_model
+        ActionItem.subject_identifier_model = 'edc_action_item.subjectidentifiermodel'
+        self.subject_identifier = '12345'
+        SubjectIdentifierModel.objects.create(
+            subject_identifier=self.subject_identifier)
+        self.sink = AggregateSink()
+        register_sink(self.sink)
+
+    def tearDown(self):
+        unregister_sink(self.sink)
+        ActionItem.subject_identifier_model = self.subject_identifier_model
+
+    def test_aggregate_sink(self):
+        FormOne.objects.create(subject_identifier=self.subject_identifier)
+        stats = {(row['action_name'], row['operation']): row
+                 for row in self.sink.stats()}
+        for operation in ['post_save', 'get_action_item',
+                          'close_and_create_next', 'create_next']:
+            self.assertIn((FormOneAction.name, operation), stats)
+        create_next = stats[(FormOneAction.name, 'create_next')]
+        self.assertEqual(create_next['count'], 1)
+        self.assertGreater(create_next['queries'], 0)
+        # two next action items
+        self.assertGreaterEqual(create_next['rows_created'], 2)
+        post_save = stats[(FormOneAction.name, 'post_save')]
+        self.assertGreaterEqual(post_save['queries'], create_next['queries'])
+
+    def test_nested_measurements_with_equal_counts(self):
+        with measure('outer', 'test'):
+            with measure('inner', 'test'):
+                pass
+            # outer and inner frames were equal when inner ended
+            row_created()
+            ActionItem.objects.count()
+        stats = {row['operation']: row for row in self.sink.stats()}
+        self.assertEqual(stats['inner']['rows_created'], 0)
+        self.assertEqual(stats['outer']['rows_created'], 1)
+        self.assertEqual(stats['outer']['queries'], 1)
+
+    def test_signal(self):
+        measurements = []
+
+        def receiver(sender, measurement, **kwargs):
+            measurements.append(measurement)
+
+        action_measured.connect(receiver)
+        try:
+            FormOne.objects.create(subject_identifier=self.subject_identifier)
+        finally:
+            action_measured.disconnect(receiver)
+        self.assertIn('create_next', [m.operation for m in measurements])
+
+    def test_json_lines_sink(self):
+        fd, path = tempfile.mkstemp(suffix='.jsonl')
+        os.close(fd)
+        try:
+            sink = JsonLinesSink(path=path)
+            sink(Measurement(
+                action_name='submit-form-one', operation='create_next',
+                duration=0.01, queries=5, rows_created=2))
+            with open(path) as f:
+                row = json.loads(f.readline())
+        finally:
+            os.remove(path)
+        self.assertEqual(row['action_name'], 'submit-form-one')
+        self.assertEqual(row['queries'], 5)
@@ -0,0 +1,340 @@
+import json
+
+from datetime import timedelta
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import transaction
+from django.db.models import F
+from django.test import TestCase, tag
+from django.test.utils import override_settings
+from django.utils.six import StringIO
+from edc_base.utils import get_utcnow
+from edc_constants.constants import CLOSED, NEW, OPEN
+from uuid import uuid4
+
+from ..archive import action_items_for_audit, get_action_item, restore_action_item
+from ..constants import HIGH_PRIORITY, LOW_PRIORITY, MEDIUM_PRIORITY, SCHEDULED
+from ..models import ActionItem, ActionItemUpdate, ActionType
+from ..models import ArchivedActionItem, ArchivedActionItemUpdate
+from ..models import SubjectActionSummary
+from ..site_action_items import site_action_items
+from .action_items import register_actions
+from .models import FormZero, SubjectIdentifierModel
+
+
+class TestManagementCommands(TestCase):
+
+    def setUp(self):
+        register_actions()
+        self.subject_identifier_model = ActionItem.subject_identifier_model
+        ActionItem.subject_identifier_model = 'edc_action_item.subjectidentifiermodel'
+        self.subject_identifier = '12345'
+        SubjectIdentifierModel.objects.create(
+            subject_identifier=self.subject_identifier)
+        site_action_items.populate_action_types()
+        self.action_type = ActionType.objects.get(name='submit-form-zero')
+
+    def tearDown(self):
+        ActionItem.subject_identifier_model = self.subject_identifier_model
+
+    def make_history(self):
+        """Returns an action item with 5 history rows, two of
+        which are consecutive identical states.
+        """
+        obj = ActionItem.objects.create(
+            subject_identifier=self.subject_identifier,
+            action_type=self.action_type)
+        history_model = ActionItem.history.model
+        latest = obj.history.all()[0]
+        for status in [OPEN, OPEN, OPEN, CLOSED]:
+            latest.history_id = uuid4()
+            latest.status = status
+            latest.history_date = latest.history_date + timedelta(seconds=1)
+            latest.save(force_insert=True)
+        self.assertEqual(history_model.objects.filter(id=obj.id).count(), 5)
+        return obj
+
+    def test_compact_history_dry_run(self):
+        obj = self.make_history()
+        out = StringIO()
+        call_command('compact_action_item_history', dry_run=True, sleep=0, stdout=out)
+        self.assertIn('Would reclaim 2 history rows', out.getvalue())
+        self.assertEqual(obj.history.all().count(), 5)
+
+    def test_compact_history_collapses_identical(self):
+        obj = self.make_history()
+        call_command('compact_action_item_history', sleep=0, stdout=StringIO())
+        self.assertEqual(
+            [h.status for h in obj.history.all().order_by('history_date')][1:],
+            [OPEN, CLOSED])
+
+    def test_compact_history_prunes_closed(self):
+        obj = self.make_history()
+        ActionItem.history.model.objects.filter(id=obj.id).update(
+            history_date=F('history_date') - timedelta(days=400))
+        call_command('compact_action_item_history', sleep=0, stdout=StringIO())
+        self.assertEqual(obj.history.all().count(), 2)
+
+    def test_archive_action_items(self):
+        opts = dict(subject_identifier=self.subject_identifier,
+                    action_type=self.action_type)
+        parent = ActionItem.objects.create(status=CLOSED, **opts)
+        child = ActionItem.objects.create(
+            status=CLOSED, parent_action_item=parent, **opts)
+        ActionItemUpdate.objects.create(action_item=child)
+        blocked = ActionItem.objects.create(status=CLOSED, **opts)
+        ActionItem.objects.create(status=NEW, parent_action_item=blocked, **opts)
+        ActionItem.objects.filter(status=CLOSED).update(
+            modified=F('modified') - timedelta(days=400))
+
+        call_command('archive_action_items', sleep=0, stdout=StringIO())
+
+        # blocked is the parent of a NEW action item, not archived
+        self.assertEqual(ActionItem.objects.all().count(), 2)
+        self.assertTrue(ActionItem.objects.filter(pk=blocked.pk).exists())
+        self.assertEqual(ArchivedActionItem.objects.all().count(), 2)
+        self.assertEqual(ArchivedActionItemUpdate.objects.all().count(), 1)
+        archived = get_action_item(child.action_identifier)
+        self.assertIsInstance(archived, ArchivedActionItem)
+        self.assertEqual(archived.parent_action_item_id, parent.pk)
+        self.assertEqual(
+            archived.parent_action_identifier, parent.action_identifier)
+        self.assertEqual(
+            len(list(action_items_for_audit(
+                subject_identifier=self.subject_identifier))), 4)
+
+    def test_archived_action_item_restored_on_save(self):
+        obj = ActionItem.objects.create(
+            subject_identifier=self.subject_identifier,
+            action_type=self.action_type,
+            status=CLOSED)
+        ActionItemUpdate.objects.create(action_item=obj)
+        ActionItem.objects.filter(pk=obj.pk).update(
+            modified=F('modified') - timedelta(days=400))
+        call_command('archive_action_items', sleep=0, stdout=StringIO())
+        self.assertEqual(ArchivedActionItemUpdate.objects.all().count(), 1)
+        self.assertFalse(ActionItem.objects.filter(pk=obj.pk).exists())
+
+        site_action_items.get(self.action_type.name)(
+            action_identifier=obj.action_identifier)
+        self.assertTrue(ActionItem.objects.filter(pk=obj.pk).exists())
+        self.assertEqual(ActionItemUpdate.objects.filter(
+            action_item=obj).count(), 1)
+        self.assertEqual(ArchivedActionItem.objects.all().count(), 0)
+
+    def test_archive_and_restore_keep_status_and_due_datetimes(self):
+        now = get_utcnow()
+        obj = ActionItem.objects.create(
+            subject_identifier=self.subject_identifier,
+            action_type=self.action_type)
+        obj.status = OPEN
+        obj.save()
+        obj.status = CLOSED
+        obj.save()
+        ActionItem.objects.filter(pk=obj.pk).update(
+            modified=F('modified') - timedelta(days=400),
+            due_datetime=now - timedelta(days=1),
+            overdue=True,
+            activate_after=now - timedelta(days=10),
+            cancelled_datetime=now - timedelta(days=2))
+        fields = ['opened_datetime', 'closed_datetime', 'cancelled_datetime',
+                  'due_datetime', 'overdue', 'activate_after']
+        expected = ActionItem.objects.filter(pk=obj.pk).values(*fields)[0]
+        self.assertTrue(all(v is not None for v in expected.values()))
+
+        call_command('archive_action_items', sleep=0, stdout=StringIO())
+        self.assertEqual(
+            ArchivedActionItem.objects.filter(pk=obj.pk).values(*fields)[0], expected)
+
+        restore_action_item(obj.action_identifier)
+        self.assertEqual(
+            ActionItem.objects.filter(pk=obj.pk).values(*fields)[0], expected)
+
+    def test_archive_and_restore_write_no_history(self):
+        obj = ActionItem.objects.create(
+            subject_identifier=self.subject_identifier,
+            action_type=self.action_type,
+            status=CLOSED)
+        update = ActionItemUpdate.objects.create(action_item=obj)
+        ActionItem.objects.filter(pk=obj.pk).update(
+            modified=F('modified') - timedelta(days=400))
+        history = list(ActionItem.history.filter(id=obj.pk).values_list(
+            'history_id', flat=True))
+        update_history = list(ActionItemUpdate.history.filter(
+            id=update.pk).values_list('history_id', flat=True))
+
+        call_command('archive_action_items', sleep=0, stdout=StringIO())
+        self.assertFalse(ActionItem.objects.filter(pk=obj.pk).exists())
+        restore_action_item(obj.action_identifier)
+        self.assertTrue(ActionItem.objects.filter(pk=obj.pk).exists())
+
+        self.assertEqual(list(ActionItem.history.filter(id=obj.pk).values_list(
+            'history_id', flat=True)), history)
+        self.assertEqual(list(ActionItemUpdate.history.filter(
+            id=update.pk).values_list('history_id', flat=True)), update_history)
+        # history is written again outside of the archive move
+        ActionItemUpdate.objects.get(pk=update.pk).delete()
+        self.assertTrue(ActionItemUpdate.history.filter(
+            id=update.pk, history_type='-').exists())
+
+    def test_archived_action_item_reopened_on_reference_model_delete(self):
+        form_zero = FormZero.objects.create(subject_identifier=self.subject_identifier)
+        obj = ActionItem.objects.get(action_identifier=form_zero.action_identifier)
+        self.assertEqual(obj.status, CLOSED)
+        ActionItem.objects.filter(pk=obj.pk).update(
+            modified=F('modified') - timedelta(days=400))
+        call_command('archive_action_items', sleep=0, stdout=StringIO())
+        self.assertFalse(ActionItem.objects.filter(pk=obj.pk).exists())
+
+        form_zero.delete()
+        obj = ActionItem.objects.get(pk=obj.pk)
+        self.assertEqual(obj.status, OPEN)
+        self.assertIsNone(obj.reference_identifier)
+        self.assertEqual(ArchivedActionItem.objects.all().count(), 0)
+
+    def test_backfill_status_datetimes(self):
+        obj = self.make_history()
+        ActionItem.objects.filter(pk=obj.pk).update(
+            status=CLOSED, opened_datetime=None, closed_datetime=None)
+        call_command('backfill_action_item_status_datetimes', sleep=0, stdout=StringIO())
+        history = obj.history.all().order_by('history_date')
+        obj = ActionItem.objects.get(pk=obj.pk)
+        self.assertEqual(obj.opened_datetime, history[1].history_date)
+        self.assertEqual(obj.closed_datetime, history[4].history_date)
+
+    def test_due_datetime_from_action_type(self):
+        self.action_type.due_interval = timedelta(days=7)
+        self.action_type.save()
+        obj = ActionItem.objects.create(
+            subject_identifier=self.subject_identifier,
+            action_type=self.action_type)
+        self.assertEqual(obj.due_datetime, obj.report_datetime + timedelta(days=7))
+
+    def test_due_datetime_of_deferred_action_item(self):
+        self.action_type.due_interval = timedelta(days=7)
+        self.action_type.save()
+        activate_after = get_utcnow() + timedelta(days=90)
+        obj = ActionItem.objects.create(
+            subject_identifier=self.subject_identifier,
+            action_type=self.action_type,
+            activate_after=activate_after)
+        self.assertEqual(obj.due_datetime, activate_after + timedelta(days=7))
+        # activated later than report_datetime + due_interval, not overdue
+        ActionItem.objects.filter(pk=obj.pk).update(
+            report_datetime=get_utcnow() - timedelta(days=30),
+            activate_after=get_utcnow() - timedelta(minutes=1))
+        call_command('activate_scheduled_action_items', stdout=StringIO())
+        call_command('flag_overdue_action_items', stdout=StringIO())
+        obj.refresh_from_db()
+        self.assertEqual(obj.status, NEW)
+        self.assertFalse(obj.overdue)
+
+    def test_flag_overdue_action_items(self):
+        past = get_utcnow() - timedelta(days=1)
+        low = ActionItem.objects.create(
+            subject_identifier=self.subject_identifier,
+            action_type=self.action_type, priority=LOW_PRIORITY,
+            due_datetime=past)
+        medium = ActionItem.objects.create(
+            subject_identifier=self.subject_identifier,
+            action_type=self.action_type, priority=MEDIUM_PRIORITY,
+            due_datetime=past)
+        not_due = ActionItem.objects.create(
+            subject_identifier=self.subject_identifier,
+            action_type=self.action_type, priority=LOW_PRIORITY,
+            due_datetime=get_utcnow() + timedelta(days=1))
+        call_command('flag_overdue_action_items', escalate=True, stdout=StringIO())
+        low.refresh_from_db()
+        medium.refresh_from_db()
+        not_due.refresh_from_db()
+        self.assertTrue(low.overdue)
+        self.assertEqual(low.priority, MEDIUM_PRIORITY)
+        self.assertTrue(medium.overdue)
+        self.assertEqual(medium.priority, HIGH_PRIORITY)
+        self.assertFalse(not_due.overdue)
+        self.assertEqual(not_due.priority, LOW_PRIORITY)
+        summary = SubjectActionSummary.objects.get(
+            subject_identifier=self.subject_identifier)
+        self.assertEqual(summary.high_priority_count, 1)
+        # already flagged items are not escalated again
+        call_command('flag_overdue_action_items', escalate=True, stdout=StringIO())
+        low.refresh_from_db()
+        self.assertEqual(low.priority, MEDIUM_PRIORITY)
+
+    def test_activate_scheduled_action_items(self):
+        obj = ActionItem.objects.create(
+            subject_identifier=self.subject_identifier,
+            action_type=self.action_type,
+            activate_after=get_utcnow() + timedelta(days=90))
+        self.assertEqual(obj.status, SCHEDULED)
+        call_command('activate_scheduled_action_items', stdout=StringIO())
+        obj.refresh_from_db()
+        self.assertEqual(obj.status, SCHEDULED)
+        ActionItem.objects.filter(pk=obj.pk).update(
+            activate_after=get_utcnow() - timedelta(minutes=1))
+        call_command('activate_scheduled_action_items', stdout=StringIO())
+        obj.refresh_from_db()
+        self.assertEqual(obj.status, NEW)
+        summary = SubjectActionSummary.objects.get(
+            subject_identifier=self.subject_identifier)
+        self.assertEqual(summary.new_count, 1)
+
+    @tag('benchmark')
+    @override_settings(ROOT_URLCONF='edc_action_item.tests.urls')
+    def test_benchmark_action_items(self):
+        out = StringIO()
+        call_command('benchmark_action_items', subjects=2, followups=1,
+                     changelist_pages=1, stdout=out, stderr=StringIO())
+        results = json.loads(out.getvalue())
+        self.assertEqual(results['scale']['subjects'], 2)
+        names = [row['name'] for row in results['results']]
+        for name in ['save_form_one_with_next_actions', 'open_action_items',
+                     'render_action_item_with_popover', 'admin_changelist']:
+            self.assertIn(name, names)
+        # rolled back
+        self.assertFalse(ActionItem.objects.filter(
+            subject_identifier__startswith='BM').exists())
+
+    def test_generate_action_items(self):
+        out = StringIO()
+        call_command('generate_action_items', subjects=5, chains=2, seed=1,
+                     batch_size=7, stdout=out)
+        qs = ActionItem.objects.filter(subject_identifier__startswith='SYN')
+        self.assertGreaterEqual(qs.count(), 10)
+        self.assertIn(f'{qs.count()} action_items', out.getvalue())
+        # at least one history row per action item
+        self.assertEqual(
+            ActionItem.history.filter(
+                id__in=qs.values('id')).values('id').distinct().count(),
+            qs.count())
+        self.assertEqual(
+            SubjectActionSummary.objects.filter(
+                subject_identifier__startswith='SYN').count(), 5)
+        for obj in qs.exclude(parent_action_item__isnull=True):
+            self.assertIn(obj.parent_action_item, obj.ancestors())
+
+    def test_generate_action_items_is_reproducible(self):
+
+        def generate(seed):
+            with transaction.atomic():
+                call_command('generate_action_items', subjects=5, chains=2,
+                             seed=seed, now='2018-06-01T00:00:00', stdout=StringIO())
+                rows = list(ActionItem.objects.filter(
+                    subject_identifier__startswith=f'SYN{seed}-').order_by(
+                        'action_identifier').values_list(
+                            'action_identifier', 'subject_identifier',
+                            'report_datetime', 'priority', 'status'))
+                transaction.set_rollback(True)
+            return rows
+
+        rows = generate(1)
+        self.assertEqual(rows, generate(1))
+        self.assertLessEqual(
+            max(row[2] for row in rows).isoformat(), '2018-06-01T00:00:00+00:00')
+        self.assertGreater(len(set(row[3] for row in rows)), 1)
+        # seeds equal mod 1000 do not collide
+        self.assertFalse(
+            set(row[0] for row in rows) & set(row[0] for row in generate(1001)))
+        self.assertRaises(
+            CommandError, call_command, 'generate_action_items', seed=-1,
+            stdout=StringIO())
@@ -1,11 +1,17 @@
+from datetime import datetime, timedelta
+from django.contrib.auth.models import Permission, User
+from django.contrib.sites.models import Site
 from django.test import TestCase, tag
 from django.conf import settings
 from edc_constants.constants import CLOSED, OPEN, NEW
 from edc_model_wrapper import ModelWrapper
 
 from ..models import ActionItem, ActionType
+from ..action import get_parent_reference_fks
 from ..site_action_items import site_action_items
+from ..templatetags.action_item_extras import action_item_with_lazy_popover
 from ..templatetags.action_item_extras import action_item_with_popover
+from ..templatetags.action_item_extras import get_popover_modified, popover_cache_key
 from .action_items import FormOneAction, FormTwoAction, FormThreeAction
 from .action_items import register_actions
 from .models import FormOne, FormTwo, SubjectIdentifierModel, Initial, Followup
@@ -257,3 +263,160 @@ class TestPopover(TestCase):
         context = action_item_with_popover(wrapper, 0)
         reference_model_url = context.get('reference_model_url')
         self.assertIn(f'initial={str(initial_obj1.pk)}', reference_model_url)
+
+    def test_parent_reference_fks_resolved_in_batch(self):
+        initial = Initial.objects.create(
+            subject_identifier=self.subject_identifier)
+        followup1 = Followup.objects.create(
+            subject_identifier=self.subject_identifier,
+            parent_tracking_identifier=initial.tracking_identifier,
+            initial=initial)
+        Followup.objects.create(
+            subject_identifier=self.subject_identifier,
+            parent_tracking_identifier=followup1.tracking_identifier,
+            initial=initial)
+        action_items = list(ActionItem.objects.filter(
+            reference_model='edc_action_item.followup').select_related('action_type'))
+        self.assertEqual(
+            set(obj.parent_reference_model for obj in action_items),
+            {'edc_action_item.initial', 'edc_action_item.followup'})
+        # one query per parent reference model
+        with self.assertNumQueries(2):
+            parent_reference_fks = get_parent_reference_fks(action_items)
+        for action_item in action_items:
+            self.assertEqual(
+                parent_reference_fks.get(action_item.action_identifier),
+                {'initial': str(initial.pk)})
+        with self.assertNumQueries(0):
+            self.assertEqual(get_parent_reference_fks([]), {})
+
+    def test_popover_context_is_cached(self):
+
+        class ActionItemModelWrapper(ModelWrapper):
+
+            model = 'edc_action_item.actionitem'
+            next_url_attrs = ['subject_identifier']
+            next_url_name = settings.DASHBOARD_URL_NAMES.get(
+                'subject_dashboard_url')
+
+            @property
+            def subject_identifier(self):
+                return self.object.subject_identifier
+
+        form_one = FormOne.objects.create(
+            subject_identifier=self.subject_identifier)
+        obj = ActionItem.objects.get(
+            action_identifier=form_one.action_identifier)
+        wrapper = ActionItemModelWrapper(model_obj=obj)
+        context = action_item_with_popover(wrapper, 0)
+        # only the query for the reference model instance modified
+        with self.assertNumQueries(1):
+            self.assertEqual(action_item_with_popover(wrapper, 1).get('status'),
+                             context.get('status'))
+        for value in context.values():
+            self.assertIsInstance(
+                value, (str, int, bool, datetime, type(None)))
+        # the wrapper disables save on its model instance
+        obj = ActionItem.objects.get(pk=obj.pk)
+        obj.status = OPEN
+        obj.save()
+        wrapper = ActionItemModelWrapper(model_obj=obj)
+        self.assertEqual(action_item_with_popover(wrapper, 0).get('status'),
+                         obj.get_status_display())
+
+    def test_popover_cache_key_changes_with_parent_reference_model(self):
+        form_one = FormOne.objects.create(
+            subject_identifier=self.subject_identifier)
+        form_two = FormTwo.objects.create(
+            subject_identifier=self.subject_identifier,
+            form_one=form_one)
+        obj = ActionItem.objects.get(
+            action_identifier=form_two.action_identifier)
+        key = popover_cache_key(obj, '/')
+        FormOne.objects.filter(pk=form_one.pk).update(
+            modified=form_one.modified + timedelta(seconds=1))
+        obj = ActionItem.objects.get(pk=obj.pk)
+        self.assertNotEqual(popover_cache_key(obj, '/'), key)
+
+    def test_popover_modified_resolved_in_batch(self):
+
+        class ActionItemModelWrapper(ModelWrapper):
+
+            model = 'edc_action_item.actionitem'
+            next_url_attrs = ['subject_identifier']
+            next_url_name = settings.DASHBOARD_URL_NAMES.get(
+                'subject_dashboard_url')
+
+            @property
+            def subject_identifier(self):
+                return self.object.subject_identifier
+
+        form_one = FormOne.objects.create(
+            subject_identifier=self.subject_identifier)
+        form_two = FormTwo.objects.create(
+            subject_identifier=self.subject_identifier,
+            form_one=form_one)
+        action_items = list(ActionItem.objects.filter(
+            subject_identifier=self.subject_identifier).select_related(
+                'action_type', 'parent_action_item'))
+        # one query per reference model and per parent reference model
+        with self.assertNumQueries(
+                len(set(obj.reference_model for obj in action_items))
+                + len(set(obj.parent_action_item.reference_model
+                          for obj in action_items if obj.parent_action_item))):
+            popover_modified = get_popover_modified(action_items)
+        obj = [obj for obj in action_items
+               if obj.action_identifier == form_two.action_identifier][0]
+        self.assertEqual(
+            popover_modified.get(obj.action_identifier),
+            (form_two.modified, form_one.modified))
+        self.assertEqual(
+            popover_cache_key(obj, '/', modified=popover_modified.get(
+                obj.action_identifier)),
+            popover_cache_key(obj, '/'))
+        wrapper = ActionItemModelWrapper(model_obj=obj)
+        wrapper.popover_modified = popover_modified.get(obj.action_identifier)
+        context = action_item_with_popover(wrapper, 0)
+        with self.assertNumQueries(0):
+            self.assertEqual(action_item_with_popover(wrapper, 0), context)
+
+    def test_lazy_popover_and_json_view(self):
+
+        class ActionItemModelWrapper(ModelWrapper):
+
+            model = 'edc_action_item.actionitem'
+            next_url_attrs = ['subject_identifier']
+            next_url_name = settings.DASHBOARD_URL_NAMES.get(
+                'subject_dashboard_url')
+
+            @property
+            def subject_identifier(self):
+                return self.object.subject_identifier
+
+        form_one = FormOne.objects.create(
+            subject_identifier=self.subject_identifier)
+        obj = ActionItem.objects.select_related('action_type').get(
+            action_identifier=form_one.action_identifier)
+        wrapper = ActionItemModelWrapper(model_obj=obj)
+        with self.assertNumQueries(0):
+            context = action_item_with_lazy_popover(wrapper, 0)
+        url = context.get('popover_url')
+        self.assertIn(obj.action_identifier, url)
+        user = User.objects.create(username='erik')
+        self.client.force_login(user)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 403)
+        user.user_permissions.add(
+            Permission.objects.get(codename='view_actionitem'))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['context']['action_identifier'], obj.action_identifier)
+        self.assertTrue(data['context']['reference_model_exists'])
+        self.assertIn(obj.action_identifier, data['content'])
+        response = self.client.get(url.replace(obj.action_identifier, 'blah'))
+        self.assertEqual(response.status_code, 404)
+        ActionItem.objects.filter(pk=obj.pk).update(
+            site=Site.objects.create(name='other', domain='other.example.com'))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,123 @@
+from contextlib import contextmanager
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.template.loader import render_to_string
+from django.test import TestCase, tag
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from ..models import ActionItem
+from ..model_wrappers import ActionItemModelWrapper
+from ..site_action_items import site_action_items
+from ..templatetags.action_item_extras import action_item_with_popover
+from ..view_mixins import ActionItemViewMixin
+from .action_items import SingletonAction, register_actions
+from .models import FormOne, FormTwo, FormZero, SubjectIdentifierModel
+
+# Maximum number of queries per operation: the count measured with
+# CaptureQueriesContext when running this module with the test
+# settings (SQLite, migrations disabled, empty cache) plus a margin
+# of 2. Lower a budget when a change makes an operation cheaper;
+# raise one only with a reason.
+QUERY_BUDGETS = {
+    'save_plain_reference_model': 38,  # measured 36
+    'save_fk_related_reference_model': 51,  # measured 49
+    'save_reference_model_with_next_actions': 71,  # measured 69
+    'create_singleton_action_item': 22,  # measured 20
+    'delete_reference_model': 16,  # measured 14
+    'open_action_items': 5,  # measured 3
+    'render_action_item_with_popover': 15,  # measured 13
+    'admin_changelist': 14,  # measured 12
+    'admin_change_page': 10,  # measured 8
+}
+
+
+@override_settings(ROOT_URLCONF='edc_action_item.tests.urls')
+class TestQueryBudgets(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        register_actions()
+        self.subject_identifier_model = ActionItem.subject_identifier_model
+        ActionItem.subject_identifier_model = 'edc_action_item.subjectidentifiermodel'
+        self.subject_identifier = '12345'
+        SubjectIdentifierModel.objects.create(
+            subject_identifier=self.subject_identifier)
+        site_action_items.populate_action_types()
+        # warm up, e.g. Action.action_type() updates once per class
+        FormOne.objects.create(subject_identifier=self.subject_identifier)
+
+    def tearDown(self):
+        ActionItem.subject_identifier_model = self.subject_identifier_model
+
+    @contextmanager
+    def assertQueryBudget(self, name):
+        budget = QUERY_BUDGETS[name]
+        with CaptureQueriesContext(connection) as context:
+            yield context
+        if len(context) > budget:
+            queries = '\n'.join(
+                f'{i}. {query["sql"]}'
+                for i, query in enumerate(context.captured_queries, start=1))
+            self.fail(
+                f'Query budget exceeded for {name}. Expected at most {budget}. '
+                f'Got {len(context)}.\n{queries}')
+
+    def test_save_plain_reference_model(self):
+        with self.assertQueryBudget('save_plain_reference_model'):
+            FormZero.objects.create(subject_identifier=self.subject_identifier)
+
+    def test_save_fk_related_reference_model(self):
+        form_one = FormOne.objects.create(subject_identifier=self.subject_identifier)
+        with self.assertQueryBudget('save_fk_related_reference_model'):
+            FormTwo.objects.create(
+                subject_identifier=self.subject_identifier,
+                parent_tracking_identifier=form_one.tracking_identifier,
+                form_one=form_one)
+
+    def test_save_reference_model_with_next_actions(self):
+        with self.assertQueryBudget('save_reference_model_with_next_actions'):
+            FormOne.objects.create(subject_identifier=self.subject_identifier)
+
+    def test_create_singleton_action_item(self):
+        with self.assertQueryBudget('create_singleton_action_item'):
+            SingletonAction(subject_identifier=self.subject_identifier)
+
+    def test_delete_reference_model(self):
+        obj = FormZero.objects.create(subject_identifier=self.subject_identifier)
+        with self.assertQueryBudget('delete_reference_model'):
+            obj.delete()
+
+    def test_open_action_items(self):
+        view = ActionItemViewMixin()
+        view.kwargs = dict(subject_identifier=self.subject_identifier)
+        with self.assertQueryBudget('open_action_items'):
+            view.open_action_items
+
+    def test_render_action_item_with_popover(self):
+        form_one = FormOne.objects.create(subject_identifier=self.subject_identifier)
+        obj = FormTwo.objects.create(
+            subject_identifier=self.subject_identifier,
+            parent_tracking_identifier=form_one.tracking_identifier,
+            form_one=form_one)
+        wrapper = ActionItemModelWrapper(
+            model_obj=ActionItem.objects.get(action_identifier=obj.action_identifier))
+        with self.assertQueryBudget('render_action_item_with_popover'):
+            render_to_string(
+                'edc_action_item/action_item_with_popover.html',
+                action_item_with_popover(wrapper, 0))
+
+    def test_admin_pages(self):
+        user = User.objects.create_superuser('erik', 'erik@example.com', 'pass')
+        self.client.force_login(user)
+        url = reverse('edc_action_item_admin:edc_action_item_actionitem_changelist')
+        with self.assertQueryBudget('admin_changelist'):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        obj = ActionItem.objects.all()[0]
+        url = reverse('edc_action_item_admin:edc_action_item_actionitem_change',
+                      args=(obj.pk, ))
+        with self.assertQueryBudget('admin_change_page'):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
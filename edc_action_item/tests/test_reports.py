@@ -0,0 +1,98 @@
+from django.contrib.auth.models import Permission, User
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.test import TestCase, tag
+from edc_constants.constants import NEW, OPEN
+
+from ..models import ActionItem, ActionType
+from ..reports import ReportError, action_item_report
+from ..site_action_items import site_action_items
+from .action_items import register_actions
+from .identifiers import sequential_action_identifiers
+from .models import SubjectIdentifierModel
+
+
+class TestReports(TestCase):
+
+    def setUp(self):
+        patcher = sequential_action_identifiers()
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        cache.clear()
+        register_actions()
+        self.subject_identifier_model = ActionItem.subject_identifier_model
+        ActionItem.subject_identifier_model = 'edc_action_item.subjectidentifiermodel'
+        self.subject_identifier = '12345'
+        SubjectIdentifierModel.objects.create(
+            subject_identifier=self.subject_identifier)
+        site_action_items.populate_action_types()
+        self.action_type = ActionType.objects.get(name='submit-form-zero')
+        for _ in range(3):
+            ActionItem.objects.create(
+                subject_identifier=self.subject_identifier,
+                action_type=self.action_type)
+
+    def tearDown(self):
+        ActionItem.subject_identifier_model = self.subject_identifier_model
+
+    def test_report(self):
+        rows = action_item_report(group_by=['action_type', 'status'], period='month')
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['action_type'], self.action_type.name)
+        self.assertEqual(rows[0]['status'], NEW)
+        self.assertEqual(rows[0]['count'], 3)
+        self.assertEqual(rows[0]['oldest_age_days'], 0)
+
+    def test_report_is_cached_and_invalidated(self):
+        action_item_report()
+        with self.assertNumQueries(0):
+            rows = action_item_report()
+        self.assertEqual(rows[0]['count'], 3)
+        obj = ActionItem.objects.all()[0]
+        obj.status = OPEN
+        obj.save()
+        rows = action_item_report()
+        self.assertEqual(
+            sorted([(row['status'], row['count']) for row in rows]),
+            sorted([(NEW, 2), (OPEN, 1)]))
+
+    def test_report_raises(self):
+        self.assertRaises(ReportError, action_item_report, group_by=['blah'])
+        self.assertRaises(ReportError, action_item_report, period='blah')
+
+    def test_json_endpoint(self):
+        user = User.objects.create(username='erik')
+        self.client.force_login(user)
+        response = self.client.get('/report/json/?group_by=priority')
+        self.assertEqual(response.status_code, 403)
+        user.user_permissions.add(
+            Permission.objects.get(codename='view_actionitem'))
+        response = self.client.get('/report/json/?group_by=priority')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['rows'][0]['count'], 3)
+        response = self.client.get('/report/json/?group_by=blah')
+        self.assertEqual(response.status_code, 400)
+
+    def test_json_endpoint_is_limited_to_current_site(self):
+        user = User.objects.create(username='erik')
+        user.user_permissions.add(
+            Permission.objects.get(codename='view_actionitem'))
+        self.client.force_login(user)
+        obj = ActionItem.objects.all()[0]
+        ActionItem.objects.filter(pk=obj.pk).update(
+            site=Site.objects.create(name='other', domain='other.example.com'))
+        response = self.client.get('/report/json/?group_by=site')
+        self.assertEqual(response.status_code, 200)
+        rows = response.json()['rows']
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['count'], 2)
+
+    def test_admin_view_requires_view_permission(self):
+        user = User.objects.create(username='erik', is_staff=True)
+        self.client.force_login(user)
+        response = self.client.get('/admin/edc_action_item/report/')
+        self.assertEqual(response.status_code, 403)
+        user.user_permissions.add(
+            Permission.objects.get(codename='view_actionitem'))
+        response = self.client.get('/admin/edc_action_item/report/')
+        self.assertEqual(response.status_code, 200)
@@ -5,7 +5,7 @@ from uuid import uuid4
 from ..action import ActionError
 from ..models import ActionType, ActionItem
 from ..site_action_items import site_action_items, SiteActionError, AlreadyRegistered
-from .action_items import FormZeroAction
+from .action_items import FormZeroAction, TestPrnAction
 from .models import SubjectIdentifierModel
 
 
@@ -74,3 +74,12 @@ class TestSiteActionItems(TestCase):
             ActionType.objects.get(name=FormZeroAction.name)
         except ObjectDoesNotExist:
             self.fail('Object unexpectedly does not exist.')
+
+    def test_replacing_registry_resets_show_link_to_add_actions(self):
+        site_action_items.register(FormZeroAction)
+        site_action_items.register(TestPrnAction)
+        self.assertEqual(
+            [obj.name for obj in site_action_items.get_show_link_to_add_actions()],
+            [TestPrnAction.name])
+        site_action_items.registry = {FormZeroAction.name: FormZeroAction}
+        self.assertEqual(site_action_items.get_show_link_to_add_actions(), ())
@@ -0,0 +1,68 @@
+from django.test import TestCase, tag
+from edc_constants.constants import NEW, OPEN
+
+from ..models import ActionItem, SubjectActionSummary
+from ..site_action_items import site_action_items
+from .action_items import register_actions
+from .models import SubjectIdentifierModel, FormOne, FormTwo
+
+
+class TestSubjectActionSummary(TestCase):
+
+    def setUp(self):
+        register_actions()
+        self.subject_identifier_model = ActionItem.subject_identifier_model
+        ActionItem.subject_identifier_model = 'edc_action_item.subjectidentifiermodel'
+        self.subject_identifier = '12345'
+        SubjectIdentifierModel.objects.create(
+            subject_identifier=self.subject_identifier)
+        site_action_items.populate_action_types()
+
+    def tearDown(self):
+        ActionItem.subject_identifier_model = self.subject_identifier_model
+
+    def assertSummaryMatchesRebuild(self):
+        fields = [f.name for f in SubjectActionSummary._meta.fields if f.name != 'id']
+        summary = SubjectActionSummary.objects.filter(
+            subject_identifier=self.subject_identifier).values(*fields).get()
+        SubjectActionSummary.objects.rebuild()
+        rebuilt = SubjectActionSummary.objects.filter(
+            subject_identifier=self.subject_identifier).values(*fields).get()
+        self.assertEqual(summary, rebuilt)
+
+    def test_counts(self):
+        form_one = FormOne.objects.create(
+            subject_identifier=self.subject_identifier)
+        summary = SubjectActionSummary.objects.get(
+            subject_identifier=self.subject_identifier)
+        # form one closed, form two and form three new
+        self.assertEqual(summary.closed_count, 1)
+        self.assertEqual(summary.new_count, 2)
+        self.assertEqual(summary.open_count, 0)
+        self.assertEqual(summary.high_priority_count, 2)
+        self.assertEqual(
+            summary.oldest_open_datetime,
+            ActionItem.objects.filter(status=NEW).order_by(
+                'report_datetime')[0].report_datetime)
+        self.assertSummaryMatchesRebuild()
+
+        FormTwo.objects.create(
+            subject_identifier=self.subject_identifier, form_one=form_one)
+        self.assertSummaryMatchesRebuild()
+
+        obj = ActionItem.objects.filter(status=NEW)[0]
+        obj.status = OPEN
+        obj.save()
+        self.assertSummaryMatchesRebuild()
+
+        ActionItem.objects.filter(status=NEW)[0].delete()
+        self.assertSummaryMatchesRebuild()
+
+    def test_for_subjects(self):
+        FormOne.objects.create(subject_identifier=self.subject_identifier)
+        with self.assertNumQueries(1):
+            summaries = SubjectActionSummary.objects.for_subjects(
+                [self.subject_identifier, '99999'])
+        self.assertEqual(
+            summaries.get(self.subject_identifier).active_count, 2)
+        self.assertIsNone(summaries.get('99999'))
@@ -1,10 +1,16 @@
+from datetime import timedelta
 from django.test import TestCase, tag
 from django.urls.base import reverse
+from edc_base.utils import get_utcnow
 from edc_model_wrapper import ModelWrapper
 
+from ..constants import SCHEDULED
 from ..models import ActionItem, ActionType
+from ..site_action_items import site_action_items
+from ..templatetags.action_item_extras import action_item_row_with_lazy_popover
 from ..templatetags.action_item_extras import add_action_item_popover
 from ..view_mixins import ActionItemViewMixin
+from .action_items import register_actions
 from .models import SubjectIdentifierModel
 
 
@@ -15,6 +21,7 @@ class MyModelWrapper(ModelWrapper):
 class TestAction(TestCase):
 
     def setUp(self):
+        register_actions()
         self.subject_identifier_model = ActionItem.subject_identifier_model
         ActionItem.subject_identifier_model = 'edc_action_item.subjectidentifiermodel'
         self.subject_identifier = '12345'
@@ -46,7 +53,67 @@ class TestAction(TestCase):
         self.assertEqual(len(context.get('open_action_items')),
                          ActionItem.objects.all().count())
 
+    def test_view_context_excludes_scheduled(self):
+        view = ActionItemViewMixin()
+        action_type = ActionType.objects.filter(show_on_dashboard=True)[0]
+        obj = ActionItem.objects.create(
+            subject_identifier=self.subject_identifier,
+            action_type=action_type,
+            activate_after=get_utcnow() + timedelta(days=90))
+        self.assertEqual(obj.status, SCHEDULED)
+        view.kwargs = dict(subject_identifier=self.subject_identifier)
+        context = view.get_context_data()
+        self.assertEqual(context.get('open_action_items'), [])
+
+    def test_open_action_item_rows(self):
+        view = ActionItemViewMixin()
+        view.kwargs = dict(subject_identifier=self.subject_identifier)
+        for action_type in ActionType.objects.filter(show_on_dashboard=True):
+            ActionItem.objects.create(
+                subject_identifier=self.subject_identifier,
+                action_type=action_type)
+        with self.assertNumQueries(1):
+            rows = view.open_action_item_rows
+        self.assertTrue(rows)
+        self.assertEqual(
+            [row.action_identifier for row in rows],
+            [wrapper.object.action_identifier for wrapper in view.open_action_items])
+        for row in rows:
+            obj = ActionItem.objects.get(action_identifier=row.action_identifier)
+            self.assertEqual(row.display_name, obj.action_type.display_name)
+            self.assertEqual(row.status, obj.status)
+            self.assertTrue(row.href.startswith(
+                f'{obj.get_absolute_url()}?next='))
+            self.assertIn(f'subject_identifier={self.subject_identifier}', row.href)
+            with self.assertNumQueries(0):
+                context = action_item_row_with_lazy_popover(row, 0)
+            self.assertEqual(context.get('action_identifier'), row.action_identifier)
+            self.assertIn(row.action_identifier, context.get('popover_url'))
+
     def test_templatetag(self):
         context = add_action_item_popover(
             self.subject_identifier, 'subject_dashboard_url')
         reverse(context.get('action_item_add_url'))
+
+    def test_add_action_item_popover_is_cached(self):
+        ActionItemViewMixin()
+        site_action_items.reset_show_link_to_add_actions()
+        show_link_to_add_actions = site_action_items.get_show_link_to_add_actions()
+        self.assertIsInstance(show_link_to_add_actions, tuple)
+        self.assertTrue(show_link_to_add_actions)
+        context = add_action_item_popover(
+            self.subject_identifier, 'subject_dashboard_url')
+        html = context.get('add_action_item_popover_html')
+        self.assertIn(f'subject_identifier={self.subject_identifier}', html)
+        for show_link_to_add_action in show_link_to_add_actions:
+            self.assertIn(f'action_type={show_link_to_add_action.action_type_id}', html)
+        with self.assertNumQueries(0):
+            context = add_action_item_popover('67890', 'subject_dashboard_url')
+        self.assertEqual(
+            context.get('add_action_item_popover_html'),
+            html.replace(f'subject_identifier={self.subject_identifier}',
+                         'subject_identifier=67890'))
+        action_type = ActionType.objects.all()[0]
+        action_type.save()
+        self.assertIsNot(
+            site_action_items.get_show_link_to_add_actions(), show_link_to_add_actions)
@@ -0,0 +1,127 @@
+from datetime import timedelta
+from django.contrib.auth.models import Permission, User
+from django.db import connection
+from django.test import TestCase, tag
+from unittest import skipUnless
+from edc_base.utils import get_utcnow
+from edc_constants.constants import CLOSED, NEW, OPEN
+
+from ..constants import HIGH_PRIORITY, LOW_PRIORITY, MEDIUM_PRIORITY
+from ..models import ActionItem, ActionType
+from ..site_action_items import site_action_items
+from ..worklist import WORKLIST_FIELDS, WorklistError, worklist, worklist_queryset
+from .action_items import register_actions
+from .identifiers import sequential_action_identifiers
+from .models import SubjectIdentifierModel
+
+
+class TestWorklist(TestCase):
+
+    def setUp(self):
+        patcher = sequential_action_identifiers()
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        register_actions()
+        self.subject_identifier_model = ActionItem.subject_identifier_model
+        ActionItem.subject_identifier_model = 'edc_action_item.subjectidentifiermodel'
+        site_action_items.populate_action_types()
+        action_type = ActionType.objects.get(name='submit-form-zero')
+        report_datetime = get_utcnow() - timedelta(days=30)
+        for i, priority in enumerate(
+                [LOW_PRIORITY, HIGH_PRIORITY, MEDIUM_PRIORITY] * 4):
+            subject_identifier = f'12345{i}'
+            SubjectIdentifierModel.objects.create(
+                subject_identifier=subject_identifier)
+            ActionItem.objects.create(
+                subject_identifier=subject_identifier,
+                action_type=action_type,
+                priority=priority,
+                report_datetime=report_datetime + timedelta(days=i))
+        obj = ActionItem.objects.all()[0]
+        obj.status = CLOSED
+        obj.save()
+        self.site_id = obj.site_id
+
+    def tearDown(self):
+        ActionItem.subject_identifier_model = self.subject_identifier_model
+
+    def test_worklist_order(self):
+        rows, cursor = worklist(site_id=self.site_id, limit=100)
+        self.assertIsNone(cursor)
+        self.assertEqual(len(rows), 11)
+        self.assertEqual(
+            [row['priority'] for row in rows],
+            [HIGH_PRIORITY] * 4 + [MEDIUM_PRIORITY] * 4 + [LOW_PRIORITY] * 3)
+        for priority in [HIGH_PRIORITY, MEDIUM_PRIORITY, LOW_PRIORITY]:
+            report_datetimes = [
+                row['report_datetime'] for row in rows if row['priority'] == priority]
+            self.assertEqual(report_datetimes, sorted(report_datetimes))
+
+    def test_worklist_keyset_pages(self):
+        expected, _ = worklist(site_id=self.site_id, limit=100)
+        rows, cursor = [], None
+        while True:
+            page, cursor = worklist(site_id=self.site_id, limit=3, cursor=cursor)
+            rows.extend(page)
+            if not cursor:
+                break
+        self.assertEqual([row['id'] for row in rows], [row['id'] for row in expected])
+
+    def test_worklist_merges_new_and_open(self):
+        for obj in ActionItem.objects.filter(status=NEW)[::2]:
+            obj.status = OPEN
+            obj.save()
+        rows, _ = worklist(site_id=self.site_id, limit=100)
+        self.assertEqual(len(rows), 11)
+        self.assertEqual(set(row['status'] for row in rows), {NEW, OPEN})
+        for priority in [HIGH_PRIORITY, MEDIUM_PRIORITY, LOW_PRIORITY]:
+            report_datetimes = [
+                row['report_datetime'] for row in rows if row['priority'] == priority]
+            self.assertEqual(report_datetimes, sorted(report_datetimes))
+        pages, cursor = [], None
+        while True:
+            page, cursor = worklist(site_id=self.site_id, limit=2, cursor=cursor)
+            pages.extend(page)
+            if not cursor:
+                break
+        self.assertEqual([row['id'] for row in pages], [row['id'] for row in rows])
+
+    @skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN is SQLite only')
+    def test_worklist_query_plan_uses_index_order(self):
+        qs = worklist_queryset(
+            site_id=self.site_id, status=NEW, priority=HIGH_PRIORITY).values(
+                *WORKLIST_FIELDS)[:50]
+        sql, params = qs.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+        self.assertIn('edc_action_worklist_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_worklist_invalid_cursor(self):
+        self.assertRaises(
+            WorklistError, worklist, site_id=self.site_id, cursor='blah')
+
+    def test_json_endpoint(self):
+        user = User.objects.create(username='erik')
+        self.client.force_login(user)
+        response = self.client.get('/worklist/json/')
+        self.assertEqual(response.status_code, 403)
+        user.user_permissions.add(
+            Permission.objects.get(codename='view_actionitem'))
+        response = self.client.get('/worklist/json/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['rows']), 11)
+        self.assertIsNone(response.json()['cursor'])
+        response = self.client.get('/worklist/json/?cursor=blah')
+        self.assertEqual(response.status_code, 400)
+
+    def test_admin_view_requires_view_permission(self):
+        user = User.objects.create(username='erik', is_staff=True)
+        self.client.force_login(user)
+        response = self.client.get('/admin/edc_action_item/worklist/')
+        self.assertEqual(response.status_code, 403)
+        user.user_permissions.add(
+            Permission.objects.get(codename='view_actionitem'))
+        response = self.client.get('/admin/edc_action_item/worklist/')
+        self.assertEqual(response.status_code, 200)
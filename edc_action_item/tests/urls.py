@@ -0,0 +1,15 @@
+from django.urls import include, path
+from django.views.generic.base import RedirectView
+
+from ..urls import urlpatterns as edc_action_item_urlpatterns
+
+# stands in for the subject dashboard of a project,
+# see settings.DASHBOARD_URL_NAMES
+dashboard_urlpatterns = [
+    path('subject_dashboard/<str:subject_identifier>/',
+         RedirectView.as_view(url='/'), name='subject_dashboard_url'),
+]
+
+urlpatterns = [
+    path('', include((dashboard_urlpatterns, 'edc_action_item'))),
+] + edc_action_item_urlpatterns
@@ -2,9 +2,15 @@ from django.urls import path
 from django.views.generic.base import RedirectView
 from edc_action_item.admin_site import edc_action_item_admin
 
+from .views import ActionItemPopoverJsonView, ActionItemReportJsonView, WorklistJsonView
+
 app_name = 'edc_action_item'
 
 urlpatterns = [
     path('admin/', edc_action_item_admin.urls),
+    path('report/json/', ActionItemReportJsonView.as_view(), name='report_json_url'),
+    path('worklist/json/', WorklistJsonView.as_view(), name='worklist_json_url'),
+    path('popover/<str:action_identifier>/json/', ActionItemPopoverJsonView.as_view(),
+         name='popover_json_url'),
     path('', RedirectView.as_view(url='admin/edc_action_item/'), name='home_url'),
 ]
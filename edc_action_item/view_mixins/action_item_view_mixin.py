@@ -1,15 +1,18 @@
 from django.apps import apps as django_apps
 from django.views.generic.base import ContextMixin
-from edc_constants.constants import CLOSED, CANCELLED
+from edc_constants.constants import NEW, OPEN
 
-from ..model_wrappers import ActionItemModelWrapper
+from ..action import get_parent_reference_fks
+from ..model_wrappers import ActionItemModelWrapper, ActionItemRowWrapper
 from ..site_action_items import site_action_items
+from ..templatetags.action_item_extras import get_popover_modified
 
 
 class ActionItemViewMixin(ContextMixin):
 
     action_item_model = 'edc_action_item.actionitem'
     action_item_model_wrapper_cls = ActionItemModelWrapper
+    action_item_row_wrapper_cls = ActionItemRowWrapper
 
     def __init__(self, **kwargs):
         site_action_items.populate_action_types()
@@ -23,9 +26,39 @@ class ActionItemViewMixin(ContextMixin):
 
     @property
     def open_action_items(self):
+        """Returns a list of wrapped open action items with the
+        parent reference FK querystring and the popover cache key
+        modified datetimes resolved in batch.
+        """
         model_cls = django_apps.get_model(self.action_item_model)
         qs = model_cls.objects.filter(
             subject_identifier=self.kwargs.get('subject_identifier'),
-            action_type__show_on_dashboard=True).exclude(
-                status__in=[CLOSED, CANCELLED]).order_by('-report_datetime')
-        return [self.action_item_model_wrapper_cls(model_obj=obj) for obj in qs]
+            status__in=[NEW, OPEN],
+            action_type__show_on_dashboard=True).select_related(
+                'action_type', 'parent_action_item').order_by('-report_datetime')
+        action_items = list(qs)
+        parent_reference_fks = get_parent_reference_fks(action_items)
+        popover_modified = get_popover_modified(action_items)
+        wrappers = []
+        for obj in action_items:
+            wrapper = self.action_item_model_wrapper_cls(model_obj=obj)
+            wrapper.parent_reference_fk = parent_reference_fks.get(obj.action_identifier)
+            wrapper.popover_modified = popover_modified.get(obj.action_identifier)
+            wrappers.append(wrapper)
+        return wrappers
+
+    @property
+    def open_action_item_rows(self):
+        """Returns a list of open action items as slim wrappers
+        of named tuple rows, a lighter alternative to
+        `open_action_items` for templates that need only the
+        fields in `action_item_row_wrapper_cls.fields`, e.g.
+        with `action_item_row_with_lazy_popover`.
+        """
+        model_cls = django_apps.get_model(self.action_item_model)
+        qs = model_cls.objects.filter(
+            subject_identifier=self.kwargs.get('subject_identifier'),
+            status__in=[NEW, OPEN],
+            action_type__show_on_dashboard=True).order_by('-report_datetime')
+        return [self.action_item_row_wrapper_cls(row=row) for row in qs.values_list(
+            *self.action_item_row_wrapper_cls.fields, named=True)]
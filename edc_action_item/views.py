@@ -0,0 +1,170 @@
+from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
+from django.contrib.sites.shortcuts import get_current_site
+from django.http import Http404, JsonResponse
+from django.template.loader import render_to_string
+from django.views.generic.base import TemplateView, View
+
+from .model_wrappers import ActionItemModelWrapper
+from .models import ActionItem
+from .reports import GROUP_BY, PERIODS, ReportError, action_item_report
+from .worklist import WorklistError, worklist
+
+
+class ActionItemReportViewMixin:
+
+    def get_report(self):
+        group_by = [g for g in self.request.GET.get(
+            'group_by', 'action_type,status').split(',') if g]
+        period = self.request.GET.get('period') or None
+        return action_item_report(
+            group_by=group_by, period=period,
+            filters={'site_id': get_current_site(self.request).id})
+
+
+class ActionItemReportView(PermissionRequiredMixin, ActionItemReportViewMixin,
+                           TemplateView):
+
+    """Admin page of aggregated action item counts of the
+    current site.
+
+    Requires the view permission on ActionItem. See AdminSite.get_urls.
+    """
+
+    admin_site = None
+    permission_required = 'edc_action_item.view_actionitem'
+    template_name = 'admin/edc_action_item/action_item_report.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(self.admin_site.each_context(self.request))
+        try:
+            rows = self.get_report()
+        except ReportError as e:
+            rows, error = [], str(e)
+        else:
+            error = None
+        columns = [k for k in (rows[0] if rows else {})]
+        context.update(
+            title='Action item report',
+            columns=columns,
+            rows=[[row[k] for k in columns] for row in rows],
+            error=error,
+            group_by_options=list(GROUP_BY),
+            period_options=list(PERIODS))
+        return context
+
+
+class ActionItemReportJsonView(LoginRequiredMixin, PermissionRequiredMixin,
+                               ActionItemReportViewMixin, View):
+
+    """JSON endpoint of aggregated action item counts of the
+    current site.
+
+    Requires the view permission on ActionItem.
+
+    e.g. ?group_by=action_type,priority&period=month
+    """
+
+    permission_required = 'edc_action_item.view_actionitem'
+
+    def get(self, request, *args, **kwargs):
+        try:
+            rows = self.get_report()
+        except ReportError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        return JsonResponse({'rows': rows})
+
+
+class WorklistViewMixin:
+
+    paginate_by = 50
+
+    def get_worklist(self):
+        filters = {}
+        if self.request.GET.get('action_type'):
+            filters.update(action_type__name=self.request.GET.get('action_type'))
+        return worklist(
+            site_id=get_current_site(self.request).id,
+            limit=self.paginate_by,
+            cursor=self.request.GET.get('cursor'),
+            filters=filters)
+
+
+class WorklistView(PermissionRequiredMixin, WorklistViewMixin, TemplateView):
+
+    """Admin page of NEW and OPEN action items across subjects
+    ordered by priority then report date.
+
+    Requires the view permission on ActionItem. See AdminSite.get_urls.
+    """
+
+    admin_site = None
+    permission_required = 'edc_action_item.view_actionitem'
+    template_name = 'admin/edc_action_item/worklist.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(self.admin_site.each_context(self.request))
+        try:
+            rows, cursor = self.get_worklist()
+        except WorklistError as e:
+            rows, cursor, error = [], None, str(e)
+        else:
+            error = None
+        context.update(
+            title='Action item worklist',
+            rows=rows,
+            cursor=cursor,
+            error=error)
+        return context
+
+
+class WorklistJsonView(LoginRequiredMixin, PermissionRequiredMixin,
+                       WorklistViewMixin, View):
+
+    """JSON endpoint of the action item worklist.
+
+    Requires the view permission on ActionItem.
+
+    e.g. ?cursor=<cursor from the previous page>
+    """
+
+    permission_required = 'edc_action_item.view_actionitem'
+
+    def get(self, request, *args, **kwargs):
+        try:
+            rows, cursor = self.get_worklist()
+        except WorklistError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        return JsonResponse({'rows': rows, 'cursor': cursor})
+
+
+class ActionItemPopoverJsonView(LoginRequiredMixin, PermissionRequiredMixin, View):
+
+    """JSON endpoint of the popover of one action item, by
+    action_identifier, for lazy popovers.
+
+    Returns the rendered popover `content` and the `context`
+    without `parent_action_item`.
+
+    Requires the view permission on ActionItem. Action items of
+    other sites are not found.
+    """
+
+    action_item_model_wrapper_cls = ActionItemModelWrapper
+    permission_required = 'edc_action_item.view_actionitem'
+    template_name = 'edc_action_item/action_item_popover_content.html'
+
+    def get(self, request, *args, **kwargs):
+        from .templatetags.action_item_extras import action_item_with_popover
+        try:
+            action_item = ActionItem.on_site.select_related(
+                'action_type', 'parent_action_item').get(
+                    action_identifier=kwargs.get('action_identifier'))
+        except ActionItem.DoesNotExist:
+            raise Http404('Action item does not exist.')
+        context = action_item_with_popover(
+            self.action_item_model_wrapper_cls(model_obj=action_item), 0)
+        content = render_to_string(self.template_name, context)
+        context.pop('parent_action_item')
+        return JsonResponse({'content': content, 'context': context})
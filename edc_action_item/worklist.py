@@ -0,0 +1,119 @@
+"""A cross-subject worklist of NEW and OPEN action items for a site,
+ordered by priority (high, medium, low) then report_datetime.
+
+Pages are fetched with keyset ("seek") pagination on the
+(site, status, priority, report_datetime, id) index, so any page
+costs the same as the first. Each page returns a `cursor`
+to pass back for the next page.
+
+The index returns rows in order for one status and priority
+only, so NEW and OPEN are queried separately and merged. On
+SQLite the plan of each query is
+
+    SEARCH edc_action_item_actionitem USING INDEX edc_action_worklist_idx
+        (site_id=? AND status=? AND priority=?)
+
+without a "USE TEMP B-TREE FOR ORDER BY" sort (see test_worklist).
+
+    from edc_action_item.worklist import worklist
+
+    rows, cursor = worklist(site_id=1, limit=50)
+    rows, cursor = worklist(site_id=1, limit=50, cursor=cursor)
+"""
+import heapq
+import json
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from django.apps import apps as django_apps
+from django.db.models import Q
+from itertools import islice
+from django.utils.dateparse import parse_datetime
+from edc_constants.constants import NEW, OPEN
+
+from .constants import HIGH_PRIORITY, LOW_PRIORITY, MEDIUM_PRIORITY
+
+PRIORITY_ORDER = [HIGH_PRIORITY, MEDIUM_PRIORITY, LOW_PRIORITY]
+
+WORKLIST_STATUS = [NEW, OPEN]
+
+WORKLIST_FIELDS = [
+    'id',
+    'action_identifier',
+    'subject_identifier',
+    'action_type__display_name',
+    'priority',
+    'status',
+    'report_datetime',
+    'due_datetime',
+    'overdue',
+]
+
+
+class WorklistError(Exception):
+    pass
+
+
+def encode_cursor(row):
+    value = json.dumps(
+        [row['priority'], row['report_datetime'].isoformat(), str(row['id'])])
+    return urlsafe_b64encode(value.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        priority, report_datetime, pk = json.loads(
+            urlsafe_b64decode(cursor.encode()).decode())
+        report_datetime = parse_datetime(report_datetime)
+    except (TypeError, ValueError) as e:
+        raise WorklistError(f'Invalid cursor. Got {cursor}. {e}')
+    if priority not in PRIORITY_ORDER or not report_datetime:
+        raise WorklistError(f'Invalid cursor. Got {cursor}.')
+    return priority, report_datetime, pk
+
+
+def worklist_queryset(site_id=None, status=None, priority=None, filters=None):
+    """Returns a queryset of rows for one status and priority in
+    index order.
+    """
+    model_cls = django_apps.get_model('edc_action_item.actionitem')
+    return model_cls.objects.filter(
+        site_id=site_id, status=status, priority=priority,
+        **(filters or {})).order_by('report_datetime', 'id')
+
+
+def worklist(site_id=None, limit=None, cursor=None, filters=None):
+    """Returns a tuple of (rows, cursor) where rows is a list of
+    dictionaries of WORKLIST_FIELDS and cursor is None on the
+    last page.
+
+    Runs one index range scan per status and priority, at most
+    six queries per page.
+    """
+    limit = limit or 50
+    priorities = PRIORITY_ORDER
+    after = None
+    if cursor:
+        priority, report_datetime, pk = decode_cursor(cursor)
+        priorities = PRIORITY_ORDER[PRIORITY_ORDER.index(priority):]
+        after = (Q(report_datetime__gt=report_datetime)
+                 | Q(report_datetime=report_datetime, id__gt=pk))
+    rows = []
+    for priority in priorities:
+        # fetch one extra row to know if there is a next page
+        size = limit + 1 - len(rows)
+        pages = []
+        for status in WORKLIST_STATUS:
+            page_qs = worklist_queryset(
+                site_id=site_id, status=status, priority=priority, filters=filters)
+            if after is not None:
+                page_qs = page_qs.filter(after)
+            pages.append(list(page_qs.values(*WORKLIST_FIELDS)[:size]))
+        after = None
+        rows.extend(islice(heapq.merge(
+            *pages, key=lambda row: (row['report_datetime'], row['id'])), size))
+        if len(rows) > limit:
+            break
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1])
+    return rows, None